@@ -7,10 +7,11 @@ from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import INVALID_AIRPORT_OR_ROUTE_MSG, ALERT_NOT_FOUND_MSG, ALERT_DELETE_FAILED_MSG
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models.alert import PriceAlert
 from app.models.route import Route
 from app.schemas.alert import AlertCreate, AlertResponse
+from app.services.reference_data import find_route, invalidate_reference_data
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -22,7 +23,7 @@ _ROUTE_MAX_RETRIES = 4
 
 @router.get("", response_model=list[AlertResponse])
 async def get_alerts(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> list[AlertResponse]:
     result = await db.execute(
         select(PriceAlert)
@@ -68,25 +69,21 @@ async def create_alert(
     destination = alert_data.destination.upper()
 
     # Find or create route
-    route_result = await db.execute(
-        select(Route).where(Route.origin_code == origin, Route.dest_code == destination)
-    )
-    route = route_result.scalar_one_or_none()
+    route = await find_route(db, origin, destination)
+    created_route = False
 
     if not route:
         route = Route(origin_code=origin, dest_code=destination, is_active=True)
         db.add(route)
         try:
             await db.flush()
+            created_route = True
         except IntegrityError:
             await db.rollback()
             # Retry lookup with exponential backoff
             delay = _ROUTE_RETRY_DELAY
             for _ in range(_ROUTE_MAX_RETRIES):
-                route_result = await db.execute(
-                    select(Route).where(Route.origin_code == origin, Route.dest_code == destination)
-                )
-                route = route_result.scalar_one_or_none()
+                route = await find_route(db, origin, destination)
                 if route:
                     break
                 await asyncio.sleep(delay)
@@ -103,6 +100,8 @@ async def create_alert(
     )
     db.add(alert)
     await db.commit()
+    if created_route:
+        invalidate_reference_data()
     await db.refresh(alert)
     return AlertResponse(
         id=alert.id,
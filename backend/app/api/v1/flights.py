@@ -3,9 +3,9 @@ from datetime import date, datetime, timedelta, timezone
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import VALID_CABIN_CLASSES, CABIN_CLASS_ERROR_MSG, IATA_CODE_CONSTRAINTS, SAME_ORIGIN_DEST_MSG, DATE_PAST_MSG, DATE_TOO_FAR_MSG, RETURN_BEFORE_DEPART_MSG, RETURN_DATE_TOO_FAR_MSG, MAX_FUTURE_DAYS
-from app.db.session import get_db
-from app.schemas.flight import FlightSearchResponse, PriceHistoryResponse
+from app.config import VALID_CABIN_CLASSES, CABIN_CLASS_ERROR_MSG, IATA_CODE_CONSTRAINTS, SAME_ORIGIN_DEST_MSG, DATE_PAST_MSG, DATE_TOO_FAR_MSG, RETURN_BEFORE_DEPART_MSG, RETURN_DATE_TOO_FAR_MSG, MAX_FUTURE_DAYS, MAX_FLEXIBLE_DAYS, FLEXIBLE_RANGE_INVALID_MSG, FLEXIBLE_RANGE_TOO_LONG_MSG
+from app.db.session import get_db, get_read_db
+from app.schemas.flight import FlexibleSearchResponse, FlightSearchResponse, PriceHistoryResponse
 from app.services.flight_service import FlightService
 
 router = APIRouter()
@@ -57,13 +57,46 @@ async def search_flights(
     )
 
 
+@router.get("/search/flexible", response_model=FlexibleSearchResponse)
+async def search_flexible_dates(
+    origin: str = Query(..., **IATA_CODE_CONSTRAINTS, description="Origin IATA code"),
+    dest: str = Query(..., **IATA_CODE_CONSTRAINTS, description="Destination IATA code"),
+    start_date: date = Query(..., description="First departure date in the window"),
+    end_date: date = Query(..., description="Last departure date in the window"),
+    cabin_class: str = Query("ECONOMY", description="Cabin class"),
+    db: AsyncSession = Depends(get_read_db),
+) -> FlexibleSearchResponse:
+    origin = origin.upper()
+    dest = dest.upper()
+
+    if origin == dest:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=SAME_ORIGIN_DEST_MSG)
+
+    today = datetime.now(timezone.utc).date()
+    if start_date < today:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=DATE_PAST_MSG)
+    if end_date < start_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=FLEXIBLE_RANGE_INVALID_MSG)
+    if (end_date - start_date).days + 1 > MAX_FLEXIBLE_DAYS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=FLEXIBLE_RANGE_TOO_LONG_MSG)
+    if end_date > today + timedelta(days=MAX_FUTURE_DAYS):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=DATE_TOO_FAR_MSG)
+
+    cabin_class = cabin_class.upper()
+    if cabin_class not in VALID_CABIN_CLASSES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=CABIN_CLASS_ERROR_MSG)
+
+    service = FlightService(db)
+    return await service.search_flexible(origin, dest, start_date, end_date, cabin_class)
+
+
 @router.get("/prices/history", response_model=PriceHistoryResponse)
 async def price_history(
     route_id: int = Query(..., ge=1),
     departure_date: date = Query(...),
     airline_code: str | None = Query(None, max_length=2, pattern=r"^[A-Za-z0-9]{2}$"),
     days: int = Query(30, ge=1, le=90),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> PriceHistoryResponse:
     if airline_code:
         airline_code = airline_code.upper()
@@ -3,6 +3,7 @@ from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import all_cache_stats
 from app.db.session import get_db
 
 router = APIRouter()
@@ -21,4 +22,5 @@ async def health_check(db: AsyncSession = Depends(get_db)) -> dict:
         "service": "farenheit-api",
         "version": "0.1.0",
         "database": db_status,
+        "caches": all_cache_stats(),
     }
@@ -1,14 +1,13 @@
 from datetime import date, datetime, timedelta, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import VALID_CABIN_CLASSES, CABIN_CLASS_ERROR_MSG, IATA_CODE_CONSTRAINTS, SAME_ORIGIN_DEST_MSG, DATE_PAST_MSG, DATE_TOO_FAR_MSG, MAX_FUTURE_DAYS, INVALID_MONTH_FORMAT_MSG
-from app.db.session import get_db
-from app.models.route import Route
+from app.db.session import get_read_db
 from app.schemas.prediction import PredictionResponse, HeatmapResponse
 from app.services.prediction_service import PredictionService
+from app.services.reference_data import find_route
 
 router = APIRouter()
 
@@ -20,7 +19,7 @@ async def get_prediction(
     origin: str | None = Query(None, **IATA_CODE_CONSTRAINTS),
     dest: str | None = Query(None, **IATA_CODE_CONSTRAINTS),
     cabin_class: str = Query("ECONOMY"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> PredictionResponse:
     # Normalize
     if origin:
@@ -40,10 +39,7 @@ async def get_prediction(
 
     # Resolve route_id from origin/dest if not provided
     if route_id is None and origin and dest:
-        result = await db.execute(
-            select(Route).where(Route.origin_code == origin, Route.dest_code == dest)
-        )
-        route = result.scalar_one_or_none()
+        route = await find_route(db, origin, dest)
         route_id = route.id if route else None
 
     service = PredictionService(db)
@@ -71,7 +67,7 @@ async def get_heatmap(
     dest: str = Query(..., **IATA_CODE_CONSTRAINTS),
     month: str = Query(..., pattern=r"^\d{4}-\d{2}$", description="Format: YYYY-MM"),
     cabin_class: str = Query("ECONOMY"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> HeatmapResponse:
     origin = origin.upper()
     dest = dest.upper()
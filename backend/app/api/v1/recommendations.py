@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import VALID_CABIN_CLASSES, CABIN_CLASS_ERROR_MSG, IATA_CODE_CONSTRAINTS, SAME_ORIGIN_DEST_MSG, DATE_PAST_MSG, DATE_TOO_FAR_MSG, MAX_FUTURE_DAYS
-from app.db.session import get_db
+from app.db.session import get_read_db
 from app.schemas.recommendation import RecommendationResponse
 from app.services.recommendation_service import RecommendationService
 
@@ -17,7 +17,7 @@ async def get_recommendation(
     dest: str = Query(..., **IATA_CODE_CONSTRAINTS),
     departure_date: date = Query(...),
     cabin_class: str = Query("ECONOMY"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> RecommendationResponse:
     origin = origin.upper()
     dest = dest.upper()
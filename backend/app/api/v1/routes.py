@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, Query
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
-from app.schemas.route import RouteResponse, AirportSearchResponse
+from app.config import VALID_CABIN_CLASSES, CABIN_CLASS_ERROR_MSG, IATA_CODE_CONSTRAINTS, INVALID_MONTH_FORMAT_MSG
+from app.core.money import DEFAULT_CURRENCY
+from app.db.session import get_read_db
+from app.schemas.route import RouteResponse, AirportSearchResponse, AnywhereDestinationResponse
 from app.services.route_service import RouteService
 
 router = APIRouter()
@@ -11,16 +15,40 @@ router = APIRouter()
 @router.get("/popular", response_model=list[RouteResponse])
 async def get_popular_routes(
     limit: int = Query(10, ge=1, le=50),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> list[RouteResponse]:
     service = RouteService(db)
     return await service.get_popular_routes(limit)
 
 
+@router.get("/anywhere", response_model=list[AnywhereDestinationResponse])
+async def get_anywhere(
+    origin: str = Query(..., **IATA_CODE_CONSTRAINTS),
+    month: str | None = Query(None, pattern=r"^\d{4}-\d{2}$", description="Format: YYYY-MM (default: next month)"),
+    cabin_class: str = Query("ECONOMY"),
+    currency: str = Query(DEFAULT_CURRENCY, pattern=r"^[A-Za-z]{3}$", description="Fare currency to rank"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+) -> list[AnywhereDestinationResponse]:
+    origin = origin.upper()
+    currency = currency.upper()
+    cabin_class = cabin_class.upper()
+    if cabin_class not in VALID_CABIN_CLASSES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=CABIN_CLASS_ERROR_MSG)
+    if month is None:
+        today = datetime.now(timezone.utc).date()
+        year_val, mon_val = (today.year + 1, 1) if today.month == 12 else (today.year, today.month + 1)
+        month = f"{year_val:04d}-{mon_val:02d}"
+    elif not (2020 <= int(month[:4]) <= 2099 and 1 <= int(month[5:7]) <= 12):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=INVALID_MONTH_FORMAT_MSG)
+    service = RouteService(db)
+    return await service.get_anywhere(origin, month, cabin_class, limit, currency)
+
+
 @router.get("/airports/search", response_model=list[AirportSearchResponse])
 async def search_airports(
     q: str = Query(..., min_length=1, max_length=50),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> list[AirportSearchResponse]:
     service = RouteService(db)
     return await service.search_airports(q)
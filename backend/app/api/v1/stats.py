@@ -1,22 +1,38 @@
 import logging
+from datetime import datetime, timedelta, timezone
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy import select, func
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.core.cache import all_cache_stats
+from app.db.session import get_read_db
 from app.models.route import Route
 from app.models.flight_price import FlightPrice
 from app.models.prediction import Prediction
 from app.models.airport import Airport
+from app.models.job_run import JobRun
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+_JOB_PERCENTILES = (50, 90, 99)
+_RECENT_JOB_RUNS = 20
+
+
+def _percentile(sorted_values: list[int], pct: float) -> float:
+    """Linear-interpolated percentile of an ascending list."""
+    if len(sorted_values) == 1:
+        return float(sorted_values[0])
+    rank = (len(sorted_values) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
 
 @router.get("")
-async def get_stats(db: AsyncSession = Depends(get_db)) -> dict:
+async def get_stats(db: AsyncSession = Depends(get_read_db)) -> dict:
     try:
         # Single query for all counts + timestamps
         result = (await db.execute(
@@ -53,6 +69,7 @@ async def get_stats(db: AsyncSession = Depends(get_db)) -> dict:
             "airports": airports_count,
             "last_price_collected_at": price_result.last_time.isoformat() if price_result.last_time else None,
             "last_predicted_at": pred_result.last_at.isoformat() if pred_result.last_at else None,
+            "caches": all_cache_stats(),
         }
     except SQLAlchemyError as e:
         logger.error(f"Stats query failed: {e}", exc_info=True)
@@ -63,5 +80,71 @@ async def get_stats(db: AsyncSession = Depends(get_db)) -> dict:
             "airports": 0,
             "last_price_collected_at": None,
             "last_predicted_at": None,
+            "caches": all_cache_stats(),
             "error": True,
         }
+
+
+@router.get("/jobs")
+async def get_job_stats(
+    days: int = Query(7, ge=1, le=30),
+    db: AsyncSession = Depends(get_read_db),
+) -> dict:
+    """Per-job run history summary (duration percentiles, throughput, errors).
+
+    peak_rss_kb is how far a run raised the process's peak RSS, a lower bound
+    on the job's own peak memory (pipeline.job_history).
+    """
+    since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+    try:
+        result = await db.execute(
+            select(JobRun)
+            .where(JobRun.started_at >= since)
+            .order_by(JobRun.started_at.desc())
+        )
+        runs = result.scalars().all()
+    except SQLAlchemyError as e:
+        logger.error(f"Job stats query failed: {e}", exc_info=True)
+        return {"days": days, "jobs": [], "recent_runs": [], "error": True}
+
+    by_job: dict[str, list[JobRun]] = {}
+    for run in runs:
+        by_job.setdefault(run.job_name, []).append(run)
+
+    jobs = []
+    for job_name, job_runs in sorted(by_job.items()):
+        durations = sorted(r.duration_ms for r in job_runs)
+        latest = job_runs[0]  # runs are ordered newest first
+        rss_values = [r.peak_rss_kb for r in job_runs if r.peak_rss_kb is not None]
+        jobs.append({
+            "job_name": job_name,
+            "runs": len(job_runs),
+            "failures": sum(1 for r in job_runs if r.status != "ok"),
+            "duration_ms": {
+                **{f"p{p}": round(_percentile(durations, p)) for p in _JOB_PERCENTILES},
+                "max": durations[-1],
+            },
+            "rows_in": sum(r.rows_in for r in job_runs),
+            "rows_out": sum(r.rows_out for r in job_runs),
+            "api_calls": sum(r.api_calls for r in job_runs),
+            "errors": sum(r.errors for r in job_runs),
+            "peak_rss_kb": max(rss_values) if rss_values else None,
+            "last_run_at": latest.started_at.isoformat(),
+            "last_status": latest.status,
+        })
+
+    recent_runs = [
+        {
+            "job_name": r.job_name,
+            "started_at": r.started_at.isoformat(),
+            "duration_ms": r.duration_ms,
+            "status": r.status,
+            "rows_in": r.rows_in,
+            "rows_out": r.rows_out,
+            "api_calls": r.api_calls,
+            "errors": r.errors,
+            "peak_rss_kb": r.peak_rss_kb,
+        }
+        for r in runs[:_RECENT_JOB_RUNS]
+    ]
+    return {"days": days, "jobs": jobs, "recent_runs": recent_runs}
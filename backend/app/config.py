@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Literal
 
 from pydantic_settings import BaseSettings
 
@@ -10,8 +11,22 @@ DB_PATH = PROJECT_ROOT / "data" / "farenheit.db"
 
 
 class Settings(BaseSettings):
-    # Database (SQLite)
+    # Database: SQLite by default, or postgresql+asyncpg://... (see app.db.storage)
     DATABASE_URL: str = f"sqlite+aiosqlite:///{DB_PATH}"
+    # Read-only connections for GET endpoints (WAL lets them run beside the single writer)
+    DB_READ_POOL_SIZE: int = 4
+    DB_READ_MAX_OVERFLOW: int = 4
+    # Writer connections for background tasks (write-behind flush, schedule refresh)
+    DB_BACKGROUND_POOL_SIZE: int = 2
+    DB_BACKGROUND_MAX_OVERFLOW: int = 2
+    # SQLite PRAGMA profile for every connection (app.db.storage.SQLITE_PROFILES);
+    # the size overrides replace the profile's cache_size / mmap_size
+    SQLITE_PROFILE: Literal["durable", "balanced", "throughput"] = "balanced"
+    SQLITE_CACHE_SIZE_KB: int | None = None
+    SQLITE_MMAP_SIZE_MB: int | None = None
+    # TimescaleDB only: flight_prices chunk size and age at which chunks are compressed
+    TIMESCALE_CHUNK_DAYS: int = 7
+    TIMESCALE_COMPRESS_AFTER_DAYS: int = 14
 
     # Travelpayouts API
     TRAVELPAYOUTS_TOKEN: str = ""
@@ -24,6 +39,27 @@ class Settings(BaseSettings):
     # Aviationstack API (LCC schedule fallback)
     AVIATIONSTACK_API_KEY: str = ""
     AVIATIONSTACK_BASE_URL: str = "http://api.aviationstack.com/v1"
+    # Departure boards are per airport/date and shared by every destination
+    AVIATIONSTACK_BOARD_TTL_SECONDS: int = 21600
+
+    # Shared upstream HTTP clients (one pool per provider)
+    UPSTREAM_MAX_CONNECTIONS: int = 10
+    UPSTREAM_HTTP2: bool = True
+
+    # Upstream payloads at least this large are parsed on a worker thread
+    PARSE_OFFLOAD_MIN_BYTES: int = 65536
+
+    # Flight search result cache (pre-filter offers per route/date/cabin)
+    SEARCH_CACHE_TTL_SECONDS: int = 120
+    SEARCH_CACHE_MAX_ENTRIES: int = 512
+    # Travelpayouts month calendars behind the flexible-date search
+    CALENDAR_CACHE_TTL_SECONDS: int = 900
+    # Airlines/airports/routes snapshot; bounds staleness for writes from other processes
+    REFERENCE_DATA_TTL_SECONDS: int = 600
+    # Prices seen by live searches are buffered and bulk-inserted in the background
+    SEARCH_WRITE_FLUSH_SECONDS: float = 2.0
+    SEARCH_WRITE_BATCH_SIZE: int = 500
+    SEARCH_WRITE_QUEUE_MAX: int = 10000
 
     # Auth
     JWT_SECRET_KEY: str = "change-this-to-a-real-secret-key"
@@ -36,6 +72,9 @@ class Settings(BaseSettings):
     # Scheduler
     COLLECTION_INTERVAL_MINUTES: int = 30
     PREDICTION_INTERVAL_MINUTES: int = 60
+    # "embedded": jobs run inside the API process
+    # "external": API skips the scheduler; jobs run in `python -m pipeline.worker`
+    SCHEDULER_MODE: Literal["embedded", "external"] = "embedded"
 
     model_config = {"env_file": str(PROJECT_ROOT / ".env"), "env_file_encoding": "utf-8", "extra": "ignore"}
 
@@ -52,6 +91,9 @@ DATE_TOO_FAR_MSG = "출발일은 1년 이내여야 합니다."
 RETURN_BEFORE_DEPART_MSG = "귀국일은 출발일 이후여야 합니다."
 RETURN_DATE_TOO_FAR_MSG = "귀국일은 1년 이내여야 합니다."
 MAX_FUTURE_DAYS = 365
+MAX_FLEXIBLE_DAYS = 31
+FLEXIBLE_RANGE_INVALID_MSG = "종료일은 시작일 이후여야 합니다."
+FLEXIBLE_RANGE_TOO_LONG_MSG = f"검색 기간은 최대 {MAX_FLEXIBLE_DAYS}일입니다."
 
 # API error messages
 EMAIL_ALREADY_EXISTS_MSG = "이미 등록된 이메일입니다."
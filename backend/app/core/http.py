@@ -0,0 +1,84 @@
+"""Process-wide pooled HTTP clients for upstream flight-data providers.
+
+One ``httpx.AsyncClient`` per provider is opened in the app lifespan and
+reused by every request, so connections (and TLS sessions) are kept alive
+between searches instead of being re-established per call.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import httpx
+
+from app.config import settings
+from app.core.metrics import upstream_event_hooks
+
+logger = logging.getLogger(__name__)
+
+PROVIDERS = ("airlabs", "aviationstack", "travelpayouts")
+
+_TIMEOUT = 30.0
+_KEEPALIVE_EXPIRY = 30.0
+
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+_clients: dict[str, httpx.AsyncClient] = {}
+_clients_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _new_client(provider: str) -> httpx.AsyncClient:
+    # Each provider is served from a single host, so client limits are per-host limits
+    return httpx.AsyncClient(
+        timeout=_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=settings.UPSTREAM_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.UPSTREAM_MAX_CONNECTIONS,
+            keepalive_expiry=_KEEPALIVE_EXPIRY,
+        ),
+        http2=settings.UPSTREAM_HTTP2 and _HTTP2_AVAILABLE,
+        event_hooks=upstream_event_hooks(provider),
+    )
+
+
+async def open_clients() -> None:
+    """Create the shared provider clients on the running (API) event loop."""
+    global _clients_loop
+    if settings.UPSTREAM_HTTP2 and not _HTTP2_AVAILABLE:
+        logger.warning("UPSTREAM_HTTP2 is enabled but 'h2' is not installed; using HTTP/1.1")
+    for provider in PROVIDERS:
+        _clients[provider] = _new_client(provider)
+    _clients_loop = asyncio.get_running_loop()
+
+
+async def close_clients() -> None:
+    global _clients_loop
+    clients = list(_clients.values())
+    _clients.clear()
+    _clients_loop = None
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"Failed to close HTTP client: {e}")
+
+
+@asynccontextmanager
+async def upstream_client(provider: str) -> AsyncIterator[httpx.AsyncClient]:
+    """Yield the shared client for a provider.
+
+    Falls back to a short-lived client when the shared ones are not open
+    (scripts, the standalone worker) or the caller runs on another event
+    loop (the pipeline loop) — an httpx client's pool is tied to one loop.
+    """
+    client = _clients.get(provider)
+    if client is not None and _clients_loop is asyncio.get_running_loop():
+        yield client
+        return
+    async with _new_client(provider) as ephemeral:
+        yield ephemeral
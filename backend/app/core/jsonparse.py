@@ -0,0 +1,47 @@
+"""JSON decoding for upstream payloads, kept off the event loop when large.
+
+orjson is used when installed (``pip install .[fast-json]``); the stdlib
+decoder is the fallback. Small payloads are parsed inline because a thread
+hop costs more than the parse itself.
+"""
+
+import asyncio
+import json
+from collections.abc import Callable
+from typing import Any, ParamSpec, TypeVar
+
+from app.config import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode JSON with orjson if available, else the stdlib decoder."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def loads_or_empty(data: bytes) -> Any:
+    """Decode a JSON body, treating an empty or malformed payload as {}."""
+    if not data:
+        return {}
+    try:
+        return loads(data)
+    except ValueError:
+        return {}
+
+
+async def run_parser(
+    payload_bytes: int, parser: Callable[P, T], *args: P.args, **kwargs: P.kwargs,
+) -> T:
+    """Run a synchronous parser inline, or on a worker thread for large payloads."""
+    if payload_bytes >= settings.PARSE_OFFLOAD_MIN_BYTES:
+        return await asyncio.to_thread(parser, *args, **kwargs)
+    return parser(*args, **kwargs)
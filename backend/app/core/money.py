@@ -0,0 +1,48 @@
+"""Integer minor-unit prices.
+
+Prices are stored as integers in the currency's minor unit: 1 = one won for
+KRW (no minor unit), one cent for USD. MIN/GROUP BY compare integers, rows
+are smaller, and reads do not build a Decimal per value. Decimal appears only
+at the API boundary, through ``from_minor``/``to_minor``.
+
+Predictions have no currency column; they are in DEFAULT_CURRENCY, like the
+collected prices they are fitted on.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+
+DEFAULT_CURRENCY = "KRW"
+
+# ISO 4217 currencies without two minor-unit digits; everything else has two
+MINOR_UNIT_DIGITS: dict[str, int] = {
+    "KRW": 0, "JPY": 0, "VND": 0, "IDR": 0, "CLP": 0,
+    "ISK": 0, "PYG": 0, "UGX": 0, "XAF": 0, "XOF": 0,
+    "BHD": 3, "JOD": 3, "KWD": 3, "OMR": 3, "TND": 3,
+}
+DEFAULT_MINOR_UNIT_DIGITS = 2
+
+_EXPONENTS = {
+    digits: Decimal(1).scaleb(-digits)
+    for digits in {*MINOR_UNIT_DIGITS.values(), DEFAULT_MINOR_UNIT_DIGITS}
+}
+
+
+def minor_unit_digits(currency: str | None) -> int:
+    return MINOR_UNIT_DIGITS.get((currency or DEFAULT_CURRENCY).upper(), DEFAULT_MINOR_UNIT_DIGITS)
+
+
+def to_minor(amount: Decimal | int | float | str, currency: str | None = DEFAULT_CURRENCY) -> int:
+    """Amount in major units (e.g. Decimal("12.34") USD) to minor units (1234), rounding half up."""
+    digits = minor_unit_digits(currency)
+    if isinstance(amount, int) and digits == 0:
+        return amount
+    value = amount if isinstance(amount, Decimal) else Decimal(str(amount))
+    return int(value.scaleb(digits).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_minor(value: int, currency: str | None = DEFAULT_CURRENCY) -> Decimal:
+    """Minor units back to a Decimal amount in major units, for API responses."""
+    digits = minor_unit_digits(currency)
+    if digits == 0:
+        return Decimal(value)
+    return Decimal(value).scaleb(-digits).quantize(_EXPONENTS[digits])
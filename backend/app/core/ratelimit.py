@@ -0,0 +1,57 @@
+"""Per-provider limits on concurrent and back-to-back upstream requests."""
+
+import asyncio
+import threading
+import time
+import weakref
+
+
+class RateLimiter:
+    """Caps in-flight requests and spaces request starts for one provider.
+
+    Use as ``async with limiter:`` around each outbound call. Start spacing is
+    reserved under a thread lock, so it holds across event loops (API and
+    pipeline); the concurrency cap is tracked per loop.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, min_interval: float = 0.0) -> None:
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.max_concurrent)
+                self._semaphores[loop] = semaphore
+            return semaphore
+
+    def _reserve_start(self) -> float:
+        """Claim the next start slot and return how long to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.min_interval
+            return start - now
+
+    async def __aenter__(self) -> "RateLimiter":
+        semaphore = self._semaphore()
+        await semaphore.acquire()
+        try:
+            delay = self._reserve_start()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        except BaseException:
+            semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self._semaphore().release()
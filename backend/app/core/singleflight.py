@@ -0,0 +1,54 @@
+"""Request coalescing: concurrent calls with the same key share one execution."""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+from app.core.metrics import SINGLEFLIGHT_CALLS
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K, V]):
+    """Deduplicate concurrent async calls by key (Go's singleflight, per process).
+
+    The first caller for a key starts the work as a task; callers arriving while
+    it is in flight await the same task. The task is shielded, so a cancelled
+    caller (e.g. client disconnect) does not cancel the work for the others.
+    Results are not cached: once the task finishes, the next call starts anew.
+    Calls are coalesced per event loop, since a task can only be awaited on the
+    loop that runs it (the API and pipeline loops may share an instance).
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._calls: dict[tuple[asyncio.AbstractEventLoop, K], asyncio.Task[V]] = {}
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        call_key = (asyncio.get_running_loop(), key)
+        task = self._calls.get(call_key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[call_key] = task
+            task.add_done_callback(lambda t: self._forget(call_key, t))
+            SINGLEFLIGHT_CALLS.inc(name=self.name, role="leader")
+        else:
+            SINGLEFLIGHT_CALLS.inc(name=self.name, role="shared")
+            logger.debug(f"{self.name}: joined in-flight call for {key}")
+        return await asyncio.shield(task)
+
+    def _forget(
+        self, key: tuple[asyncio.AbstractEventLoop, K], task: "asyncio.Task[V]",
+    ) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception as retrieved if every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> int:
+        return len(self._calls)
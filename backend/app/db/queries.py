@@ -0,0 +1,155 @@
+"""Shared read queries used by more than one service."""
+
+from collections.abc import Collection, Sequence
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import (
+    BigInteger,
+    Date,
+    DateTime,
+    Integer,
+    Row,
+    Select,
+    String,
+    column,
+    func,
+    select,
+    table,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import storage
+from app.db.storage import DAILY_MIN_VIEW
+from app.models.airline import Airline
+from app.models.flight_price import FlightPrice
+from app.models.route import Route
+
+# Columns returned per fare; all of them are in idx_fp_latest_per_airline
+_LATEST_PRICE_COLUMNS = (
+    FlightPrice.time,
+    FlightPrice.airline_code,
+    FlightPrice.departure_date,
+    FlightPrice.cabin_class,
+    FlightPrice.return_date,
+    FlightPrice.price_amount,
+    FlightPrice.currency,
+    FlightPrice.stops,
+    FlightPrice.duration_minutes,
+    FlightPrice.source,
+)
+
+# TimescaleDB continuous aggregate created by app.db.storage (PostgreSQL only)
+_daily_min = table(
+    DAILY_MIN_VIEW,
+    column("day", DateTime),
+    column("route_id", Integer),
+    column("departure_date", Date),
+    column("cabin_class", String),
+    column("min_price", BigInteger),
+)
+
+
+def latest_price_per_airline_query(
+    departure_date: date,
+    cabin_class: str,
+    *,
+    route_id: int | None = None,
+    origin: str | None = None,
+    dest: str | None = None,
+    exclude_airlines: Collection[str] = (),
+) -> Select:
+    """Newest stored fare per airline for one route/date/cabin, with the airline name.
+
+    The route is given either as ``route_id`` or as ``origin``/``dest``. One
+    ROW_NUMBER() pass over idx_fp_latest_per_airline replaces a GROUP BY
+    max(time) subquery joined back to flight_prices; the index holds every
+    selected column, so the window runs on the index alone.
+    """
+    filters = [
+        FlightPrice.departure_date == departure_date,
+        FlightPrice.cabin_class == cabin_class,
+    ]
+    if exclude_airlines:
+        filters.append(FlightPrice.airline_code.notin_(list(exclude_airlines)))
+    ranked = select(
+        *_LATEST_PRICE_COLUMNS,
+        func.row_number()
+        .over(partition_by=FlightPrice.airline_code, order_by=FlightPrice.time.desc())
+        .label("rn"),
+    )
+    if route_id is not None:
+        filters.append(FlightPrice.route_id == route_id)
+    else:
+        ranked = ranked.join(Route, Route.id == FlightPrice.route_id)
+        filters += [Route.origin_code == origin, Route.dest_code == dest]
+    ranked = ranked.where(*filters).subquery()
+
+    return (
+        select(
+            *(ranked.c[col.key] for col in _LATEST_PRICE_COLUMNS),
+            Airline.name.label("airline_name"),
+        )
+        .outerjoin(Airline, Airline.iata_code == ranked.c.airline_code)
+        .where(ranked.c.rn == 1)
+    )
+
+
+async def latest_price_per_airline(
+    db: AsyncSession,
+    departure_date: date,
+    cabin_class: str,
+    *,
+    route_id: int | None = None,
+    origin: str | None = None,
+    dest: str | None = None,
+    exclude_airlines: Collection[str] = (),
+) -> Sequence[Row]:
+    """Run :func:`latest_price_per_airline_query`.
+
+    Rows carry the FlightPrice attributes in _LATEST_PRICE_COLUMNS plus
+    ``airline_name`` (None for airlines missing from the airlines table).
+    """
+    result = await db.execute(latest_price_per_airline_query(
+        departure_date, cabin_class,
+        route_id=route_id, origin=origin, dest=dest, exclude_airlines=exclude_airlines,
+    ))
+    return result.all()
+
+
+def recent_min_price_by_departure_query(
+    route_id: int,
+    cabin_class: str,
+    date_from: date,
+    date_to: date,
+    observed_since: datetime,
+) -> Select:
+    """Cheapest fare per departure date in [date_from, date_to] observed since ``observed_since``.
+
+    On TimescaleDB this reads the daily-min continuous aggregate (one row per
+    route/date/cabin per day instead of every observation), with the window
+    widened to the whole first day; elsewhere it aggregates flight_prices.
+    """
+    if storage.has_daily_min_view:
+        return (
+            select(_daily_min.c.departure_date, func.min(_daily_min.c.min_price).label("min_price"))
+            .where(
+                _daily_min.c.route_id == route_id,
+                _daily_min.c.cabin_class == cabin_class,
+                _daily_min.c.departure_date.between(date_from, date_to),
+                _daily_min.c.day > observed_since - timedelta(days=1),
+            )
+            .group_by(_daily_min.c.departure_date)
+            .order_by(_daily_min.c.departure_date)
+        )
+    return (
+        select(FlightPrice.departure_date, func.min(FlightPrice.price_amount).label("min_price"))
+        .where(
+            FlightPrice.route_id == route_id,
+            FlightPrice.departure_date >= date_from,
+            FlightPrice.departure_date <= date_to,
+            FlightPrice.cabin_class == cabin_class,
+            FlightPrice.time >= observed_since,
+        )
+        .group_by(FlightPrice.departure_date)
+        .order_by(FlightPrice.departure_date)
+    )
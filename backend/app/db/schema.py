@@ -0,0 +1,147 @@
+"""Idempotent schema upkeep run at startup (there are no migration scripts).
+
+``create_all`` only creates missing tables, so indexes added to existing
+tables — and the data fixes they depend on — are applied here, as are the
+one-off move of price columns from NUMERIC to integer minor units and
+primary keys widened since a table was first created.
+"""
+
+import logging
+
+from sqlalchemy import Connection, Integer, inspect, text
+from sqlalchemy.schema import CreateTable
+
+from app.core.money import (
+    DEFAULT_CURRENCY,
+    DEFAULT_MINOR_UNIT_DIGITS,
+    MINOR_UNIT_DIGITS,
+    minor_unit_digits,
+)
+from app.db.storage import DAILY_MIN_VIEW, StorageBackend
+from app.models import Base
+
+logger = logging.getLogger(__name__)
+
+# Indexes that were replaced by others in the models; dropped so they stop costing writes
+_OBSOLETE_INDEXES = (
+    "idx_schedule_route",  # superseded by uq_schedule_route_flight
+    "idx_fp_route_depart_cabin",  # prefix of idx_fp_latest_per_airline
+    "idx_fp_route_depart",  # route/date lookups use idx_fp_latest_per_airline
+    "idx_fp_airline_route",  # no query filters on airline without route
+    "idx_rmp_origin_month_price",  # ranked across currencies; idx_rmp_origin_month_currency_price
+)
+
+# Price columns stored as integer minor units (app.core.money) that older
+# databases hold as NUMERIC major units: table -> (columns, currency column).
+# Predictions have no currency column and are in DEFAULT_CURRENCY.
+_MINOR_UNIT_PRICE_COLUMNS: dict[str, tuple[tuple[str, ...], str | None]] = {
+    "flight_prices": (("price_amount",), "currency"),
+    "predictions": (("predicted_price", "confidence_low", "confidence_high"), None),
+    "route_min_prices": (("min_price",), "currency"),
+}
+
+# Primary keys that gained columns after the table first shipped
+_WIDENED_PRIMARY_KEYS = ("route_min_prices",)  # + currency
+
+
+def _minor_unit_sql(column: str, currency_column: str | None) -> str:
+    if currency_column is None:
+        factor = str(10 ** minor_unit_digits(DEFAULT_CURRENCY))
+    else:
+        cases = " ".join(f"WHEN '{code}' THEN {10 ** digits}" for code, digits in MINOR_UNIT_DIGITS.items())
+        factor = f"(CASE upper({currency_column}) {cases} ELSE {10 ** DEFAULT_MINOR_UNIT_DIGITS} END)"
+    return f"CAST(ROUND({column} * {factor}) AS BIGINT)"
+
+
+def _convert_prices_to_minor_units(conn: Connection) -> None:
+    """Rewrite NUMERIC price columns of an existing database as integer minor units."""
+    inspector = inspect(conn)
+    for table_name, (columns, currency_column) in _MINOR_UNIT_PRICE_COLUMNS.items():
+        types = {c["name"]: c["type"] for c in inspector.get_columns(table_name)}
+        if all(isinstance(types[name], Integer) for name in columns):
+            continue
+        logger.info(f"Converting {table_name} prices to integer minor units")
+        if conn.dialect.name == "sqlite":
+            _rebuild_sqlite_table(conn, table_name, columns, currency_column)
+            continue
+        if table_name == "flight_prices":
+            # A view over the column blocks the type change; prepare_schema() recreates it
+            conn.execute(text(f"DROP MATERIALIZED VIEW IF EXISTS {DAILY_MIN_VIEW}"))
+        for name in columns:
+            conn.execute(text(
+                f"ALTER TABLE {table_name} ALTER COLUMN {name} TYPE BIGINT "
+                f"USING {_minor_unit_sql(name, currency_column)}"
+            ))
+
+
+def _widen_primary_keys(conn: Connection) -> None:
+    """Bring primary keys of existing tables up to the model's key (rows are kept)."""
+    inspector = inspect(conn)
+    for table_name in _WIDENED_PRIMARY_KEYS:
+        table = Base.metadata.tables[table_name]
+        wanted = [c.name for c in table.primary_key.columns]
+        existing = inspector.get_pk_constraint(table_name)
+        if existing["constrained_columns"] == wanted:
+            continue
+        logger.info(f"Widening {table_name} primary key to ({', '.join(wanted)})")
+        if conn.dialect.name == "sqlite":
+            _rebuild_sqlite_table(conn, table_name, (), None)
+            continue
+        conn.execute(text(f"ALTER TABLE {table_name} DROP CONSTRAINT {existing['name']}"))
+        conn.execute(text(f"ALTER TABLE {table_name} ADD PRIMARY KEY ({', '.join(wanted)})"))
+
+
+def _rebuild_sqlite_table(
+    conn: Connection, table_name: str, columns: tuple[str, ...], currency_column: str | None
+) -> None:
+    """SQLite cannot change a column type or primary key in place: copy into a
+    table built from the model, converting ``columns`` to minor units."""
+    table = Base.metadata.tables[table_name]
+    for index in inspect(conn).get_indexes(table_name):
+        conn.execute(text(f"DROP INDEX IF EXISTS {index['name']}"))
+    old_name = f"_{table_name}_numeric"
+    conn.execute(text(f"ALTER TABLE {table_name} RENAME TO {old_name}"))
+    # Indexes are recreated by ensure_schema() once the rows are in
+    conn.execute(CreateTable(table))
+    names = [c.name for c in table.columns]
+    values = [_minor_unit_sql(name, currency_column) if name in columns else name for name in names]
+    result = conn.execute(text(
+        f"INSERT INTO {table_name} ({', '.join(names)}) SELECT {', '.join(values)} FROM {old_name}"
+    ))
+    conn.execute(text(f"DROP TABLE {old_name}"))
+    logger.info(f"Rewrote {result.rowcount} {table_name} rows")
+
+
+def _dedupe_flight_schedules(conn: Connection) -> None:
+    """Keep the newest row per (origin, dest, flight) before adding the unique key."""
+    indexes = {ix["name"] for ix in inspect(conn).get_indexes("flight_schedules")}
+    if "uq_schedule_route_flight" in indexes:
+        return
+    result = conn.execute(text(
+        "DELETE FROM flight_schedules WHERE id NOT IN ("
+        "SELECT MAX(id) FROM flight_schedules GROUP BY origin_code, dest_code, flight_iata)"
+    ))
+    if result.rowcount:
+        logger.info(f"Removed {result.rowcount} duplicate flight schedules")
+
+
+def _drop_obsolete_indexes(conn: Connection) -> None:
+    for name in _OBSOLETE_INDEXES:
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+def ensure_schema(conn: Connection, storage: StorageBackend) -> None:
+    """Create missing tables and indexes, applying data fixes they need first.
+
+    Ends with the backend's own objects (TimescaleDB hypertable, compression
+    and continuous aggregate on PostgreSQL).
+    """
+    Base.metadata.create_all(conn)
+    _convert_prices_to_minor_units(conn)
+    _widen_primary_keys(conn)
+    _dedupe_flight_schedules(conn)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+    _drop_obsolete_indexes(conn)
+    storage.prepare_schema(conn)
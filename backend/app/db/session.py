@@ -1,32 +1,79 @@
 import logging
+import time
 from collections.abc import AsyncIterator
 from typing import Any
 
 from sqlalchemy import event
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
-from app.config import settings, DB_PATH
+from app.config import settings
+from app.core.metrics import DB_QUERY_DURATION
+from app.db.storage import get_storage_backend
 
 logger = logging.getLogger(__name__)
 
-# Ensure data directory exists
-DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+# SQLite or PostgreSQL/TimescaleDB, from the DATABASE_URL scheme
+storage = get_storage_backend(settings.DATABASE_URL)
 
-# StaticPool: single connection reused across async tasks (safe for SQLite + aiosqlite)
-engine = create_async_engine(settings.DATABASE_URL, echo=False, poolclass=StaticPool)
+# Writer: on SQLite a single StaticPool connection reused across async tasks (safe
+# for aiosqlite), so writes never contend with each other for the file lock
+engine = create_async_engine(settings.DATABASE_URL, echo=False, **storage.writer_options())
 
+# Readers: a real pool, so GET endpoints run in parallel (under WAL on SQLite)
+# instead of queueing behind the writer connection
+read_engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=False,
+    **storage.pool_options(settings.DB_READ_POOL_SIZE, settings.DB_READ_MAX_OVERFLOW, read_only=True),
+) if storage.separate_readers else engine
+
+# Background writers (write-behind flusher, schedule refreshes, detached searches):
+# their own pooled connections, so they never join a request's open transaction on
+# the shared writer connection; on SQLite they queue for the file lock (busy_timeout)
+background_engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=False,
+    **storage.pool_options(settings.DB_BACKGROUND_POOL_SIZE, settings.DB_BACKGROUND_MAX_OVERFLOW),
+) if storage.separate_readers else engine
+
+
+def _instrument(target: AsyncEngine, read_only: bool) -> None:
+    @event.listens_for(target.sync_engine, "connect")
+    def _configure_connection(dbapi_connection: Any, connection_record: Any) -> None:
+        storage.configure_connection(dbapi_connection, read_only)
+
+    # Query timing for /metrics (a stack handles nested executes on one connection)
+    @event.listens_for(target.sync_engine, "before_cursor_execute")
+    def _start_query_timer(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(target.sync_engine, "after_cursor_execute")
+    def _record_query_time(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        starts = conn.info.get("query_start")
+        if not starts:
+            return
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+        DB_QUERY_DURATION.observe(time.perf_counter() - starts.pop(), operation=operation)
+
+    @event.listens_for(target.sync_engine, "handle_error")
+    def _discard_query_timer(context: Any) -> None:
+        starts = context.connection.info.get("query_start") if context.connection is not None else None
+        if starts:
+            starts.pop()
+
+
+_instrument(engine, read_only=False)
+if read_engine is not engine:
+    _instrument(read_engine, read_only=True)
+if background_engine is not engine:
+    _instrument(background_engine, read_only=False)
 
-# Enable SQLite foreign key enforcement on every connection
-@event.listens_for(engine.sync_engine, "connect")
-def _set_sqlite_pragma(dbapi_connection: Any, connection_record: Any) -> None:
-    cursor = dbapi_connection.cursor()
-    cursor.execute("PRAGMA foreign_keys=ON")
-    cursor.execute("PRAGMA journal_mode=WAL")
-    cursor.execute("PRAGMA busy_timeout=5000")
-    cursor.close()
 
 async_session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+read_session_factory = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+background_session_factory = async_sessionmaker(
+    background_engine, class_=AsyncSession, expire_on_commit=False,
+)
 
 
 async def get_db() -> AsyncIterator[AsyncSession]:
@@ -38,3 +85,17 @@ async def get_db() -> AsyncIterator[AsyncSession]:
             logger.warning(f"Session rollback after exception: {type(e).__name__}: {e}")
             await session.rollback()
             raise
+
+
+async def get_read_db() -> AsyncIterator[AsyncSession]:
+    """Session on the read pool for endpoints that never write."""
+    async with read_session_factory() as session:
+        yield session
+
+
+async def dispose_engines() -> None:
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
+    if background_engine is not engine:
+        await background_engine.dispose()
@@ -0,0 +1,275 @@
+"""Storage backends: what differs between SQLite and PostgreSQL/TimescaleDB.
+
+Models and queries are written once against SQLAlchemy. The engine options,
+per-connection setup and extra schema objects each database needs live here,
+picked from the DATABASE_URL scheme:
+
+  sqlite+aiosqlite:///...       local default (WAL, one writer + read pool)
+  postgresql+asyncpg://...      needs the ``postgres`` extra (asyncpg)
+
+On PostgreSQL with the timescaledb extension, ensure_schema() also turns
+flight_prices into a hypertable partitioned on ``time``, compresses old
+chunks and maintains a daily-min continuous aggregate. A plain PostgreSQL
+server runs the same models without them.
+
+SQLite connections get the PRAGMA set named by SQLITE_PROFILE, and
+``optimize()`` (run at startup and after the daily cleanup) keeps planner
+statistics current.
+
+Datetimes stay naive UTC on every backend (``timestamp without time zone`` on
+PostgreSQL, with the session time zone pinned to UTC), so no model or query
+changes with the backend.
+"""
+
+import importlib.util
+import logging
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import Connection, text
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# PRAGMA sets for SQLITE_PROFILE, applied to every connection of both processes.
+# cache_size is per connection (negative = KiB) while the mmap window is shared
+# through the OS page cache, so the larger profiles grow mmap rather than cache.
+SQLITE_PROFILES: dict[str, dict[str, int | str]] = {
+    # SQLite's own defaults under WAL: fsync on every commit, 2 MB page cache
+    "durable": {"synchronous": "FULL"},
+    # WAL + NORMAL only fsyncs at checkpoints: a power cut may lose the last
+    # commits but cannot corrupt the file
+    "balanced": {
+        "synchronous": "NORMAL",
+        "cache_size": -16384,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "wal_autocheckpoint": 1000,
+    },
+    # Bulk collection on a dedicated host: bigger map, fewer checkpoints
+    "throughput": {
+        "synchronous": "NORMAL",
+        "cache_size": -65536,
+        "mmap_size": 1024 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "wal_autocheckpoint": 4000,
+    },
+}
+
+# Rows sampled per index by PRAGMA optimize, so it stays cheap on large tables
+_SQLITE_ANALYSIS_LIMIT = 1000
+
+# Continuous aggregate over flight_prices: cheapest fare per observation day
+DAILY_MIN_VIEW = "flight_price_daily_min"
+
+_CREATE_DAILY_MIN_VIEW = f"""
+CREATE MATERIALIZED VIEW IF NOT EXISTS {DAILY_MIN_VIEW}
+WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+SELECT time_bucket(INTERVAL '1 day', time) AS day,
+       route_id, departure_date, cabin_class,
+       min(price_amount) AS min_price,
+       count(*) AS observations
+FROM flight_prices
+GROUP BY day, route_id, departure_date, cabin_class
+WITH NO DATA
+"""
+
+# Prices are always read per route, then by departure date/cabin/airline
+_COMPRESSION_SETTINGS = (
+    "timescaledb.compress, "
+    "timescaledb.compress_segmentby = 'route_id', "
+    "timescaledb.compress_orderby = 'departure_date, cabin_class, airline_code, time DESC'"
+)
+
+
+class StorageBackend:
+    """Engine options, connection setup and schema extras for one database."""
+
+    name = "base"
+
+    def __init__(self, url: URL) -> None:
+        self.url = url
+        # Set by prepare_schema() once the daily-min continuous aggregate exists
+        self.has_daily_min_view = False
+
+    @property
+    def separate_readers(self) -> bool:
+        """Whether read-only sessions may use their own connections."""
+        return True
+
+    def writer_options(self) -> dict[str, Any]:
+        """create_async_engine() options for the API writer engine."""
+        return {}
+
+    def pool_options(self, pool_size: int, max_overflow: int, read_only: bool = False) -> dict[str, Any]:
+        """create_async_engine() options for a pooled engine."""
+        return {"pool_size": pool_size, "max_overflow": max_overflow}
+
+    def configure_connection(self, dbapi_connection: Any, read_only: bool) -> None:
+        """Per-connection setup, run from the engine's "connect" event."""
+
+    def prepare_schema(self, conn: Connection) -> None:
+        """Backend-specific DDL, run at the end of ensure_schema()."""
+
+    def optimize(self, conn: Connection) -> None:
+        """Periodic planner-statistics upkeep (the daily cleanup job runs it)."""
+
+
+class SQLiteBackend(StorageBackend):
+    name = "sqlite"
+
+    def __init__(self, url: URL) -> None:
+        super().__init__(url)
+        self.in_memory = url.database in (None, "", ":memory:")
+        if not self.in_memory:
+            Path(url.database).parent.mkdir(parents=True, exist_ok=True)
+        self.pragmas = sqlite_pragmas(settings.SQLITE_PROFILE)
+
+    @property
+    def separate_readers(self) -> bool:
+        # An in-memory database exists only inside the connection that created it
+        return not self.in_memory
+
+    def writer_options(self) -> dict[str, Any]:
+        # One connection reused across async tasks, so writes never contend for the file lock
+        return {"poolclass": StaticPool}
+
+    def configure_connection(self, dbapi_connection: Any, read_only: bool) -> None:
+        cursor = dbapi_connection.cursor()
+        # Enable SQLite foreign key enforcement on every connection
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        for name, value in self.pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        if read_only:
+            # Turns an accidental write on a GET path into an error instead of lock contention
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+    def prepare_schema(self, conn: Connection) -> None:
+        # Fresh statistics for indexes ensure_schema() may just have created
+        self.optimize(conn)
+
+    def optimize(self, conn: Connection) -> None:
+        conn.exec_driver_sql(f"PRAGMA analysis_limit={_SQLITE_ANALYSIS_LIMIT}")
+        conn.exec_driver_sql("PRAGMA optimize")
+
+
+class PostgresBackend(StorageBackend):
+    name = "postgresql"
+
+    def __init__(self, url: URL) -> None:
+        super().__init__(url)
+        if url.get_driver_name() != "asyncpg":
+            raise ValueError(f"Unsupported PostgreSQL driver {url.get_driver_name()!r}; use postgresql+asyncpg://")
+        if importlib.util.find_spec("asyncpg") is None:
+            raise RuntimeError("DATABASE_URL needs asyncpg; install the backend with the 'postgres' extra")
+
+    def _connect_args(self, read_only: bool) -> dict[str, Any]:
+        # Applied at connection startup, so pool resets (ROLLBACK) cannot undo them
+        server_settings = {"timezone": "UTC"}
+        if read_only:
+            server_settings["default_transaction_read_only"] = "on"
+        return {"server_settings": server_settings}
+
+    def writer_options(self) -> dict[str, Any]:
+        return {"pool_pre_ping": True, "connect_args": self._connect_args(read_only=False)}
+
+    def pool_options(self, pool_size: int, max_overflow: int, read_only: bool = False) -> dict[str, Any]:
+        return {
+            **super().pool_options(pool_size, max_overflow, read_only),
+            "pool_pre_ping": True,
+            "connect_args": self._connect_args(read_only),
+        }
+
+    def prepare_schema(self, conn: Connection) -> None:
+        if not _enable_timescale(conn):
+            logger.info("timescaledb extension not available; flight_prices stays a plain table")
+            return
+
+        conn.execute(
+            text(
+                "SELECT create_hypertable('flight_prices', 'time', "
+                "chunk_time_interval => make_interval(days => :days), "
+                "if_not_exists => TRUE, migrate_data => TRUE)"
+            ),
+            {"days": settings.TIMESCALE_CHUNK_DAYS},
+        )
+
+        # Compression settings cannot be changed once chunks are compressed, so set them once
+        compression_enabled = conn.execute(text(
+            "SELECT compression_enabled FROM timescaledb_information.hypertables "
+            "WHERE hypertable_name = 'flight_prices'"
+        )).scalar()
+        if not compression_enabled:
+            conn.execute(text(f"ALTER TABLE flight_prices SET ({_COMPRESSION_SETTINGS})"))
+        conn.execute(
+            text(
+                "SELECT add_compression_policy('flight_prices', make_interval(days => :days), "
+                "if_not_exists => TRUE)"
+            ),
+            {"days": settings.TIMESCALE_COMPRESS_AFTER_DAYS},
+        )
+
+        # Real-time aggregate: materialized days plus not-yet-refreshed recent rows
+        conn.execute(text(_CREATE_DAILY_MIN_VIEW))
+        conn.execute(text(
+            f"CREATE INDEX IF NOT EXISTS idx_fpdm_route_cabin_depart "
+            f"ON {DAILY_MIN_VIEW} (route_id, cabin_class, departure_date, day)"
+        ))
+        conn.execute(text(
+            f"SELECT add_continuous_aggregate_policy('{DAILY_MIN_VIEW}', "
+            "start_offset => INTERVAL '3 days', end_offset => INTERVAL '1 hour', "
+            "schedule_interval => INTERVAL '1 hour', if_not_exists => TRUE)"
+        ))
+        self.has_daily_min_view = True
+
+
+def _enable_timescale(conn: Connection) -> bool:
+    available = conn.execute(text(
+        "SELECT installed_version FROM pg_available_extensions WHERE name = 'timescaledb'"
+    )).first()
+    if available is None:
+        return False
+    if available.installed_version is not None:
+        return True
+    try:
+        with conn.begin_nested():
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS timescaledb"))
+    except DBAPIError as e:
+        # Not in shared_preload_libraries, or no privilege to create extensions
+        logger.warning(f"Could not enable timescaledb: {e}")
+        return False
+    return True
+
+
+def sqlite_pragmas(profile: str) -> dict[str, int | str]:
+    """PRAGMAs for a SQLITE_PROFILE, with the SQLITE_* size overrides applied."""
+    pragmas = dict(SQLITE_PROFILES[profile])
+    if settings.SQLITE_CACHE_SIZE_KB is not None:
+        pragmas["cache_size"] = -settings.SQLITE_CACHE_SIZE_KB
+    if settings.SQLITE_MMAP_SIZE_MB is not None:
+        pragmas["mmap_size"] = settings.SQLITE_MMAP_SIZE_MB * 1024 * 1024
+    return pragmas
+
+
+_BACKENDS: dict[str, type[StorageBackend]] = {
+    SQLiteBackend.name: SQLiteBackend,
+    PostgresBackend.name: PostgresBackend,
+}
+
+
+@cache
+def get_storage_backend(database_url: str) -> StorageBackend:
+    """Backend for a DATABASE_URL; one shared instance per URL in the process."""
+    url = make_url(database_url)
+    backend = _BACKENDS.get(url.get_backend_name())
+    if backend is None:
+        raise ValueError(f"Unsupported database {url.get_backend_name()!r}; use SQLite or PostgreSQL")
+    return backend(url)
@@ -9,9 +9,14 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 
 from app.config import settings
+from app.api.metrics import router as metrics_router
 from app.api.router import api_router
-from app.db.session import engine
-from app.models.base import Base
+from app.core.http import close_clients, open_clients
+from app.core.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT
+from app.db.schema import ensure_schema
+from app.db.session import dispose_engines, engine, read_session_factory, storage
+from app.services.price_writer import start_price_writer, stop_price_writer
+from app.services.reference_data import get_reference_data
 
 logger = logging.getLogger(__name__)
 
@@ -27,25 +32,55 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
             "Set a strong secret in .env for production!"
         )
 
-    # Create all tables on startup
+    # Create missing tables/indexes on startup
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(ensure_schema, storage)
 
-    # Start background scheduler
-    from app.scheduler import start_scheduler, stop_scheduler
-    start_scheduler()
+    # Airlines/airports/routes snapshot shared by all requests
+    async with read_session_factory() as session:
+        await get_reference_data(session)
+
+    # Pooled upstream HTTP clients shared by all searches
+    await open_clients()
+    # Background bulk writer for prices seen by searches
+    await start_price_writer()
+
+    # Start background scheduler (unless jobs run in the standalone worker)
+    embedded_scheduler = settings.SCHEDULER_MODE == "embedded"
+    if embedded_scheduler:
+        from app.scheduler import start_scheduler
+        start_scheduler()
+    else:
+        logger.info("Scheduler disabled in API process (SCHEDULER_MODE=external)")
 
     yield
 
-    stop_scheduler()
-    await engine.dispose()
+    if embedded_scheduler:
+        from app.scheduler import stop_scheduler
+        stop_scheduler()
+    await stop_price_writer()
+    await close_clients()
+    await dispose_engines()
 
 
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
         start = time.monotonic()
-        response = await call_next(request)
-        elapsed_ms = (time.monotonic() - start) * 1000
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            response = await call_next(request)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+        elapsed = time.monotonic() - start
+        # Label by route template (not raw path) to keep series cardinality bounded
+        route = request.scope.get("route")
+        HTTP_REQUEST_DURATION.observe(
+            elapsed,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=str(response.status_code),
+        )
+        elapsed_ms = elapsed * 1000
         if elapsed_ms > _SLOW_REQUEST_THRESHOLD_MS:
             logger.warning(
                 f"Slow request: {request.method} {request.url.path} "
@@ -73,6 +108,7 @@ def create_app() -> FastAPI:
     app.add_middleware(RequestLoggingMiddleware)
 
     app.include_router(api_router, prefix="/api")
+    app.include_router(metrics_router)
 
     return app
 
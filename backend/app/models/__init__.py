@@ -4,9 +4,11 @@ from app.models.airline import Airline
 from app.models.route import Route
 from app.models.flight_price import FlightPrice
 from app.models.flight_schedule import FlightSchedule
+from app.models.route_min_price import RouteMinPrice
 from app.models.prediction import Prediction
 from app.models.user import User
 from app.models.alert import PriceAlert
+from app.models.job_run import JobRun
 
 __all__ = [
     "Base",
@@ -15,7 +17,9 @@ __all__ = [
     "Route",
     "FlightPrice",
     "FlightSchedule",
+    "RouteMinPrice",
     "Prediction",
     "User",
     "PriceAlert",
+    "JobRun",
 ]
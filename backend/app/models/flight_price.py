@@ -1,7 +1,6 @@
 from datetime import date, datetime
-from decimal import Decimal
 
-from sqlalchemy import ForeignKey, Index, String
+from sqlalchemy import BigInteger, ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base
@@ -10,9 +9,11 @@ from app.models.base import Base
 class FlightPrice(Base):
     __tablename__ = "flight_prices"
     __table_args__ = (
-        Index("idx_fp_route_depart", "route_id", "departure_date", "time"),
-        Index("idx_fp_airline_route", "airline_code", "route_id", "time"),
-        Index("idx_fp_route_depart_cabin", "route_id", "departure_date", "cabin_class", "time"),
+        # "Recent prices of a route" (popular routes, route_min_prices refresh,
+        # alert checks, prediction history): route equality plus a time range,
+        # in time order, with the columns the min-price aggregates read.
+        # New rows land at the end of each route's range, so inserts stay cheap.
+        Index("idx_fp_route_time", "route_id", "time", "cabin_class", "departure_date", "price_amount"),
     )
 
     time: Mapped[datetime] = mapped_column(primary_key=True)
@@ -23,9 +24,29 @@ class FlightPrice(Base):
     departure_date: Mapped[date] = mapped_column(primary_key=True)
     cabin_class: Mapped[str] = mapped_column(String(20), primary_key=True, default="ECONOMY")
     return_date: Mapped[date | None] = mapped_column()
-    price_amount: Mapped[Decimal] = mapped_column()
+    price_amount: Mapped[int] = mapped_column(BigInteger)  # minor units of `currency` (app.core.money)
     currency: Mapped[str] = mapped_column(String(3), default="KRW")
     stops: Mapped[int] = mapped_column(default=0)
     duration_minutes: Mapped[int | None] = mapped_column()
     source: Mapped[str] = mapped_column(String(50))
     raw_offer_id: Mapped[str | None] = mapped_column(String(255))
+
+
+# Covering index for "latest fare per airline" (app.db.queries): equality on the
+# first three columns, then rows arrive already partitioned by airline and newest
+# first, and every selected column is in the index so the table is never read.
+# Its prefix also serves the route/date/cabin lookups.
+Index(
+    "idx_fp_latest_per_airline",
+    FlightPrice.route_id,
+    FlightPrice.departure_date,
+    FlightPrice.cabin_class,
+    FlightPrice.airline_code,
+    FlightPrice.time.desc(),
+    FlightPrice.price_amount,
+    FlightPrice.currency,
+    FlightPrice.stops,
+    FlightPrice.duration_minutes,
+    FlightPrice.return_date,
+    FlightPrice.source,
+)
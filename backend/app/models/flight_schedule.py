@@ -22,7 +22,8 @@ class FlightSchedule(Base):
     fetched_at: Mapped[datetime] = mapped_column(default=_utcnow)
 
     __table_args__ = (
-        Index("idx_schedule_route", "origin_code", "dest_code"),
+        # One row per flight per route: refreshes replace rows instead of appending
+        Index("uq_schedule_route_flight", "origin_code", "dest_code", "flight_iata", unique=True),
         Index("idx_schedule_airline_route", "airline_code", "origin_code", "dest_code"),
         Index("idx_schedule_route_fetched", "origin_code", "dest_code", "fetched_at"),
     )
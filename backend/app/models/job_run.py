@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy import Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class JobRun(Base):
+    __tablename__ = "job_runs"
+    __table_args__ = (Index("idx_job_run_name_started", "job_name", "started_at"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    job_name: Mapped[str] = mapped_column(String(50))
+    started_at: Mapped[datetime] = mapped_column()
+    duration_ms: Mapped[int] = mapped_column()
+    status: Mapped[str] = mapped_column(String(10))  # ok, error
+    rows_in: Mapped[int] = mapped_column(default=0)
+    rows_out: Mapped[int] = mapped_column(default=0)
+    api_calls: Mapped[int] = mapped_column(default=0)
+    errors: Mapped[int] = mapped_column(default=0)
+    # Growth of the process's peak RSS during the run: a lower bound on the job's
+    # own peak, since ru_maxrss never falls (see pipeline.job_history)
+    peak_rss_kb: Mapped[int | None] = mapped_column()
@@ -1,7 +1,7 @@
 from datetime import date, datetime
 from decimal import Decimal
 
-from sqlalchemy import ForeignKey, Index, String, UniqueConstraint
+from sqlalchemy import BigInteger, ForeignKey, Index, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base, _utcnow
@@ -21,9 +21,10 @@ class Prediction(Base):
     airline_code: Mapped[str | None] = mapped_column(String(2), ForeignKey("airlines.iata_code", ondelete="SET NULL"))
     departure_date: Mapped[date] = mapped_column()
     cabin_class: Mapped[str] = mapped_column(String(20), default="ECONOMY")
-    predicted_price: Mapped[Decimal] = mapped_column()
-    confidence_low: Mapped[Decimal | None] = mapped_column()
-    confidence_high: Mapped[Decimal | None] = mapped_column()
+    # Prices in minor units of app.core.money.DEFAULT_CURRENCY
+    predicted_price: Mapped[int] = mapped_column(BigInteger)
+    confidence_low: Mapped[int | None] = mapped_column(BigInteger)
+    confidence_high: Mapped[int | None] = mapped_column(BigInteger)
     price_direction: Mapped[str] = mapped_column(String(10))  # UP, DOWN, STABLE
     confidence_score: Mapped[Decimal | None] = mapped_column()
     model_version: Mapped[str] = mapped_column(String(50))
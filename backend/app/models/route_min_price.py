@@ -0,0 +1,37 @@
+from datetime import date, datetime
+
+from sqlalchemy import BigInteger, ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, _utcnow
+
+
+class RouteMinPrice(Base):
+    """Cheapest recent fare per route, departure month, cabin and currency.
+
+    Derived from flight_prices by the collection writer, so "cheapest
+    destinations from X" is a single index range scan instead of one
+    search per route.
+    """
+
+    __tablename__ = "route_min_prices"
+    __table_args__ = (
+        # Prices only compare within one currency, so it precedes min_price
+        Index(
+            "idx_rmp_origin_month_currency_price",
+            "origin_code", "departure_month", "cabin_class", "currency", "min_price",
+        ),
+    )
+
+    route_id: Mapped[int] = mapped_column(ForeignKey("routes.id", ondelete="CASCADE"), primary_key=True)
+    departure_month: Mapped[str] = mapped_column(String(7), primary_key=True)  # "YYYY-MM"
+    cabin_class: Mapped[str] = mapped_column(String(20), primary_key=True, default="ECONOMY")
+    origin_code: Mapped[str] = mapped_column(String(3))
+    dest_code: Mapped[str] = mapped_column(String(3))
+    min_price: Mapped[int] = mapped_column(BigInteger)  # minor units of `currency`
+    # Minor-unit amounts only compare within one currency, so it is part of the key
+    currency: Mapped[str] = mapped_column(String(3), primary_key=True, default="KRW")
+    airline_code: Mapped[str] = mapped_column(String(2))
+    departure_date: Mapped[date] = mapped_column()
+    observed_at: Mapped[datetime] = mapped_column()
+    updated_at: Mapped[datetime] = mapped_column(default=_utcnow)
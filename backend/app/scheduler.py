@@ -1,7 +1,16 @@
-"""APScheduler-based task scheduler (replaces Celery + Redis)."""
+"""APScheduler-based task scheduler (replaces Celery + Redis).
+
+Jobs form a small DAG: collection completion triggers prediction for just the
+routes that received new prices, which in turn triggers alert evaluation for
+those routes. An empty changed-set ends the chain, so idle runs cost nothing.
+The interval prediction job remains as a full sweep that keeps predictions
+fresh (valid_until) and picks up prices stored by user searches.
+"""
 
 import logging
+import threading
 import time
+from collections.abc import Callable
 
 from apscheduler.schedulers.background import BackgroundScheduler
 
@@ -13,12 +22,33 @@ _SLOW_JOB_THRESHOLD_SECS = 300  # Warn if job takes > 5 minutes
 _MISFIRE_GRACE_SECS = 300
 _CLEANUP_MISFIRE_GRACE_SECS = 3600
 _CLEANUP_HOUR = 4
+_PREWARM_SCHEDULES_HOUR = 3  # off-peak, ahead of the morning search traffic
 
 scheduler = BackgroundScheduler()
 
+# Serialize DAG-triggered runs with the interval sweep of the same job
+_prediction_lock = threading.Lock()
+_alert_lock = threading.Lock()
+
+
+def _trigger_downstream(job_id: str, route_ids: list[int] | None) -> None:
+    """Run the jobs that depend on job_id, scoped to the routes it changed.
+
+    Args:
+        route_ids: Changed routes (None = all routes, empty = nothing changed).
+    """
+    downstream = _DOWNSTREAM_JOBS.get(job_id, ())
+    if not downstream:
+        return
+    if route_ids is not None and not route_ids:
+        logger.info(f"Scheduler: {job_id} changed no routes, skipping {', '.join(downstream)}")
+        return
+    for next_job in downstream:
+        _DAG_JOBS[next_job](route_ids)
+
 
 def _run_collect_prices() -> None:
-    """Scheduled job: collect prices for all active routes."""
+    """Scheduled job: collect prices for all active routes, then trigger downstream jobs."""
     logger.info("Scheduler: Starting price collection...")
     start = time.monotonic()
     try:
@@ -31,31 +61,53 @@ def _run_collect_prices() -> None:
     except Exception as e:
         elapsed = time.monotonic() - start
         logger.error(f"Scheduler: Collection failed after {elapsed:.1f}s - {e}")
+        return
 
+    _trigger_downstream("collect_prices", result.get("changed_route_ids", []))
 
-def _run_predictions() -> None:
-    """Scheduled job: run ML predictions, then generate recommendations and check alerts."""
-    logger.info("Scheduler: Running predictions...")
-    start = time.monotonic()
-    try:
-        from pipeline.tasks.run_prediction import predict_all_active_sync
-        result = predict_all_active_sync()
-        elapsed = time.monotonic() - start
-        logger.info(f"Scheduler: Predictions complete in {elapsed:.1f}s - {result}")
-    except Exception as e:
-        elapsed = time.monotonic() - start
-        logger.error(f"Scheduler: Predictions failed after {elapsed:.1f}s - {e}")
 
-    # Check alerts after predictions
-    alert_start = time.monotonic()
-    try:
-        from pipeline.tasks.send_alerts import check_and_send_sync
-        alert_result = check_and_send_sync()
-        alert_elapsed = time.monotonic() - alert_start
-        logger.info(f"Scheduler: Alerts checked in {alert_elapsed:.1f}s - {alert_result}")
-    except Exception as e:
-        alert_elapsed = time.monotonic() - alert_start
-        logger.error(f"Scheduler: Alert check failed after {alert_elapsed:.1f}s - {e}")
+def _run_predictions(route_ids: list[int] | None = None) -> None:
+    """Run ML predictions (all active routes, or route_ids when DAG-triggered), then check alerts."""
+    scope = "all routes" if route_ids is None else f"{len(route_ids)} changed routes"
+    logger.info(f"Scheduler: Running predictions ({scope})...")
+    with _prediction_lock:
+        start = time.monotonic()
+        try:
+            from pipeline.tasks.run_prediction import predict_all_active_sync
+            result = predict_all_active_sync(route_ids)
+            elapsed = time.monotonic() - start
+            logger.info(f"Scheduler: Predictions complete in {elapsed:.1f}s - {result}")
+        except Exception as e:
+            elapsed = time.monotonic() - start
+            logger.error(f"Scheduler: Predictions failed after {elapsed:.1f}s - {e}")
+
+    # Alerts compare against prices, so they run for the same routes even if predictions failed
+    _trigger_downstream("run_predictions", route_ids)
+
+
+def _run_alerts(route_ids: list[int] | None = None) -> None:
+    """Check price alerts (all routes, or route_ids when DAG-triggered)."""
+    with _alert_lock:
+        alert_start = time.monotonic()
+        try:
+            from pipeline.tasks.send_alerts import check_and_send_sync
+            alert_result = check_and_send_sync(route_ids)
+            alert_elapsed = time.monotonic() - alert_start
+            logger.info(f"Scheduler: Alerts checked in {alert_elapsed:.1f}s - {alert_result}")
+        except Exception as e:
+            alert_elapsed = time.monotonic() - alert_start
+            logger.error(f"Scheduler: Alert check failed after {alert_elapsed:.1f}s - {e}")
+
+
+# Job DAG: upstream job id -> jobs triggered on its completion
+_DOWNSTREAM_JOBS: dict[str, tuple[str, ...]] = {
+    "collect_prices": ("run_predictions",),
+    "run_predictions": ("check_alerts",),
+}
+_DAG_JOBS: dict[str, Callable[[list[int] | None], None]] = {
+    "run_predictions": _run_predictions,
+    "check_alerts": _run_alerts,
+}
 
 
 def _run_cleanup() -> None:
@@ -71,6 +123,19 @@ def _run_cleanup() -> None:
         logger.error(f"Scheduler: Cleanup failed after {elapsed:.1f}s - {e}")
 
 
+def _run_prewarm_schedules() -> None:
+    """Scheduled job: refresh cached flight schedules for active routes."""
+    start = time.monotonic()
+    try:
+        from pipeline.tasks.prewarm_schedules import prewarm_schedules_sync
+        result = prewarm_schedules_sync()
+        elapsed = time.monotonic() - start
+        logger.info(f"Scheduler: Schedule prewarm complete in {elapsed:.1f}s - {result}")
+    except Exception as e:
+        elapsed = time.monotonic() - start
+        logger.error(f"Scheduler: Schedule prewarm failed after {elapsed:.1f}s - {e}")
+
+
 def start_scheduler() -> None:
     """Start the background scheduler with configured jobs."""
     # Collect prices periodically
@@ -91,12 +156,24 @@ def start_scheduler() -> None:
         "interval",
         minutes=settings.PREDICTION_INTERVAL_MINUTES,
         id="run_predictions",
-        name="Run ML predictions + alerts",
+        name="Run ML predictions + alerts (full sweep)",
         replace_existing=True,
         max_instances=1,
         misfire_grace_time=_MISFIRE_GRACE_SECS,
     )
 
+    # Daily schedule prewarm
+    scheduler.add_job(
+        _run_prewarm_schedules,
+        "cron",
+        hour=_PREWARM_SCHEDULES_HOUR,
+        id="prewarm_schedules",
+        name="Prewarm flight schedules",
+        replace_existing=True,
+        max_instances=1,
+        misfire_grace_time=_CLEANUP_MISFIRE_GRACE_SECS,
+    )
+
     # Daily cleanup
     scheduler.add_job(
         _run_cleanup,
@@ -116,11 +193,18 @@ def start_scheduler() -> None:
     )
 
 
-def stop_scheduler() -> None:
-    """Stop the scheduler."""
+def stop_scheduler(wait: bool = False) -> None:
+    """Stop the scheduler.
+
+    Args:
+        wait: Block until running jobs finish (used by the standalone worker).
+    """
     if scheduler.running:
         try:
-            scheduler.shutdown(wait=False)
+            scheduler.shutdown(wait=wait)
             logger.info("Scheduler stopped")
+            # Close the persistent pipeline loop and its pooled connections
+            from pipeline import runtime
+            runtime.shutdown()
         except Exception as e:
             logger.error(f"Scheduler shutdown error: {e}", exc_info=True)
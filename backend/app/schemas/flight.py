@@ -55,6 +55,25 @@ class FlightSearchResponse(BaseModel):
     data_source: str = "live"  # "live" (API) or "cached" (DB fallback)
 
 
+class DailyMinPrice(BaseModel):
+    departure_date: date
+    price_amount: Decimal | None = Field(None, gt=0)
+    currency: str | None = None
+    airline_code: str | None = None
+    stops: int | None = Field(None, ge=0)
+    data_source: str | None = None  # "live" (calendar API) or "cached" (DB)
+
+
+class FlexibleSearchResponse(BaseModel):
+    origin: str
+    destination: str
+    cabin_class: str
+    start_date: date
+    end_date: date
+    days: list[DailyMinPrice]
+    cheapest: DailyMinPrice | None = None
+
+
 class PricePoint(BaseModel):
     time: datetime
     price_amount: Decimal
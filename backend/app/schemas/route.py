@@ -1,3 +1,4 @@
+from datetime import date, datetime
 from decimal import Decimal
 
 from pydantic import BaseModel, Field
@@ -23,3 +24,16 @@ class AirportSearchResponse(BaseModel):
     country_code: str
 
     model_config = {"from_attributes": True}
+
+
+class AnywhereDestinationResponse(BaseModel):
+    route_id: int
+    dest_code: str
+    dest_city: str | None = None
+    departure_month: str
+    cabin_class: str
+    min_price: Decimal = Field(..., ge=0)
+    currency: str
+    airline_code: str
+    departure_date: date
+    observed_at: datetime
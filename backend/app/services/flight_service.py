@@ -1,38 +1,73 @@
 import asyncio
 import logging
+from collections.abc import Awaitable, Mapping
+from dataclasses import dataclass
 from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal, InvalidOperation
+from types import MappingProxyType
+from typing import TypeVar
 
 import httpx
 from sqlalchemy import select, func, delete
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
-from app.models.airline import Airline
+from app.core.cache import TTLCache
+from app.core.http import upstream_client
+from app.core.jsonparse import loads_or_empty, run_parser
+from app.core.metrics import record_cache_lookup
+from app.core.money import from_minor, to_minor
+from app.core.ratelimit import RateLimiter
+from app.core.singleflight import SingleFlight
+from app.db.queries import latest_price_per_airline
+from app.db.session import background_session_factory
 from app.models.flight_price import FlightPrice
 from app.models.flight_schedule import FlightSchedule
 from app.models.route import Route
 from app.schemas.flight import (
     AirlineInfo,
+    DailyMinPrice,
+    FlexibleSearchResponse,
     FlightOffer,
     FlightSearchResponse,
     PriceHistoryResponse,
     PricePoint,
 )
+from app.services.price_writer import enqueue_prices
+from app.services.reference_data import RouteRef, find_route, get_reference_data, invalidate_reference_data
 
 logger = logging.getLogger(__name__)
 
 _DEFAULT_CURRENCY = "KRW"
 _SOURCE = "travelpayouts"
 _SEARCH_SOURCE = "travelpayouts-search"
-_HTTP_TIMEOUT = 30.0
 _DURATION_SORT_FALLBACK = 9999
 _SCHEDULE_CACHE_HOURS = 24
+_SCHEDULE_INDEX_MAX_ROUTES = 2048
+_CALENDAR_CACHE_MAX_ENTRIES = 1024
+_FLEXIBLE_DB_MAX_AGE_DAYS = 7  # older observations are too stale to quote as a day's price
 
 
 _MAX_FLIGHT_DURATION_MINUTES = 1080  # 18 hours — HH:MM durations above this are likely cross-timezone errors
 
+_AVIATIONSTACK_FUTURE_MIN_DAYS = 7
+_AVIATIONSTACK_RETRY_DELAY = 1.5
+_AVIATIONSTACK_MAX_RETRIES = 2
+_AVIATIONSTACK_MIN_INTERVAL = 1.5  # free tier answers back-to-back calls with 429
+_AVIATIONSTACK_BOARD_MAX_ENTRIES = 256
+
+_BoardKey = tuple[str, str, date]  # (airport, endpoint, date)
+
+T = TypeVar("T")
+
+# Per-provider limits shared by every search, so concurrent fan-out stays polite
+_airlabs_limiter = RateLimiter("airlabs", max_concurrent=2)
+_aviationstack_limiter = RateLimiter(
+    "aviationstack", max_concurrent=1, min_interval=_AVIATIONSTACK_MIN_INTERVAL,
+)
+_travelpayouts_limiter = RateLimiter("travelpayouts", max_concurrent=4)
+
+
 def _calc_duration_from_hhmm(dep_hhmm: str, arr_hhmm: str) -> int | None:
     """Calculate duration in minutes from HH:MM departure and arrival times.
 
@@ -100,18 +135,19 @@ class AirLabsClient:
             logger.warning("AirLabs API key not configured")
             return []
         try:
-            async with httpx.AsyncClient(timeout=_HTTP_TIMEOUT) as client:
-                resp = await client.get(
-                    f"{self.base_url}/schedules",
-                    params={
-                        "dep_iata": origin,
-                        "arr_iata": dest,
-                        "api_key": self.api_key,
-                    },
-                )
+            async with upstream_client("airlabs") as client:
+                async with _airlabs_limiter:
+                    resp = await client.get(
+                        f"{self.base_url}/schedules",
+                        params={
+                            "dep_iata": origin,
+                            "arr_iata": dest,
+                            "api_key": self.api_key,
+                        },
+                    )
                 if resp.status_code == 200:
-                    data = resp.json()
-                    return data.get("response", [])
+                    data = await run_parser(len(resp.content), loads_or_empty, resp.content)
+                    return data.get("response", []) if isinstance(data, dict) else []
                 logger.warning(f"AirLabs schedules failed: {resp.status_code}")
                 return []
         except Exception as e:
@@ -121,10 +157,6 @@ class AirLabsClient:
 
 _airlabs_client = AirLabsClient()
 
-_AVIATIONSTACK_FUTURE_MIN_DAYS = 7
-_AVIATIONSTACK_RETRY_DELAY = 1.5
-_AVIATIONSTACK_MAX_RETRIES = 2
-
 
 class AviationstackClient:
     """Aviationstack API client — fallback for LCC schedules missing from AirLabs."""
@@ -143,84 +175,118 @@ class AviationstackClient:
         """
         if not self.api_key:
             return []
+        board = await self.fetch_departure_board(origin, target_date)
+        results = [entry for entry in board if entry["arr_iata"] == dest]
+        logger.info(f"Aviationstack: {origin}->{dest} got {len(results)} flights")
+        return results
+
+    async def fetch_departure_board(
+        self, origin: str, target_date: date | None = None,
+    ) -> list[dict]:
+        """All departures from an airport, cached per (airport, endpoint, date).
 
+        Both endpoints are keyed only by airport and date, so searches to any
+        destination from the same hub share one upstream fetch.
+        """
         today = datetime.now(timezone.utc).date()
-        use_future = target_date and (target_date - today).days >= _AVIATIONSTACK_FUTURE_MIN_DAYS
+        if target_date and (target_date - today).days >= _AVIATIONSTACK_FUTURE_MIN_DAYS:
+            key = (origin, "flightsFuture", target_date)
+        else:
+            key = (origin, "timetable", today)
+        board = _aviationstack_boards.get(key)
+        if board is None:
+            board = await _aviationstack_board_flight.do(key, lambda: self._fetch_departure_board(key))
+        return board
+
+    async def _fetch_departure_board(self, key: _BoardKey) -> list[dict]:
+        """Fetch and parse one departure board; only successful fetches are cached."""
+        origin, endpoint_name, board_date = key
+        params: dict = {
+            "access_key": self.api_key,
+            "iataCode": origin,
+            "type": "departure",
+        }
+        if endpoint_name == "flightsFuture":
+            params["date"] = board_date.isoformat()
+        endpoint = f"{self.base_url}/{endpoint_name}"
 
         try:
-            async with httpx.AsyncClient(timeout=_HTTP_TIMEOUT) as client:
-                if use_future:
-                    params: dict = {
-                        "access_key": self.api_key,
-                        "iataCode": origin,
-                        "type": "departure",
-                        "date": target_date.isoformat(),
-                    }
-                    endpoint = f"{self.base_url}/flightsFuture"
-                else:
-                    params = {
-                        "access_key": self.api_key,
-                        "iataCode": origin,
-                        "type": "departure",
-                    }
-                    endpoint = f"{self.base_url}/timetable"
-
-                resp = await client.get(endpoint, params=params)
+            async with upstream_client("aviationstack") as client:
+                async with _aviationstack_limiter:
+                    resp = await client.get(endpoint, params=params)
                 # Retry on rate limit (429)
                 for _ in range(_AVIATIONSTACK_MAX_RETRIES):
                     if resp.status_code != 429:
                         break
                     logger.info(f"Aviationstack 429, retrying after {_AVIATIONSTACK_RETRY_DELAY}s...")
                     await asyncio.sleep(_AVIATIONSTACK_RETRY_DELAY)
-                    resp = await client.get(endpoint, params=params)
+                    async with _aviationstack_limiter:
+                        resp = await client.get(endpoint, params=params)
 
                 if resp.status_code != 200:
                     logger.warning(f"Aviationstack failed: {resp.status_code}")
                     return []
 
-                data = resp.json()
-                raw_list = data if isinstance(data, list) else data.get("data", [])
-                if not raw_list:
-                    return []
-
-                results: list[dict] = []
-                for entry in raw_list:
-                    arrival = entry.get("arrival", {})
-                    departure = entry.get("departure", {})
-                    flight = entry.get("flight", {})
-                    airline = entry.get("airline", {})
+            board = await run_parser(len(resp.content), _parse_aviationstack_board, resp.content)
+        except Exception as e:
+            logger.error(f"Aviationstack API error: {e}")
+            return []
 
-                    arr_iata = (arrival.get("iataCode") or "").upper()
-                    if arr_iata != dest:
-                        continue
+        _aviationstack_boards.set(key, board)
+        return board
 
-                    flight_iata = (flight.get("iataNumber") or "").upper()
-                    airline_iata = (airline.get("iataCode") or "").upper()
-                    dep_scheduled = departure.get("scheduledTime") or ""
-                    arr_scheduled = arrival.get("scheduledTime") or ""
 
-                    dep_hm = _extract_time(dep_scheduled) if "T" in dep_scheduled else (dep_scheduled[:5] if len(dep_scheduled) >= 5 else None)
-                    arr_hm = _extract_time(arr_scheduled) if "T" in arr_scheduled else (arr_scheduled[:5] if len(arr_scheduled) >= 5 else None)
+def _parse_aviationstack_board(content: bytes) -> list[dict]:
+    """Decode an airport departure board into AirLabs-compatible dicts (plus arr_iata).
 
-                    if not flight_iata or not dep_hm or not arr_hm:
-                        continue
+    /timetable returns every departure from the airport, so this can be large
+    and may run on a worker thread.
+    """
+    data = loads_or_empty(content)
+    raw_list = data if isinstance(data, list) else data.get("data", [])
+    if not raw_list:
+        return []
+
+    results: list[dict] = []
+    for entry in raw_list:
+        arrival = entry.get("arrival", {})
+        departure = entry.get("departure", {})
+        flight = entry.get("flight", {})
+        airline = entry.get("airline", {})
+
+        arr_iata = (arrival.get("iataCode") or "").upper()
+        if not arr_iata:
+            continue
 
-                    results.append({
-                        "flight_iata": flight_iata,
-                        "airline_iata": airline_iata,
-                        "dep_time": dep_hm,
-                        "arr_time": arr_hm,
-                        "dep_terminal": departure.get("terminal"),
-                        "arr_terminal": arrival.get("terminal"),
-                    })
+        flight_iata = (flight.get("iataNumber") or "").upper()
+        airline_iata = (airline.get("iataCode") or "").upper()
+        dep_scheduled = departure.get("scheduledTime") or ""
+        arr_scheduled = arrival.get("scheduledTime") or ""
 
-                logger.info(f"Aviationstack: {origin}->{dest} got {len(results)} flights")
-                return results
+        dep_hm = _extract_time(dep_scheduled) if "T" in dep_scheduled else (dep_scheduled[:5] if len(dep_scheduled) >= 5 else None)
+        arr_hm = _extract_time(arr_scheduled) if "T" in arr_scheduled else (arr_scheduled[:5] if len(arr_scheduled) >= 5 else None)
 
-        except Exception as e:
-            logger.error(f"Aviationstack API error: {e}")
-            return []
+        if not flight_iata or not dep_hm or not arr_hm:
+            continue
 
+        results.append({
+            "arr_iata": arr_iata,
+            "flight_iata": flight_iata,
+            "airline_iata": airline_iata,
+            "dep_time": dep_hm,
+            "arr_time": arr_hm,
+            "dep_terminal": departure.get("terminal"),
+            "arr_terminal": arrival.get("terminal"),
+        })
+    return results
+
+
+_aviationstack_boards: TTLCache[_BoardKey, list[dict]] = TTLCache(
+    "aviationstack_board",
+    maxsize=_AVIATIONSTACK_BOARD_MAX_ENTRIES,
+    ttl_seconds=settings.AVIATIONSTACK_BOARD_TTL_SECONDS,
+)
+_aviationstack_board_flight: SingleFlight[_BoardKey, list[dict]] = SingleFlight("aviationstack_board")
 
 _aviationstack_client = AviationstackClient()
 
@@ -242,59 +308,127 @@ class TravelpayoutsClient:
     ) -> list[FlightOffer]:
         """Search multiple Travelpayouts endpoints in parallel for maximum data."""
         try:
-            async with httpx.AsyncClient(timeout=_HTTP_TIMEOUT) as client:
+            async with upstream_client("travelpayouts") as client:
                 cheap_task = self._fetch_cheap(client, origin, dest)
                 calendar_task = self._fetch_calendar(client, origin, dest, departure_date)
 
-                cheap_resp, calendar_resp = await asyncio.gather(
+                cheap_body, calendar_body = await asyncio.gather(
                     cheap_task, calendar_task, return_exceptions=True,
                 )
+            cheap_body = cheap_body if isinstance(cheap_body, bytes) else b""
+            calendar_body = calendar_body if isinstance(calendar_body, bytes) else b""
+            return await run_parser(
+                len(cheap_body) + len(calendar_body),
+                self._parse_search_payloads,
+                cheap_body, calendar_body, departure_date, cabin_class, return_date,
+            )
+        except Exception as e:
+            logger.error(f"Travelpayouts search error: {e}", exc_info=True)
+            return []
+
+    def _parse_search_payloads(
+        self, cheap_body: bytes, calendar_body: bytes,
+        departure_date: date, cabin_class: str, return_date: date | None,
+    ) -> list[FlightOffer]:
+        """Decode both search payloads and build offers (may run on a worker thread)."""
+        all_offers: list[FlightOffer] = []
+
+        cheap_resp = loads_or_empty(cheap_body)
+        if isinstance(cheap_resp, dict) and cheap_resp.get("success"):
+            all_offers.extend(self._parse_cheap(
+                cheap_resp.get("data", {}), departure_date, cabin_class, return_date,
+            ))
 
-                all_offers: list[FlightOffer] = []
+        calendar_resp = loads_or_empty(calendar_body)
+        if isinstance(calendar_resp, dict) and calendar_resp.get("success"):
+            all_offers.extend(self._parse_calendar(
+                calendar_resp.get("data", {}), departure_date, cabin_class, return_date,
+            ))
 
-                if isinstance(cheap_resp, dict) and cheap_resp.get("success"):
-                    all_offers.extend(self._parse_cheap(
-                        cheap_resp.get("data", {}), departure_date, cabin_class, return_date,
-                    ))
+        return all_offers
 
-                if isinstance(calendar_resp, dict) and calendar_resp.get("success"):
-                    all_offers.extend(self._parse_calendar(
-                        calendar_resp.get("data", {}), departure_date, cabin_class, return_date,
-                    ))
+    async def fetch_calendar_month(self, origin: str, dest: str, month: date) -> dict[date, DailyMinPrice]:
+        """Cheapest fare per departure day for one month (one upstream call, cached).
 
-                return all_offers
+        Only successful responses are cached; an error payload is retried on the
+        next call instead of hiding the month's fares for the whole TTL.
+        """
+        key = (origin, dest, month.strftime("%Y-%m"))
+        cached = _calendar_cache.get(key)
+        if cached is not None:
+            return cached
+        try:
+            async with upstream_client("travelpayouts") as client:
+                body = await self._fetch_calendar(client, origin, dest, month)
+            days = await run_parser(len(body), self._parse_calendar_days, body)
         except Exception as e:
-            logger.error(f"Travelpayouts search error: {e}", exc_info=True)
-            return []
+            logger.error(f"Travelpayouts calendar error: {e}")
+            return {}
+        if days is None:
+            logger.warning(f"Travelpayouts calendar unavailable: {origin}->{dest} {key[2]}")
+            return {}
+        _calendar_cache.set(key, days)
+        return days
 
-    async def _fetch_cheap(self, client: httpx.AsyncClient, origin: str, dest: str) -> dict:
-        """Fetch /v1/prices/cheap (no date filter for maximum results)."""
-        resp = await client.get(
-            f"{self.base_url}/v1/prices/cheap",
-            params={"origin": origin, "destination": dest, "currency": _DEFAULT_CURRENCY, "token": self.token},
-        )
+    @staticmethod
+    def _parse_calendar_days(body: bytes) -> dict[date, DailyMinPrice] | None:
+        """Parse /v1/prices/calendar into {departure_date: cheapest fare}.
+
+        Returns None when the body is not a successful response.
+        """
+        resp = loads_or_empty(body)
+        if not isinstance(resp, dict) or not resp.get("success"):
+            return None
+        days: dict[date, DailyMinPrice] = {}
+        for date_key, offer in resp.get("data", {}).items():
+            if not isinstance(offer, dict):
+                continue
+            try:
+                price = Decimal(str(offer["price"]))
+                if price <= 0 or not price.is_finite():
+                    continue
+                days[date.fromisoformat(date_key)] = DailyMinPrice(
+                    departure_date=date.fromisoformat(date_key),
+                    price_amount=price,
+                    currency=resp.get("currency", _DEFAULT_CURRENCY).upper(),
+                    airline_code=offer.get("airline") or None,
+                    stops=offer.get("transfers"),
+                    data_source="live",
+                )
+            except (KeyError, ValueError, InvalidOperation) as e:
+                logger.warning(f"Failed to parse calendar day {date_key}: {e}")
+        return days
+
+    async def _fetch_cheap(self, client: httpx.AsyncClient, origin: str, dest: str) -> bytes:
+        """Fetch /v1/prices/cheap (no date filter for maximum results); returns the raw body."""
+        async with _travelpayouts_limiter:
+            resp = await client.get(
+                f"{self.base_url}/v1/prices/cheap",
+                params={"origin": origin, "destination": dest, "currency": _DEFAULT_CURRENCY, "token": self.token},
+            )
         if resp.status_code == 200:
-            return resp.json()
+            return resp.content
         logger.warning(f"Travelpayouts cheap failed: {resp.status_code}")
-        return {}
+        return b""
 
     async def _fetch_calendar(
         self, client: httpx.AsyncClient, origin: str, dest: str, departure_date: date,
-    ) -> dict:
-        """Fetch /v1/prices/calendar for day-by-day prices."""
-        resp = await client.get(
-            f"{self.base_url}/v1/prices/calendar",
-            params={
-                "origin": origin, "destination": dest,
-                "depart_date": departure_date.strftime("%Y-%m"),
-                "calendar_type": "departure_date",
-                "currency": _DEFAULT_CURRENCY, "token": self.token,
-            },
-        )
+    ) -> bytes:
+        """Fetch /v1/prices/calendar for day-by-day prices; returns the raw body."""
+        async with _travelpayouts_limiter:
+            resp = await client.get(
+                f"{self.base_url}/v1/prices/calendar",
+                params={
+                    "origin": origin, "destination": dest,
+                    "depart_date": departure_date.strftime("%Y-%m"),
+                    "calendar_type": "departure_date",
+                    "currency": _DEFAULT_CURRENCY, "token": self.token,
+                },
+            )
         if resp.status_code == 200:
-            return resp.json()
+            return resp.content
         logger.warning(f"Travelpayouts calendar failed: {resp.status_code}")
-        return {}
+        return b""
 
     async def fetch_return_flight_info(
         self, origin: str, dest: str, return_date: date,
@@ -303,52 +437,63 @@ class TravelpayoutsClient:
 
         Returns {airline_code: {"flight_number": str, "departure_at": str|None, "duration_minutes": int|None}}.
         """
-        result: dict[str, dict] = {}
         try:
-            async with httpx.AsyncClient(timeout=_HTTP_TIMEOUT) as client:
+            async with upstream_client("travelpayouts") as client:
                 cheap_task = self._fetch_cheap(client, dest, origin)
                 cal_task = self._fetch_calendar(client, dest, origin, return_date)
-                cheap_resp, cal_resp = await asyncio.gather(
+                cheap_body, cal_body = await asyncio.gather(
                     cheap_task, cal_task, return_exceptions=True,
                 )
+            cheap_body = cheap_body if isinstance(cheap_body, bytes) else b""
+            cal_body = cal_body if isinstance(cal_body, bytes) else b""
+            return await run_parser(
+                len(cheap_body) + len(cal_body), self._parse_return_info, cheap_body, cal_body,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to fetch return flight info: {e}")
+            return {}
+
+    @staticmethod
+    def _parse_return_info(cheap_body: bytes, cal_body: bytes) -> dict[str, dict]:
+        """Decode reverse-route payloads into per-airline return flight info."""
+        result: dict[str, dict] = {}
+        cheap_resp = loads_or_empty(cheap_body)
+        cal_resp = loads_or_empty(cal_body)
 
-                # Parse cheap response (has duration_to)
-                if isinstance(cheap_resp, dict) and cheap_resp.get("success"):
-                    for _dest_key, stops_dict in cheap_resp.get("data", {}).items():
-                        if not isinstance(stops_dict, dict):
-                            continue
-                        for _stops_key, offer in stops_dict.items():
-                            try:
-                                airline = offer.get("airline", "")
-                                fn_raw = offer.get("flight_number")
-                                if airline and fn_raw and airline not in result:
-                                    departure_at = offer.get("departure_at", "")
-                                    duration_to = offer.get("duration_to")
-                                    result[airline] = {
-                                        "flight_number": f"{airline}{fn_raw}",
-                                        "departure_at": departure_at or None,
-                                        "duration_minutes": int(duration_to) if duration_to else None,
-                                    }
-                            except (ValueError, TypeError):
-                                continue
-
-                # Parse calendar response
-                if isinstance(cal_resp, dict) and cal_resp.get("success"):
-                    for _date_key, offer in cal_resp.get("data", {}).items():
-                        if not isinstance(offer, dict):
-                            continue
+        # Parse cheap response (has duration_to)
+        if isinstance(cheap_resp, dict) and cheap_resp.get("success"):
+            for _dest_key, stops_dict in cheap_resp.get("data", {}).items():
+                if not isinstance(stops_dict, dict):
+                    continue
+                for _stops_key, offer in stops_dict.items():
+                    try:
                         airline = offer.get("airline", "")
                         fn_raw = offer.get("flight_number")
                         if airline and fn_raw and airline not in result:
                             departure_at = offer.get("departure_at", "")
+                            duration_to = offer.get("duration_to")
                             result[airline] = {
                                 "flight_number": f"{airline}{fn_raw}",
                                 "departure_at": departure_at or None,
-                                "duration_minutes": None,
+                                "duration_minutes": int(duration_to) if duration_to else None,
                             }
+                    except (ValueError, TypeError):
+                        continue
 
-        except Exception as e:
-            logger.warning(f"Failed to fetch return flight info: {e}")
+        # Parse calendar response
+        if isinstance(cal_resp, dict) and cal_resp.get("success"):
+            for _date_key, offer in cal_resp.get("data", {}).items():
+                if not isinstance(offer, dict):
+                    continue
+                airline = offer.get("airline", "")
+                fn_raw = offer.get("flight_number")
+                if airline and fn_raw and airline not in result:
+                    departure_at = offer.get("departure_at", "")
+                    result[airline] = {
+                        "flight_number": f"{airline}{fn_raw}",
+                        "departure_at": departure_at or None,
+                        "duration_minutes": None,
+                    }
         return result
 
     def _parse_cheap(
@@ -450,133 +595,284 @@ class TravelpayoutsClient:
 # Singleton
 _tp_client = TravelpayoutsClient()
 
+_calendar_cache: TTLCache[tuple[str, str, str], dict[date, DailyMinPrice]] = TTLCache(
+    "travelpayouts_calendar",
+    maxsize=_CALENDAR_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.CALENDAR_CACHE_TTL_SECONDS,
+)
+
+
+@dataclass(frozen=True)
+class _SearchOutcome:
+    """Enriched, deduplicated offers for one (route, dates, cabin) search."""
+
+    offers: list[FlightOffer]
+    route_id: int | None
+    data_source: str
+
+
+_SearchKey = tuple[str, str, date, date | None, str]
+_ScheduleVersion = tuple[int, datetime | None]  # (row count, latest fetched_at)
+
+
+@dataclass(frozen=True, slots=True)
+class _ScheduledFlight:
+    flight_iata: str
+    airline_code: str
+    dep_time: str
+    arr_time: str
+    duration_minutes: int | None
+
+
+@dataclass(frozen=True)
+class _ScheduleIndex:
+    """Immutable lookups over one direction's cached schedules.
+
+    Built once per cache version and shared across requests, so enrichment is
+    plain dict lookups with durations already computed.
+    """
+
+    by_flight: Mapping[str, _ScheduledFlight]
+    by_airline: Mapping[str, _ScheduledFlight]  # first flight seen per airline
+    route_duration_minutes: int | None  # fallback when an offer matches no flight
+
+    def __bool__(self) -> bool:
+        return bool(self.by_flight)
+
+
+_EMPTY_SCHEDULE_INDEX = _ScheduleIndex(
+    by_flight=MappingProxyType({}), by_airline=MappingProxyType({}),
+    route_duration_minutes=None,
+)
+
+# Keyed by (origin, dest, version): any write to a route's rows changes its version
+_schedule_indexes: TTLCache[tuple[str, str, _ScheduleVersion], _ScheduleIndex] = TTLCache(
+    "schedule_index", maxsize=_SCHEDULE_INDEX_MAX_ROUTES, ttl_seconds=_SCHEDULE_CACHE_HOURS * 3600,
+)
+
+
+def _index_schedules(origin: str, dest: str, schedules: list[FlightSchedule]) -> _ScheduleIndex:
+    """Build (and share) the index for a route's current schedule rows."""
+    by_flight: dict[str, _ScheduledFlight] = {}
+    by_airline: dict[str, _ScheduledFlight] = {}
+    for s in schedules:
+        flight = _ScheduledFlight(
+            flight_iata=s.flight_iata,
+            airline_code=s.airline_code,
+            dep_time=s.dep_time,
+            arr_time=s.arr_time,
+            duration_minutes=_calc_duration_from_hhmm(s.dep_time, s.arr_time),
+        )
+        by_flight[s.flight_iata] = flight
+        if s.airline_code and s.airline_code not in by_airline:
+            by_airline[s.airline_code] = flight
+    index = _ScheduleIndex(
+        by_flight=MappingProxyType(by_flight),
+        by_airline=MappingProxyType(by_airline),
+        route_duration_minutes=(
+            _calc_duration_from_hhmm(schedules[0].dep_time, schedules[0].arr_time) if schedules else None
+        ),
+    )
+    version = (len(schedules), max((s.fetched_at for s in schedules), default=None))
+    _schedule_indexes.set((origin, dest, version), index)
+    return index
+
+
+_search_flight: SingleFlight[_SearchKey, _SearchOutcome] = SingleFlight("flight_search")
+_search_cache: TTLCache[_SearchKey, _SearchOutcome] = TTLCache(
+    "flight_search",
+    maxsize=settings.SEARCH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS,
+)
+
+
+async def _provider_result(call: Awaitable[T], default: T, what: str) -> T:
+    """Await one provider fetch; if it fails, only that provider's data is lost."""
+    try:
+        return await call
+    except Exception as e:
+        logger.error(f"{what} failed: {e}", exc_info=True)
+        return default
+
+
+async def _fetch_schedule_entries(
+    origin: str, dest: str, target_date: date | None,
+    avstack_prefetch: list[dict] | None = None,
+) -> list[dict]:
+    """Fetch AirLabs schedules, supplemented by Aviationstack for missing airlines.
+
+    Network only (no DB session), so it can run alongside other upstream calls.
+    """
+    if avstack_prefetch is not None:
+        raw = await _provider_result(
+            _airlabs_client.fetch_schedules(origin, dest), [], "AirLabs schedules",
+        )
+        avstack_raw = avstack_prefetch
+    else:
+        raw, avstack_raw = await asyncio.gather(
+            _provider_result(
+                _airlabs_client.fetch_schedules(origin, dest), [], "AirLabs schedules",
+            ),
+            _provider_result(
+                _aviationstack_client.fetch_schedules(origin, dest, target_date), [],
+                "Aviationstack schedules",
+            ),
+        )
+    airlabs_airlines = {
+        entry.get("airline_iata", "")[:2]
+        for entry in raw if entry.get("airline_iata")
+    }
+    for entry in avstack_raw:
+        airline = entry.get("airline_iata", "")[:2]
+        if airline and airline not in airlabs_airlines:
+            raw.append(entry)
+    return raw
+
+
+# In-flight background schedule refreshes, one per (origin, dest); holding the
+# task here also keeps it from being garbage-collected mid-run
+_schedule_refreshes: dict[tuple[str, str], asyncio.Task] = {}
+
+
+def _refresh_schedules_in_background(origin: str, dest: str, target_date: date | None) -> None:
+    """Re-fetch a route's stale schedules without blocking the caller (deduplicated)."""
+    key = (origin, dest)
+    if key in _schedule_refreshes:
+        return
+    task = asyncio.create_task(_refresh_schedules(origin, dest, target_date))
+    _schedule_refreshes[key] = task
+    task.add_done_callback(lambda _: _schedule_refreshes.pop(key, None))
+
+
+async def _refresh_schedules(origin: str, dest: str, target_date: date | None) -> None:
+    try:
+        # Own session and connection: the request that triggered the refresh has
+        # likely finished, and must not share a transaction with it if it hasn't
+        async with background_session_factory() as session:
+            await FlightService(session).refresh_schedules(origin, dest, target_date)
+    except Exception as e:
+        logger.error(f"Background schedule refresh failed for {origin}->{dest}: {e}")
+
+
+async def _run_detached_search(key: _SearchKey) -> _SearchOutcome:
+    """Run a search on its own session and cache a non-empty outcome.
+
+    Coalesced callers may outlive (or disconnect before) the request that
+    started the search, so it must not borrow that request's session.
+    """
+    origin, dest, departure_date, return_date, cabin_class = key
+    async with background_session_factory() as session:
+        outcome = await FlightService(session)._collect_offers(
+            origin, dest, departure_date, cabin_class, return_date,
+        )
+    # Empty results usually mean an upstream hiccup; don't pin them for the TTL
+    if outcome.offers:
+        _search_cache.set(key, outcome)
+    return outcome
+
 
 class FlightService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def _ensure_route(self, origin: str, dest: str) -> Route | None:
+    async def _ensure_route(self, origin: str, dest: str) -> RouteRef | None:
         """Create route if it doesn't exist, so scheduler can collect data for it."""
+        route = await find_route(self.db, origin, dest)
+        if route:
+            return route
+        new_route = Route(origin_code=origin, dest_code=dest, is_active=True)
+        try:
+            self.db.add(new_route)
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            # Race condition: another request may have created it
+            return await find_route(self.db, origin, dest)
+        logger.info(f"Auto-created route: {origin} -> {dest}")
+        invalidate_reference_data()
+        return RouteRef(new_route.id, origin, dest, new_route.is_active)
+
+    async def _schedule_cache_state(
+        self, origin: str, dest: str,
+    ) -> tuple[set[str], bool, _ScheduleVersion]:
+        """Cached airlines on this route, whether the cache is still fresh (<24h),
+        and the version of the cached rows (to reuse a built _ScheduleIndex)."""
         result = await self.db.execute(
-            select(Route).where(Route.origin_code == origin, Route.dest_code == dest)
+            select(FlightSchedule.airline_code, FlightSchedule.fetched_at).where(
+                FlightSchedule.origin_code == origin,
+                FlightSchedule.dest_code == dest,
+            )
         )
-        route = result.scalar_one_or_none()
-        if not route:
-            try:
-                route = Route(origin_code=origin, dest_code=dest, is_active=True)
-                self.db.add(route)
-                await self.db.flush()
-                logger.info(f"Auto-created route: {origin} -> {dest}")
-            except IntegrityError:
-                await self.db.rollback()
-                # Race condition: another request may have created it
-                result = await self.db.execute(
-                    select(Route).where(Route.origin_code == origin, Route.dest_code == dest)
-                )
-                route = result.scalar_one_or_none()
-        return route
-
-    async def _get_schedules(
-        self, origin: str, dest: str, target_date: date | None = None,
-        avstack_prefetch: list[dict] | None = None,
-    ) -> list[FlightSchedule]:
-        """Get flight schedules with 24h DB cache, falling back to AirLabs + Aviationstack.
-
-        Args:
-            avstack_prefetch: Pre-fetched Aviationstack data to avoid duplicate API calls.
-        """
-        now = datetime.now(timezone.utc).replace(tzinfo=None)
-        cutoff = now - timedelta(hours=_SCHEDULE_CACHE_HOURS)
-
-        # Check DB cache
+        rows = result.all()
+        airlines = {row.airline_code for row in rows}
+        # A route is refreshed as a whole, so its oldest row decides staleness
+        fresh = bool(rows) and min(row.fetched_at for row in rows) >= self._schedule_cutoff()
+        version = (len(rows), max((row.fetched_at for row in rows), default=None))
+        return airlines, fresh, version
+
+    async def _load_cached_schedules(self, origin: str, dest: str) -> list[FlightSchedule]:
         result = await self.db.execute(
             select(FlightSchedule).where(
                 FlightSchedule.origin_code == origin,
                 FlightSchedule.dest_code == dest,
-                FlightSchedule.fetched_at >= cutoff,
             )
         )
-        cached = result.scalars().all()
-        if cached:
-            # Supplement cache with pre-fetched Aviationstack data for missing airlines
-            if avstack_prefetch is not None:
-                cached_airlines = {s.airline_code for s in cached}
-                new_schedules: list[FlightSchedule] = []
-                seen_flights: set[str] = set()
-                for entry in avstack_prefetch:
-                    airline = entry.get("airline_iata", "")[:2]
-                    if not airline or airline in cached_airlines:
-                        continue
-                    flight_iata = entry.get("flight_iata", "")
-                    dep_time = entry.get("dep_time", "")
-                    arr_time = entry.get("arr_time", "")
-                    if not flight_iata or not dep_time or not arr_time:
-                        continue
-                    if flight_iata in seen_flights:
-                        continue
-                    dep_hm = _extract_time(dep_time) or dep_time[:5]
-                    arr_hm = _extract_time(arr_time) or arr_time[:5]
-                    sched = FlightSchedule(
-                        origin_code=origin, dest_code=dest, airline_code=airline,
-                        flight_iata=flight_iata, dep_time=dep_hm, arr_time=arr_hm,
-                        dep_terminal=entry.get("dep_terminal"),
-                        arr_terminal=entry.get("arr_terminal"),
-                        status=entry.get("status"), fetched_at=now,
-                    )
-                    new_schedules.append(sched)
-                    seen_flights.add(flight_iata)
-                if new_schedules:
-                    try:
-                        self.db.add_all(new_schedules)
-                        await self.db.commit()
-                        logger.info(f"Supplemented {len(new_schedules)} schedules: {origin}->{dest}")
-                        cached = list(cached) + new_schedules
-                    except Exception as e:
-                        logger.error(f"Failed to store supplemental schedules: {e}")
-                        await self.db.rollback()
-            logger.debug(f"Schedule cache hit: {origin}->{dest} ({len(cached)} flights)")
-            return list(cached)
-
-        # Fetch from AirLabs
-        raw = await _airlabs_client.fetch_schedules(origin, dest)
-
-        # Supplement with Aviationstack for airlines missing from AirLabs
-        airlabs_airlines = {
-            entry.get("airline_iata", "")[:2]
-            for entry in raw if entry.get("airline_iata")
-        }
-        avstack_raw = avstack_prefetch if avstack_prefetch is not None else (
-            await _aviationstack_client.fetch_schedules(origin, dest, target_date)
-        )
-        for entry in avstack_raw:
-            airline = entry.get("airline_iata", "")[:2]
-            if airline and airline not in airlabs_airlines:
-                raw.append(entry)
+        return list(result.scalars().all())
 
-        if not raw:
-            # Return stale cache if available
-            result = await self.db.execute(
-                select(FlightSchedule).where(
-                    FlightSchedule.origin_code == origin,
-                    FlightSchedule.dest_code == dest,
-                )
-            )
-            stale = result.scalars().all()
-            if stale:
-                logger.info(f"AirLabs+Aviationstack failed, using stale cache: {origin}->{dest}")
-                return list(stale)
-            return []
+    @staticmethod
+    def _schedule_cutoff() -> datetime:
+        return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=_SCHEDULE_CACHE_HOURS)
 
-        # Delete old cache for this route
-        await self.db.execute(
-            delete(FlightSchedule).where(
-                FlightSchedule.origin_code == origin,
-                FlightSchedule.dest_code == dest,
+    async def _supplement_schedules(
+        self, origin: str, dest: str, cached: list[FlightSchedule], avstack_entries: list[dict],
+    ) -> list[FlightSchedule]:
+        """Add Aviationstack flights for airlines missing from the cached schedules."""
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        cached_airlines = {s.airline_code for s in cached}
+        new_schedules: list[FlightSchedule] = []
+        # Flights already cached (under any airline code) would violate the route's unique key
+        seen_flights: set[str] = {s.flight_iata for s in cached}
+        for entry in avstack_entries:
+            airline = entry.get("airline_iata", "")[:2]
+            if not airline or airline in cached_airlines:
+                continue
+            flight_iata = entry.get("flight_iata", "")
+            dep_time = entry.get("dep_time", "")
+            arr_time = entry.get("arr_time", "")
+            if not flight_iata or not dep_time or not arr_time:
+                continue
+            if flight_iata in seen_flights:
+                continue
+            dep_hm = _extract_time(dep_time) or dep_time[:5]
+            arr_hm = _extract_time(arr_time) or arr_time[:5]
+            sched = FlightSchedule(
+                origin_code=origin, dest_code=dest, airline_code=airline,
+                flight_iata=flight_iata, dep_time=dep_hm, arr_time=arr_hm,
+                dep_terminal=entry.get("dep_terminal"),
+                arr_terminal=entry.get("arr_terminal"),
+                status=entry.get("status"), fetched_at=now,
             )
-        )
+            new_schedules.append(sched)
+            seen_flights.add(flight_iata)
+        if new_schedules:
+            try:
+                self.db.add_all(new_schedules)
+                await self.db.commit()
+                logger.info(f"Supplemented {len(new_schedules)} schedules: {origin}->{dest}")
+                cached = cached + new_schedules
+            except Exception as e:
+                logger.error(f"Failed to store supplemental schedules: {e}")
+                await self.db.rollback()
+        return cached
 
-        # Store new schedules
+    @staticmethod
+    def _build_schedules(origin: str, dest: str, raw: list[dict]) -> list[FlightSchedule]:
+        """Turn fetched provider entries into schedule rows, skipping unusable ones."""
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+        # One per flight; providers can repeat a flight
         schedules: list[FlightSchedule] = []
+        seen_flights: set[str] = set()
         for entry in raw:
             flight_iata = entry.get("flight_iata", "")
             airline_iata = entry.get("airline_iata", "")
@@ -587,8 +883,9 @@ class FlightService:
             # Extract HH:MM from full datetime or time string
             dep_hm = _extract_time(dep_time) or (dep_time[:5] if len(dep_time) >= 5 and _is_hhmm(dep_time[:5]) else None)
             arr_hm = _extract_time(arr_time) or (arr_time[:5] if len(arr_time) >= 5 and _is_hhmm(arr_time[:5]) else None)
-            if not dep_hm or not arr_hm:
+            if not dep_hm or not arr_hm or flight_iata in seen_flights:
                 continue
+            seen_flights.add(flight_iata)
             sched = FlightSchedule(
                 origin_code=origin,
                 dest_code=dest,
@@ -602,9 +899,23 @@ class FlightService:
                 fetched_at=now,
             )
             schedules.append(sched)
+        return schedules
 
-        # Bulk add and commit — if it fails, objects remain usable (never flushed)
+    async def _replace_schedules(
+        self, origin: str, dest: str, schedules: list[FlightSchedule],
+    ) -> None:
+        """Swap a route's cached rows for new ones in one transaction.
+
+        Delete and insert commit together; if the commit fails, the objects
+        remain usable (never flushed) and the old rows stay in place.
+        """
         try:
+            await self.db.execute(
+                delete(FlightSchedule).where(
+                    FlightSchedule.origin_code == origin,
+                    FlightSchedule.dest_code == dest,
+                )
+            )
             self.db.add_all(schedules)
             await self.db.commit()
             logger.info(f"Cached {len(schedules)} schedules: {origin}->{dest}")
@@ -612,22 +923,74 @@ class FlightService:
             logger.error(f"Failed to cache schedules: {e}")
             await self.db.rollback()
 
+    async def _store_schedules(
+        self, origin: str, dest: str, raw: list[dict],
+    ) -> list[FlightSchedule]:
+        """Replace the cached schedules for a route with freshly fetched entries.
+
+        The existing (stale) rows are kept when no fetched entry is usable.
+        """
+        schedules = self._build_schedules(origin, dest, raw)
+        if not schedules:
+            # Return stale cache if available
+            stale = await self._load_cached_schedules(origin, dest)
+            if stale:
+                logger.info(f"AirLabs+Aviationstack failed, using stale cache: {origin}->{dest}")
+            return stale
+        await self._replace_schedules(origin, dest, schedules)
         return schedules
 
+    async def refresh_schedules(
+        self, origin: str, dest: str, target_date: date | None = None,
+    ) -> int:
+        """Re-fetch a route's schedules from the providers and replace the cache.
+
+        Keeps the existing (stale) cache when the providers return nothing usable.
+        Returns the number of schedules stored.
+        """
+        raw = await _fetch_schedule_entries(origin, dest, target_date)
+        schedules = self._build_schedules(origin, dest, raw)
+        if not schedules:
+            logger.info(f"Schedule refresh returned nothing, keeping stale cache: {origin}->{dest}")
+            return 0
+        await self._replace_schedules(origin, dest, schedules)
+        return len(schedules)
+
+    async def _resolve_schedules(
+        self, origin: str, dest: str, version: _ScheduleVersion,
+        fetch_task: asyncio.Task | None, topup_task: asyncio.Task | None,
+    ) -> _ScheduleIndex:
+        """Turn one direction's cached rows and in-flight fetches into a schedule index."""
+        if fetch_task is not None:
+            record_cache_lookup("schedule", False)
+            raw = await _provider_result(fetch_task, [], f"Schedule fetch {origin}->{dest}")
+            schedules = await self._store_schedules(origin, dest, raw)
+            return _index_schedules(origin, dest, schedules)
+        record_cache_lookup("schedule", True)
+        if topup_task is None:
+            # Unchanged rows since the index was built: skip loading them at all
+            index = _schedule_indexes.get((origin, dest, version))
+            if index is not None:
+                return index
+        cached = await self._load_cached_schedules(origin, dest)
+        if topup_task is not None:
+            topup = await _provider_result(topup_task, [], f"Schedule top-up {origin}->{dest}")
+            cached = await self._supplement_schedules(origin, dest, cached, topup)
+        return _index_schedules(origin, dest, cached)
+
     @staticmethod
     def _match_schedule(
         offer_flight_number: str | None,
         offer_airline_code: str,
-        by_flight: dict[str, FlightSchedule],
-        by_airline: dict[str, FlightSchedule],
-    ) -> tuple[FlightSchedule | None, str | None]:
+        index: _ScheduleIndex,
+    ) -> tuple[_ScheduledFlight | None, str | None]:
         """Find the best matching schedule. Returns (schedule, resolved_flight_number)."""
-        sched: FlightSchedule | None = None
+        sched: _ScheduledFlight | None = None
         resolved_fn = offer_flight_number
         if offer_flight_number:
-            sched = by_flight.get(offer_flight_number)
+            sched = index.by_flight.get(offer_flight_number)
         if not sched and offer_airline_code:
-            sched = by_airline.get(offer_airline_code)
+            sched = index.by_airline.get(offer_airline_code)
             if sched and not offer_flight_number:
                 resolved_fn = sched.flight_iata
         return sched, resolved_fn
@@ -635,42 +998,24 @@ class FlightService:
     def _enrich_with_schedules(
         self,
         offers: list[FlightOffer],
-        outbound_schedules: list[FlightSchedule],
-        return_schedules: list[FlightSchedule],
+        outbound: _ScheduleIndex,
+        return_: _ScheduleIndex,
         departure_date: date,
         return_date: date | None,
     ) -> None:
-        """Enrich offers with departure/arrival times from cached schedules."""
-        # Build outbound lookup maps
-        ob_by_flight: dict[str, FlightSchedule] = {}
-        ob_by_airline: dict[str, FlightSchedule] = {}
-        for s in outbound_schedules:
-            ob_by_flight[s.flight_iata] = s
-            if s.airline_code and s.airline_code not in ob_by_airline:
-                ob_by_airline[s.airline_code] = s
-
-        # Build return lookup maps
-        rt_by_flight: dict[str, FlightSchedule] = {}
-        rt_by_airline: dict[str, FlightSchedule] = {}
-        for s in return_schedules:
-            rt_by_flight[s.flight_iata] = s
-            if s.airline_code and s.airline_code not in rt_by_airline:
-                rt_by_airline[s.airline_code] = s
-
+        """Enrich offers with departure/arrival times from cached schedule indexes."""
         dep_str = departure_date.isoformat()
         ret_str = return_date.isoformat() if return_date else None
 
         for offer in offers:
             # Outbound leg
             ob_matched = False
-            if outbound_schedules:
-                sched, fn = self._match_schedule(
-                    offer.flight_number, offer.airline_code, ob_by_flight, ob_by_airline,
-                )
+            if outbound:
+                sched, fn = self._match_schedule(offer.flight_number, offer.airline_code, outbound)
                 if sched:
                     ob_matched = True
                     offer.departure_time = f"{dep_str}T{sched.dep_time}:00"
-                    dur = _calc_duration_from_hhmm(sched.dep_time, sched.arr_time)
+                    dur = sched.duration_minutes
                     if not offer.duration_minutes and dur:
                         offer.duration_minutes = dur
                     # Use _calc_arrival for correct next-day arrival date
@@ -685,26 +1030,25 @@ class FlightService:
                     if time_part:
                         offer.departure_time = f"{dep_str}T{time_part}:00"
                 # Borrow duration from any outbound schedule on same route
-                if not offer.duration_minutes and outbound_schedules:
-                    any_sched = outbound_schedules[0]
-                    offer.duration_minutes = _calc_duration_from_hhmm(any_sched.dep_time, any_sched.arr_time)
+                if not offer.duration_minutes and outbound:
+                    offer.duration_minutes = outbound.route_duration_minutes
                 if not offer.arrival_time and offer.departure_time and offer.duration_minutes:
                     offer.arrival_time = _calc_arrival(offer.departure_time, offer.duration_minutes)
 
             # Return leg — exact flight-number match first, then airline-code fallback
             if ret_str:
-                rsched: FlightSchedule | None = None
-                if return_schedules:
+                rsched: _ScheduledFlight | None = None
+                if return_:
                     if offer.return_flight_number:
-                        rsched = rt_by_flight.get(offer.return_flight_number)
+                        rsched = return_.by_flight.get(offer.return_flight_number)
                     # Airline-code fallback (now reliable with Aviationstack future schedules)
                     if not rsched and offer.airline_code:
-                        rsched = rt_by_airline.get(offer.airline_code)
+                        rsched = return_.by_airline.get(offer.airline_code)
                         if rsched and not offer.return_flight_number:
                             offer.return_flight_number = rsched.flight_iata
                     if rsched:
                         offer.return_departure_time = f"{ret_str}T{rsched.dep_time}:00"
-                        rdur = _calc_duration_from_hhmm(rsched.dep_time, rsched.arr_time)
+                        rdur = rsched.duration_minutes
                         if not offer.return_duration_minutes and rdur:
                             offer.return_duration_minutes = rdur
                         offer.return_arrival_time = _calc_arrival(offer.return_departure_time, rdur or offer.return_duration_minutes)
@@ -725,55 +1069,33 @@ class FlightService:
                     if not offer.return_arrival_time and offer.return_departure_time and offer.return_duration_minutes:
                         offer.return_arrival_time = _calc_arrival(offer.return_departure_time, offer.return_duration_minutes)
 
-    async def _store_search_results(
-        self, route_id: int, offers: list[FlightOffer], cabin_class: str
-    ) -> None:
-        """Cache search results as price data for prediction pipeline."""
+    @staticmethod
+    def _queue_search_results(route_id: int, offers: list[FlightOffer], cabin_class: str) -> None:
+        """Hand search results to the write-behind queue as price data for the prediction pipeline."""
         now = datetime.now(timezone.utc).replace(tzinfo=None)
 
-        # Check which airline codes exist in DB
-        airline_codes = list({o.airline_code for o in offers if o.airline_code})
-        existing_airlines: set[str] = set()
-        if airline_codes:
-            result = await self.db.execute(
-                select(Airline.iata_code).where(Airline.iata_code.in_(airline_codes))
-            )
-            existing_airlines = {row[0] for row in result.all()}
-
-        # Deduplicate by PK (airline_code) before storing
+        # Deduplicate by PK (airline_code); unknown airlines are filtered at flush time
         seen_airlines: set[str] = set()
-        stored = 0
+        rows: list[dict] = []
         for offer in offers:
-            if not offer.airline_code or offer.airline_code not in existing_airlines:
-                continue
-            if offer.airline_code in seen_airlines:
+            if not offer.airline_code or offer.airline_code in seen_airlines:
                 continue
             seen_airlines.add(offer.airline_code)
-            try:
-                price = FlightPrice(
-                    time=now,
-                    route_id=route_id,
-                    airline_code=offer.airline_code,
-                    departure_date=offer.departure_date,
-                    cabin_class=cabin_class,
-                    return_date=offer.return_date,
-                    price_amount=offer.price_amount,
-                    currency=offer.currency,
-                    stops=offer.stops,
-                    duration_minutes=offer.duration_minutes,
-                    source=_SEARCH_SOURCE,
-                )
-                self.db.add(price)
-                stored += 1
-            except Exception as e:
-                logger.warning(f"Failed to store price: {e}")
-        if stored > 0:
-            try:
-                await self.db.commit()
-                logger.info(f"Stored {stored} price observations from search")
-            except Exception as e:
-                logger.error(f"Failed to commit search prices: {e}", exc_info=True)
-                await self.db.rollback()
+            rows.append({
+                "time": now,
+                "route_id": route_id,
+                "airline_code": offer.airline_code,
+                "departure_date": offer.departure_date,
+                "cabin_class": cabin_class,
+                "return_date": offer.return_date,
+                "price_amount": to_minor(offer.price_amount, offer.currency),
+                "currency": offer.currency,
+                "stops": offer.stops,
+                "duration_minutes": offer.duration_minutes,
+                "source": _SEARCH_SOURCE,
+                "raw_offer_id": None,
+            })
+        enqueue_prices(rows)
 
     async def _get_missing_airline_offers(
         self,
@@ -784,38 +1106,10 @@ class FlightService:
         live_airlines: set[str],
     ) -> list[FlightOffer]:
         """Fetch latest DB prices for airlines missing from live results."""
-        filters = [
-            FlightPrice.route_id == route_id,
-            FlightPrice.departure_date == departure_date,
-            FlightPrice.cabin_class == cabin_class,
-        ]
-        if live_airlines:
-            filters.append(FlightPrice.airline_code.notin_(list(live_airlines)))
-        subq = (
-            select(
-                FlightPrice.airline_code,
-                func.max(FlightPrice.time).label("latest_time"),
-            )
-            .where(*filters)
-            .group_by(FlightPrice.airline_code)
-            .subquery()
+        prices_list = await latest_price_per_airline(
+            self.db, departure_date, cabin_class,
+            route_id=route_id, exclude_airlines=live_airlines,
         )
-
-        result = await self.db.execute(
-            select(FlightPrice)
-            .where(
-                FlightPrice.route_id == route_id,
-                FlightPrice.departure_date == departure_date,
-                FlightPrice.cabin_class == cabin_class,
-            )
-            .join(
-                subq,
-                (FlightPrice.airline_code == subq.c.airline_code)
-                & (FlightPrice.time == subq.c.latest_time),
-            )
-        )
-
-        prices_list = result.scalars().all()
         supplements: list[FlightOffer] = []
         for price in prices_list:
             if price.airline_code in live_airlines:
@@ -823,11 +1117,11 @@ class FlightService:
             supplements.append(
                 FlightOffer(
                     airline_code=price.airline_code,
-                    airline_name=None,
+                    airline_name=price.airline_name,
                     departure_date=price.departure_date,
                     return_date=return_date,
                     cabin_class=price.cabin_class,
-                    price_amount=price.price_amount,
+                    price_amount=from_minor(price.price_amount, price.currency),
                     currency=price.currency,
                     stops=price.stops,
                     duration_minutes=price.duration_minutes,
@@ -852,141 +1146,256 @@ class FlightService:
         sort_by: str = "price",
         return_date: date | None = None,
     ) -> FlightSearchResponse:
-        # Ensure route exists for future data collection
-        route = await self._ensure_route(origin, dest)
-        route_id: int | None = None
-        if route:
-            route_id = route.id
-            try:
-                await self.db.commit()
-            except Exception:
-                await self.db.rollback()
-                # Re-query route after rollback (it likely already exists)
-                re = await self.db.execute(
-                    select(Route.id).where(Route.origin_code == origin, Route.dest_code == dest)
-                )
-                route_id = re.scalar_one_or_none()
+        # Repeat searches are served from a short-TTL cache, and concurrent identical
+        # misses share one upstream fan-out. max_stops and sort_by only shape the
+        # response, so they are applied per caller on top of the shared offer list.
+        key: _SearchKey = (origin, dest, departure_date, return_date, cabin_class)
+        outcome = _search_cache.get(key)
+        if outcome is None:
+            outcome = await _search_flight.do(key, lambda: _run_detached_search(key))
+        return self._build_search_response(
+            outcome, origin, dest, departure_date, cabin_class, max_stops, sort_by, return_date,
+        )
+
+    async def search_flexible(
+        self,
+        origin: str,
+        dest: str,
+        start_date: date,
+        end_date: date,
+        cabin_class: str,
+    ) -> FlexibleSearchResponse:
+        """Cheapest price per departure day in a date window.
 
-        # Search Travelpayouts API for live results
-        offers = await _tp_client.search_flights(
-            origin, dest, departure_date, cabin_class, return_date
+        Answered from one Travelpayouts calendar fetch per month touched by the
+        window plus recent stored prices, instead of a full search per day.
+        """
+        days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        months = sorted({d.replace(day=1) for d in days})
+        calendars = await asyncio.gather(
+            *(_tp_client.fetch_calendar_month(origin, dest, month) for month in months)
         )
+        live: dict[date, DailyMinPrice] = {}
+        for calendar in calendars:
+            live.update(calendar)
 
-        # Store search results as price data for predictions
-        if offers and route_id:
-            await self._store_search_results(route_id, offers, cabin_class)
-
-        # If Travelpayouts returned nothing, fall back to DB cache
-        data_source = "live"
-        if not offers:
-            offers = await self._search_from_db(origin, dest, departure_date, cabin_class)
-            if offers:
-                data_source = "cached"
-                # Override return_date to match user's request (cached data may have different return_date)
-                for o in offers:
-                    o.return_date = return_date
-                    if not return_date:
-                        o.return_flight_number = None
-                        o.return_departure_time = None
-                        o.return_arrival_time = None
-                        o.return_stops = None
-                        o.return_duration_minutes = None
-                logger.info(f"Search fallback to cache: {origin}->{dest} ({len(offers)} cached offers)")
+        stored = await self._daily_min_prices_from_db(origin, dest, start_date, end_date, cabin_class)
+
+        results: list[DailyMinPrice] = []
+        for day in days:
+            candidates = [p for p in (live.get(day), stored.get(day)) if p is not None]
+            if candidates:
+                results.append(min(candidates, key=lambda p: p.price_amount))
             else:
-                logger.info(f"No results for {origin}->{dest} on {departure_date} (API + cache empty)")
+                results.append(DailyMinPrice(departure_date=day))
 
-        # Filter out invalid prices and empty airline codes (OTA like Kiwi.com)
-        offers = [
-            o for o in offers
-            if o.price_amount > 0 and o.price_amount.is_finite() and o.airline_code
-        ]
+        priced = [p for p in results if p.price_amount is not None]
+        return FlexibleSearchResponse(
+            origin=origin,
+            destination=dest,
+            cabin_class=cabin_class,
+            start_date=start_date,
+            end_date=end_date,
+            days=results,
+            cheapest=min(priced, key=lambda p: p.price_amount) if priced else None,
+        )
 
-        # Supplement missing airlines from DB cache
-        if route_id and offers:
-            live_airlines = {o.airline_code for o in offers}
-            db_supplements = await self._get_missing_airline_offers(
-                route_id, departure_date, cabin_class, return_date, live_airlines,
+    async def _daily_min_prices_from_db(
+        self, origin: str, dest: str, start_date: date, end_date: date, cabin_class: str,
+    ) -> dict[date, DailyMinPrice]:
+        """Lowest recently observed price per departure day for a route."""
+        route = await find_route(self.db, origin, dest)
+        if route is None:
+            return {}
+
+        since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=_FLEXIBLE_DB_MAX_AGE_DAYS)
+        filters = (
+            FlightPrice.route_id == route.id,
+            FlightPrice.departure_date >= start_date,
+            FlightPrice.departure_date <= end_date,
+            FlightPrice.cabin_class == cabin_class,
+            FlightPrice.time >= since,
+        )
+        subq = (
+            select(
+                FlightPrice.departure_date,
+                func.min(FlightPrice.price_amount).label("min_price"),
             )
-            offers.extend(db_supplements)
-
-        # Enrich airline names from DB (first pass - before supplement)
-        codes_to_lookup = {o.airline_code for o in offers if not o.airline_name}
-        name_map: dict[str, str] = {}
-        if codes_to_lookup:
-            result = await self.db.execute(
-                select(Airline.iata_code, Airline.name).where(
-                    Airline.iata_code.in_(list(codes_to_lookup))
+            .where(*filters)
+            .group_by(FlightPrice.departure_date)
+            .subquery()
+        )
+        result = await self.db.execute(
+            select(FlightPrice)
+            .where(*filters)
+            .join(
+                subq,
+                (FlightPrice.departure_date == subq.c.departure_date)
+                & (FlightPrice.price_amount == subq.c.min_price),
+            )
+        )
+        days: dict[date, DailyMinPrice] = {}
+        for price in result.scalars().all():
+            # Ties across airlines/observations: keep the first
+            days.setdefault(price.departure_date, DailyMinPrice(
+                departure_date=price.departure_date,
+                price_amount=from_minor(price.price_amount, price.currency),
+                currency=price.currency,
+                airline_code=price.airline_code,
+                stops=price.stops,
+                data_source="cached",
+            ))
+        return days
+
+    async def _collect_offers(
+        self,
+        origin: str,
+        dest: str,
+        departure_date: date,
+        cabin_class: str,
+        return_date: date | None,
+    ) -> _SearchOutcome:
+        """Fetch, store, enrich and deduplicate offers (before stop filter and sort)."""
+        # Ensure route exists for future data collection
+        route = await self._ensure_route(origin, dest)
+        route_id = route.id if route else None
+
+        # Which directions already have cached schedules decides what to fetch.
+        # Stale schedules are served as-is and refreshed off the request path.
+        ob_cached_airlines, ob_fresh, ob_version = await self._schedule_cache_state(origin, dest)
+        rt_cached_airlines, rt_fresh, rt_version = (
+            await self._schedule_cache_state(dest, origin) if return_date else (set(), True, (0, None))
+        )
+        if ob_cached_airlines and not ob_fresh:
+            _refresh_schedules_in_background(origin, dest, departure_date)
+        if rt_cached_airlines and not rt_fresh:
+            _refresh_schedules_in_background(dest, origin, return_date)
+
+        # Independent upstream fetches run concurrently; per-provider rate limiters
+        # pace them. Tasks never touch self.db (AsyncSession is not concurrency-safe),
+        # so all DB reads and writes stay on this coroutine. A failed fetch only
+        # loses its own provider's data.
+        tasks: list[asyncio.Task] = []
+
+        def _start(coro) -> asyncio.Task:
+            task = asyncio.create_task(coro)
+            tasks.append(task)
+            return task
+
+        tp_task = _start(_tp_client.search_flights(origin, dest, departure_date, cabin_class, return_date))
+        reverse_task = (
+            _start(_tp_client.fetch_return_flight_info(origin, dest, return_date)) if return_date else None
+        )
+        ob_fetch_task = (
+            None if ob_cached_airlines
+            else _start(_fetch_schedule_entries(origin, dest, departure_date))
+        )
+        rt_fetch_task = (
+            _start(_fetch_schedule_entries(dest, origin, return_date))
+            if return_date and not rt_cached_airlines else None
+        )
+        try:
+            # Search Travelpayouts API for live results
+            offers = await _provider_result(tp_task, [], "Travelpayouts search")
+
+            # Store search results as price data for predictions (written in the background)
+            if offers and route_id:
+                self._queue_search_results(route_id, offers, cabin_class)
+
+            # If Travelpayouts returned nothing, fall back to DB cache
+            data_source = "live"
+            if not offers:
+                offers = await self._search_from_db(origin, dest, departure_date, cabin_class)
+                if offers:
+                    data_source = "cached"
+                    # Override return_date to match user's request (cached data may have different return_date)
+                    for o in offers:
+                        o.return_date = return_date
+                        if not return_date:
+                            o.return_flight_number = None
+                            o.return_departure_time = None
+                            o.return_arrival_time = None
+                            o.return_stops = None
+                            o.return_duration_minutes = None
+                    logger.info(f"Search fallback to cache: {origin}->{dest} ({len(offers)} cached offers)")
+                else:
+                    logger.info(f"No results for {origin}->{dest} on {departure_date} (API + cache empty)")
+
+            # Filter out invalid prices and empty airline codes (OTA like Kiwi.com)
+            offers = [
+                o for o in offers
+                if o.price_amount > 0 and o.price_amount.is_finite() and o.airline_code
+            ]
+
+            # Supplement missing airlines from DB cache
+            if route_id and offers:
+                live_airlines = {o.airline_code for o in offers}
+                db_supplements = await self._get_missing_airline_offers(
+                    route_id, departure_date, cabin_class, return_date, live_airlines,
                 )
+                offers.extend(db_supplements)
+
+            # Enrich airline names from the reference-data snapshot
+            if any(not o.airline_name for o in offers):
+                ref = await get_reference_data(self.db)
+                for o in offers:
+                    if not o.airline_name:
+                        o.airline_name = ref.airline_name(o.airline_code)
+
+            # Fresh cached directions missing some offer airlines get an Aviationstack
+            # top-up; the only schedule fetch that has to wait for the price results.
+            # (Stale directions are fully re-fetched by their background refresh.)
+            offer_airlines = {o.airline_code for o in offers if o.airline_code}
+            ob_topup_task = (
+                _start(_aviationstack_client.fetch_schedules(origin, dest, departure_date))
+                if ob_cached_airlines and ob_fresh and not offer_airlines.issubset(ob_cached_airlines)
+                else None
+            )
+            rt_topup_task = (
+                _start(_aviationstack_client.fetch_schedules(dest, origin, return_date))
+                if rt_cached_airlines and rt_fresh and not offer_airlines.issubset(rt_cached_airlines)
+                else None
             )
-            name_map = {row.iata_code: row.name for row in result.all()}
-            for o in offers:
-                if not o.airline_name and o.airline_code in name_map:
-                    o.airline_name = name_map[o.airline_code]
 
-        # Step 1: Pre-fill return flight numbers from Travelpayouts reverse route
-        # This must run BEFORE AirLabs enrichment so exact flight-number matching works
-        reverse_info: dict[str, dict] = {}
-        if return_date:
-            reverse_info = await _tp_client.fetch_return_flight_info(origin, dest, return_date)
+            # Step 1: Pre-fill return flight numbers from Travelpayouts reverse route
+            # This must run BEFORE AirLabs enrichment so exact flight-number matching works
+            reverse_info: dict[str, dict] = (
+                await _provider_result(reverse_task, {}, "Travelpayouts return info")
+                if reverse_task else {}
+            )
             for o in offers:
                 if not o.return_flight_number and o.airline_code:
                     info = reverse_info.get(o.airline_code)
                     if info and info["flight_number"]:
                         o.return_flight_number = info["flight_number"]
 
-        # Step 2: Enrich with schedule data (AirLabs + Aviationstack fallback)
-        # Pre-fetch Aviationstack for directions missing from cache to avoid 429 rate limits
-        now_check = datetime.now(timezone.utc).replace(tzinfo=None)
-        cutoff_check = now_check - timedelta(hours=_SCHEDULE_CACHE_HOURS)
-        offer_airlines = {o.airline_code for o in offers if o.airline_code}
-
-        async def _check_cache_coverage(orig: str, dst: str) -> bool:
-            """Check if DB cache covers all offer airlines."""
-            result = await self.db.execute(
-                select(FlightSchedule.airline_code).where(
-                    FlightSchedule.origin_code == orig,
-                    FlightSchedule.dest_code == dst,
-                    FlightSchedule.fetched_at >= cutoff_check,
-                )
+            # Step 2: Enrich with schedule data (AirLabs + Aviationstack fallback)
+            outbound_index = await self._resolve_schedules(
+                origin, dest, ob_version, ob_fetch_task, ob_topup_task,
             )
-            cached_airlines = {row[0] for row in result.all()}
-            return offer_airlines.issubset(cached_airlines) if cached_airlines else False
-
-        ob_covered = await _check_cache_coverage(origin, dest)
-        rt_covered = await _check_cache_coverage(dest, origin) if return_date else True
-
-        # Only call Aviationstack when cache is incomplete
-        avstack_outbound: list[dict] | None = None
-        avstack_return: list[dict] | None = None
-        if not ob_covered:
-            avstack_outbound = await _aviationstack_client.fetch_schedules(origin, dest, departure_date)
-        if return_date and not rt_covered:
-            if avstack_outbound is not None:
-                await asyncio.sleep(_AVIATIONSTACK_RETRY_DELAY)
-            avstack_return = await _aviationstack_client.fetch_schedules(dest, origin, return_date)
-
-        outbound_schedules = await self._get_schedules(
-            origin, dest, departure_date, avstack_prefetch=avstack_outbound,
-        )
-        return_schedules: list[FlightSchedule] = []
-        if return_date:
-            return_schedules = await self._get_schedules(
-                dest, origin, return_date, avstack_prefetch=avstack_return,
-            )
-        self._enrich_with_schedules(offers, outbound_schedules, return_schedules, departure_date, return_date)
+            return_index = _EMPTY_SCHEDULE_INDEX
+            if return_date:
+                return_index = await self._resolve_schedules(
+                    dest, origin, rt_version, rt_fetch_task, rt_topup_task,
+                )
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        self._enrich_with_schedules(offers, outbound_index, return_index, departure_date, return_date)
 
         # Step 3: For offers that didn't get exact AirLabs return match,
         # override with reverse-route Travelpayouts times
         if return_date and reverse_info:
             ret_str = return_date.isoformat()
-            rt_flight_set = {s.flight_iata for s in return_schedules}
 
             for o in offers:
                 if not o.airline_code:
                     continue
 
                 # Skip offers that got an exact AirLabs flight match
-                if o.return_flight_number and o.return_flight_number in rt_flight_set:
+                if o.return_flight_number and o.return_flight_number in return_index.by_flight:
                     continue
 
                 info = reverse_info.get(o.airline_code)
@@ -1023,7 +1432,7 @@ class FlightService:
                 if o.return_flight_number or not o.flight_number:
                     continue
                 # Try return schedules airline-code match (might have been added by supplement)
-                rsched = next((s for s in return_schedules if s.airline_code == o.airline_code), None)
+                rsched = return_index.by_airline.get(o.airline_code)
                 if rsched:
                     o.return_flight_number = rsched.flight_iata
                     continue
@@ -1041,10 +1450,25 @@ class FlightService:
 
         # Deduplicate: keep cheapest per (airline, stops, duration bucket)
         offers = self._deduplicate_offers(offers)
+        return _SearchOutcome(offers=offers, route_id=route_id, data_source=data_source)
 
+    @staticmethod
+    def _build_search_response(
+        outcome: _SearchOutcome,
+        origin: str,
+        dest: str,
+        departure_date: date,
+        cabin_class: str,
+        max_stops: int | None,
+        sort_by: str,
+        return_date: date | None,
+    ) -> FlightSearchResponse:
+        """Apply stop filter and sort to a (possibly shared) outcome without mutating it."""
         # Filter by stops
         if max_stops is not None:
-            offers = [o for o in offers if o.stops <= max_stops]
+            offers = [o for o in outcome.offers if o.stops <= max_stops]
+        else:
+            offers = list(outcome.offers)
 
         # Collect available airlines after stop filtering
         airline_set: dict[str, str] = {}
@@ -1076,8 +1500,8 @@ class FlightService:
             offers=offers,
             total_count=len(offers),
             available_airlines=available_airlines,
-            route_id=route_id,
-            data_source=data_source,
+            route_id=outcome.route_id,
+            data_source=outcome.data_source,
         )
 
     @staticmethod
@@ -1099,64 +1523,20 @@ class FlightService:
     async def _search_from_db(
         self, origin: str, dest: str, departure_date: date, cabin_class: str
     ) -> list[FlightOffer]:
-        route_result = await self.db.execute(
-            select(Route).where(Route.origin_code == origin, Route.dest_code == dest)
+        prices_list = await latest_price_per_airline(
+            self.db, departure_date, cabin_class, origin=origin, dest=dest,
         )
-        route = route_result.scalar_one_or_none()
-        if not route:
-            return []
-
-        subq = (
-            select(
-                FlightPrice.airline_code,
-                func.max(FlightPrice.time).label("latest_time"),
-            )
-            .where(
-                FlightPrice.route_id == route.id,
-                FlightPrice.departure_date == departure_date,
-                FlightPrice.cabin_class == cabin_class,
-            )
-            .group_by(FlightPrice.airline_code)
-            .subquery()
-        )
-
-        result = await self.db.execute(
-            select(FlightPrice)
-            .where(
-                FlightPrice.route_id == route.id,
-                FlightPrice.departure_date == departure_date,
-                FlightPrice.cabin_class == cabin_class,
-            )
-            .join(
-                subq,
-                (FlightPrice.airline_code == subq.c.airline_code)
-                & (FlightPrice.time == subq.c.latest_time),
-            )
-        )
-
-        prices_list = result.scalars().all()
-        if not prices_list:
-            return []
-
-        # Batch lookup airline names (avoid N+1)
-        airline_codes = list({p.airline_code for p in prices_list if p.airline_code})
-        airline_names: dict[str, str] = {}
-        if airline_codes:
-            airline_result = await self.db.execute(
-                select(Airline.iata_code, Airline.name).where(Airline.iata_code.in_(airline_codes))
-            )
-            airline_names = {row.iata_code: row.name for row in airline_result.all()}
 
         offers = []
         for price in prices_list:
             offers.append(
                 FlightOffer(
                     airline_code=price.airline_code,
-                    airline_name=airline_names.get(price.airline_code),
+                    airline_name=price.airline_name,
                     departure_date=price.departure_date,
                     return_date=price.return_date,
                     cabin_class=price.cabin_class,
-                    price_amount=price.price_amount,
+                    price_amount=from_minor(price.price_amount, price.currency),
                     currency=price.currency,
                     stops=price.stops,
                     duration_minutes=price.duration_minutes,
@@ -1189,7 +1569,7 @@ class FlightService:
         prices = [
             PricePoint(
                 time=row.time,
-                price_amount=row.price_amount,
+                price_amount=from_minor(row.price_amount, row.currency),
                 airline_code=row.airline_code,
                 source=row.source,
             )
@@ -1,21 +1,19 @@
 import calendar
 from datetime import date, datetime, timedelta, timezone
-from decimal import Decimal
 
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.money import from_minor
+from app.db.queries import recent_min_price_by_departure_query
 from app.models.prediction import Prediction
-from app.models.route import Route
-from app.models.flight_price import FlightPrice
 from app.schemas.prediction import (
     ForecastPoint,
     HeatmapCell,
     HeatmapResponse,
     PredictionResponse,
 )
-
-_ZERO = Decimal("0")
+from app.services.reference_data import find_route
 
 
 def _classify_price_level(value: float, min_p: float, max_p: float) -> str:
@@ -58,18 +56,18 @@ class PredictionService:
             if row.departure_date in seen:
                 continue
             seen.add(row.departure_date)
-            price = max(row.predicted_price, _ZERO)
-            low = max(row.confidence_low, _ZERO) if row.confidence_low is not None else price
-            high = max(row.confidence_high, _ZERO) if row.confidence_high is not None else price
+            price = max(row.predicted_price, 0)
+            low = max(row.confidence_low, 0) if row.confidence_low is not None else price
+            high = max(row.confidence_high, 0) if row.confidence_high is not None else price
             # Ensure low <= price <= high
             low = min(low, price)
             high = max(high, price)
             points.append(
                 ForecastPoint(
                     date=row.departure_date,
-                    predicted_price=price,
-                    confidence_low=low,
-                    confidence_high=high,
+                    predicted_price=from_minor(price),
+                    confidence_low=from_minor(low),
+                    confidence_high=from_minor(high),
                 )
             )
         return points
@@ -112,9 +110,9 @@ class PredictionService:
             route_id=pred.route_id,
             departure_date=pred.departure_date,
             cabin_class=pred.cabin_class,
-            predicted_price=pred.predicted_price,
-            confidence_low=pred.confidence_low,
-            confidence_high=pred.confidence_high,
+            predicted_price=from_minor(pred.predicted_price),
+            confidence_low=from_minor(pred.confidence_low) if pred.confidence_low is not None else None,
+            confidence_high=from_minor(pred.confidence_high) if pred.confidence_high is not None else None,
             price_direction=pred.price_direction or "STABLE",
             confidence_score=pred.confidence_score,
             model_version=pred.model_version,
@@ -131,10 +129,7 @@ class PredictionService:
         categorized by how far in advance the booking is.
         """
         # Find route
-        route_result = await self.db.execute(
-            select(Route).where(Route.origin_code == origin, Route.dest_code == dest)
-        )
-        route = route_result.scalar_one_or_none()
+        route = await find_route(self.db, origin, dest)
 
         if not route:
             return HeatmapResponse(origin=origin, destination=dest, month=month, cells=[])
@@ -179,38 +174,26 @@ class PredictionService:
                 predictions.append(p)
         if predictions:
             # Get min/max for price level categorization
-            prices_dec = [max(p.predicted_price, _ZERO) for p in predictions]
-            min_p, max_p = float(min(prices_dec)), float(max(prices_dec))
+            prices = [max(p.predicted_price, 0) for p in predictions]
+            min_p, max_p = float(min(prices)), float(max(prices))
 
             for pred in predictions:
                 weeks = max(0, (pred.departure_date - today).days // 7)
-                price_val = max(pred.predicted_price, _ZERO)
+                price_val = max(pred.predicted_price, 0)
                 level = _classify_price_level(float(price_val), min_p, max_p)
 
                 cells.append(HeatmapCell(
                     departure_date=pred.departure_date,
                     weeks_before=weeks,
-                    predicted_price=price_val,
+                    predicted_price=from_minor(price_val),
                     price_level=level,
                 ))
         else:
             # Fallback: use recent price data to generate heatmap (last 7 days only)
             recent_cutoff = now - timedelta(days=7)
-            price_result = await self.db.execute(
-                select(
-                    FlightPrice.departure_date,
-                    func.min(FlightPrice.price_amount).label("min_price"),
-                )
-                .where(
-                    FlightPrice.route_id == route.id,
-                    FlightPrice.departure_date >= month_start,
-                    FlightPrice.departure_date <= month_end,
-                    FlightPrice.cabin_class == cabin_class,
-                    FlightPrice.time >= recent_cutoff,
-                )
-                .group_by(FlightPrice.departure_date)
-                .order_by(FlightPrice.departure_date)
-            )
+            price_result = await self.db.execute(recent_min_price_by_departure_query(
+                route.id, cabin_class, month_start, month_end, recent_cutoff,
+            ))
             price_rows = price_result.all()
 
             if price_rows:
@@ -219,13 +202,12 @@ class PredictionService:
 
                 for row in price_rows:
                     weeks = max(0, (row.departure_date - today).days // 7)
-                    price_val = float(row.min_price)
-                    level = _classify_price_level(price_val, min_p, max_p)
+                    level = _classify_price_level(float(row.min_price), min_p, max_p)
 
                     cells.append(HeatmapCell(
                         departure_date=row.departure_date,
                         weeks_before=weeks,
-                        predicted_price=Decimal(str(round(price_val))),
+                        predicted_price=from_minor(row.min_price),
                         price_level=level,
                     ))
 
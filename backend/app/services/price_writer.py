@@ -0,0 +1,131 @@
+"""Write-behind persistence for prices observed by live searches.
+
+Searches only append rows to an in-memory buffer. A background task started
+in the app lifespan drains it every SEARCH_WRITE_FLUSH_SECONDS on its own
+session and connection (the background writer pool), so many concurrent
+searches share one bulk INSERT transaction, no search waits on a SQLite
+write, and a flush never commits or rolls back a request's transaction. Rows still buffered when the process dies
+are lost; they are a by-product of searching, not the primary price feed.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Any
+
+from sqlalchemy import insert
+
+from app.config import settings
+from app.core.metrics import WRITE_BEHIND_PENDING, WRITE_BEHIND_ROWS
+from app.db.session import background_session_factory
+from app.models.flight_price import FlightPrice
+from app.services.reference_data import get_reference_data
+from app.services.route_service import RouteService
+
+logger = logging.getLogger(__name__)
+
+_PK_FIELDS = ("time", "route_id", "airline_code", "departure_date", "cabin_class")
+
+_pending: deque[dict[str, Any]] = deque()
+_lock = threading.Lock()
+_flusher: asyncio.Task | None = None
+_stopping: asyncio.Event | None = None
+
+
+def enqueue_prices(rows: list[dict[str, Any]]) -> None:
+    """Buffer FlightPrice rows for the next flush; never blocks or touches the DB."""
+    if not rows:
+        return
+    with _lock:
+        _pending.extend(rows)
+        overflow = len(_pending) - settings.SEARCH_WRITE_QUEUE_MAX
+        for _ in range(max(overflow, 0)):
+            _pending.popleft()
+        pending = len(_pending)
+    if overflow > 0:
+        WRITE_BEHIND_ROWS.inc(overflow, result="dropped")
+        logger.warning(f"Write-behind queue full; dropped {overflow} oldest search prices")
+    WRITE_BEHIND_PENDING.set(pending)
+
+
+async def _write_batch(batch: list[dict[str, Any]]) -> int:
+    async with background_session_factory() as session:
+        # Unknown airlines would violate the FK
+        valid_airlines = (await get_reference_data(session)).airlines
+
+        rows: dict[tuple, dict[str, Any]] = {}
+        for row in batch:
+            if row["airline_code"] in valid_airlines:
+                rows.setdefault(tuple(row[f] for f in _PK_FIELDS), row)
+        skipped = len(batch) - len(rows)
+        if skipped:
+            WRITE_BEHIND_ROWS.inc(skipped, result="skipped")
+        if not rows:
+            return 0
+
+        try:
+            await session.execute(insert(FlightPrice), list(rows.values()))
+            await RouteService(session).refresh_min_prices({row["route_id"] for row in rows.values()})
+            await session.commit()
+        except Exception as e:
+            logger.error(f"Failed to write {len(rows)} search prices: {e}", exc_info=True)
+            await session.rollback()
+            WRITE_BEHIND_ROWS.inc(len(rows), result="failed")
+            return 0
+
+    WRITE_BEHIND_ROWS.inc(len(rows), result="written")
+    return len(rows)
+
+
+async def flush_prices() -> int:
+    """Write everything buffered so far in batches of SEARCH_WRITE_BATCH_SIZE."""
+    written = 0
+    while True:
+        with _lock:
+            size = min(len(_pending), settings.SEARCH_WRITE_BATCH_SIZE)
+            batch = [_pending.popleft() for _ in range(size)]
+            pending = len(_pending)
+        WRITE_BEHIND_PENDING.set(pending)
+        if not batch:
+            break
+        written += await _write_batch(batch)
+    if written:
+        logger.info(f"Stored {written} price observations from searches")
+    return written
+
+
+async def _run_flusher(stopping: asyncio.Event) -> None:
+    while not stopping.is_set():
+        try:
+            await asyncio.wait_for(stopping.wait(), timeout=settings.SEARCH_WRITE_FLUSH_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        try:
+            await flush_prices()
+        except Exception as e:
+            logger.error(f"Write-behind flush failed: {e}", exc_info=True)
+
+
+async def start_price_writer() -> None:
+    """Start the periodic flusher on the running (API) event loop."""
+    global _flusher, _stopping
+    if _flusher is not None and not _flusher.done():
+        return
+    _stopping = asyncio.Event()
+    _flusher = asyncio.create_task(_run_flusher(_stopping))
+
+
+async def stop_price_writer() -> None:
+    """Stop the flusher after a final flush of whatever is still buffered."""
+    global _flusher, _stopping
+    if _flusher is None:
+        return
+    if _stopping is not None:
+        _stopping.set()
+    try:
+        await _flusher
+    except Exception as e:
+        logger.error(f"Write-behind flusher ended with error: {e}", exc_info=True)
+    _flusher = None
+    _stopping = None
@@ -5,14 +5,13 @@ from decimal import Decimal
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.airline import Airline
+from app.core.money import from_minor
 from app.models.prediction import Prediction
-from app.models.route import Route
 from app.schemas.recommendation import RecommendationResponse
+from app.services.reference_data import find_route, get_reference_data
 
 logger = logging.getLogger(__name__)
 
-_ZERO = Decimal("0")
 _PREDICTION_WINDOW_DAYS = 14
 _CONFIDENCE_THRESHOLD = Decimal("0.6")
 
@@ -24,10 +23,7 @@ class RecommendationService:
     async def get_recommendation(
         self, origin: str, dest: str, departure_date: date, cabin_class: str
     ) -> RecommendationResponse:
-        route_result = await self.db.execute(
-            select(Route).where(Route.origin_code == origin, Route.dest_code == dest)
-        )
-        route = route_result.scalar_one_or_none()
+        route = await find_route(self.db, origin, dest)
 
         if not route:
             return RecommendationResponse(
@@ -73,17 +69,8 @@ class RecommendationService:
         )
 
         # Resolve airline code to human-readable name
-        best_airline_name: str | None = pred.airline_code
-        if pred.airline_code:
-            try:
-                airline_result = await self.db.execute(
-                    select(Airline.name).where(Airline.iata_code == pred.airline_code)
-                )
-                airline_row = airline_result.scalar_one_or_none()
-                if airline_row:
-                    best_airline_name = airline_row
-            except Exception:
-                logger.debug("Airline name lookup failed for %s, using code as-is", pred.airline_code)
+        ref = await get_reference_data(self.db)
+        best_airline_name = ref.airline_name(pred.airline_code) or pred.airline_code
 
         return RecommendationResponse(
             origin=origin,
@@ -92,9 +79,9 @@ class RecommendationService:
             cabin_class=cabin_class,
             signal=signal,
             best_airline=best_airline_name,
-            current_price=max(pred.predicted_price, _ZERO) if pred.predicted_price else None,
-            predicted_low=max(predicted_low_price, _ZERO) if predicted_low_price else (
-                max(pred.confidence_low, _ZERO) if pred.confidence_low else None
+            current_price=from_minor(max(pred.predicted_price, 0)) if pred.predicted_price else None,
+            predicted_low=from_minor(max(predicted_low_price, 0)) if predicted_low_price else (
+                from_minor(max(pred.confidence_low, 0)) if pred.confidence_low else None
             ),
             predicted_low_date=predicted_low_date,
             confidence=pred.confidence_score,
@@ -103,8 +90,8 @@ class RecommendationService:
 
     async def _find_lowest_price_date_and_price(
         self, route_id: int, cabin_class: str, departure_date: date
-    ) -> tuple[date | None, Decimal | None]:
-        """Find the lowest predicted price date within ±14 days of the requested departure."""
+    ) -> tuple[date | None, int | None]:
+        """Find the lowest predicted price (minor units) and its date within ±14 days of the departure."""
         now = datetime.now(timezone.utc).replace(tzinfo=None)
         today = now.date()
 
@@ -147,7 +134,7 @@ class RecommendationService:
         direction_kr = {"UP": "상승", "DOWN": "하락", "STABLE": "안정"}
         direction = direction_kr.get(pred.price_direction, pred.price_direction)
         try:
-            confidence_pct = min(int((pred.confidence_score or _ZERO) * 100), 100)
+            confidence_pct = min(int((pred.confidence_score or 0) * 100), 100)
         except (OverflowError, ValueError):
             confidence_pct = 0
 
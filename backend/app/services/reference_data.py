@@ -0,0 +1,127 @@
+"""Process-wide snapshot of slow-changing reference data.
+
+Airlines, airports and routes change only when a route is auto-created or the
+seed script runs, yet almost every search, collection and recommendation
+looked them up. The snapshot is loaded once (at API startup, or lazily by the
+first caller in the pipeline) and shared by everything in the process.
+
+Writers call ``invalidate_reference_data()`` after adding rows; the next
+reader reloads. Writes made by another process (the external pipeline worker,
+the seed script) are picked up after REFERENCE_DATA_TTL_SECONDS, and a route
+missing from the snapshot is always re-checked against the database, so a
+stale snapshot never hides a route.
+"""
+
+import logging
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.models.airline import Airline
+from app.models.airport import Airport
+from app.models.route import Route
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class RouteRef:
+    id: int
+    origin_code: str
+    dest_code: str
+    is_active: bool
+
+
+@dataclass(frozen=True, slots=True)
+class AirportRef:
+    iata_code: str
+    name: str
+    city: str
+    city_ko: str | None
+    country_code: str
+
+    @property
+    def display_city(self) -> str:
+        return self.city_ko or self.city
+
+
+@dataclass(frozen=True)
+class ReferenceData:
+    airlines: Mapping[str, str]  # iata_code -> name
+    airports: Mapping[str, AirportRef]
+    routes: Mapping[tuple[str, str], RouteRef]  # (origin, dest) -> route
+
+    def airline_name(self, code: str | None) -> str | None:
+        return self.airlines.get(code) if code else None
+
+
+_SNAPSHOT_KEY = "snapshot"
+
+_snapshot: TTLCache[str, ReferenceData] = TTLCache(
+    "reference_data", maxsize=1, ttl_seconds=settings.REFERENCE_DATA_TTL_SECONDS,
+)
+# Bumped on every invalidation so a load that overlapped a write is not cached
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+async def _load(db: AsyncSession) -> ReferenceData:
+    airline_rows = (await db.execute(select(Airline.iata_code, Airline.name))).all()
+    airport_rows = (await db.execute(
+        select(Airport.iata_code, Airport.name, Airport.city, Airport.city_ko, Airport.country_code)
+    )).all()
+    route_rows = (await db.execute(
+        select(Route.id, Route.origin_code, Route.dest_code, Route.is_active)
+    )).all()
+    return ReferenceData(
+        airlines=MappingProxyType({row.iata_code: row.name for row in airline_rows}),
+        airports=MappingProxyType({row.iata_code: AirportRef(*row) for row in airport_rows}),
+        routes=MappingProxyType({(row.origin_code, row.dest_code): RouteRef(*row) for row in route_rows}),
+    )
+
+
+async def get_reference_data(db: AsyncSession) -> ReferenceData:
+    """Current snapshot, loading it through ``db`` when missing or expired."""
+    data = _snapshot.get(_SNAPSHOT_KEY)
+    if data is not None:
+        return data
+    with _generation_lock:
+        generation = _generation
+    data = await _load(db)
+    with _generation_lock:
+        if generation == _generation:
+            _snapshot.set(_SNAPSHOT_KEY, data)
+    logger.debug(
+        f"Loaded reference data: {len(data.airlines)} airlines, "
+        f"{len(data.airports)} airports, {len(data.routes)} routes"
+    )
+    return data
+
+
+def invalidate_reference_data() -> None:
+    """Drop the snapshot after airlines, airports or routes were written."""
+    global _generation
+    with _generation_lock:
+        _generation += 1
+        _snapshot.clear()
+
+
+async def find_route(db: AsyncSession, origin: str, dest: str) -> RouteRef | None:
+    """Route for (origin, dest), falling back to the database on a snapshot miss."""
+    data = await get_reference_data(db)
+    route = data.routes.get((origin, dest))
+    if route is not None:
+        return route
+    result = await db.execute(select(Route).where(Route.origin_code == origin, Route.dest_code == dest))
+    row = result.scalar_one_or_none()
+    if row is None:
+        return None
+    # Created elsewhere since the snapshot was taken
+    invalidate_reference_data()
+    return RouteRef(row.id, row.origin_code, row.dest_code, row.is_active)
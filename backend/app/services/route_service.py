@@ -1,14 +1,17 @@
+from collections.abc import Iterable
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
-from sqlalchemy import select, or_, case, literal, func
+from sqlalchemy import select, or_, and_, case, literal, func, delete
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import aliased
 
+from app.core.money import DEFAULT_CURRENCY, from_minor
 from app.models.airport import Airport
 from app.models.flight_price import FlightPrice
 from app.models.route import Route
-from app.schemas.route import RouteResponse, AirportSearchResponse
+from app.models.route_min_price import RouteMinPrice
+from app.schemas.route import RouteResponse, AirportSearchResponse, AnywhereDestinationResponse
+from app.services.reference_data import get_reference_data
 
 _RECENT_PRICE_DAYS = 7
 
@@ -36,28 +39,17 @@ class RouteService:
         self.db = db
 
     async def get_popular_routes(self, limit: int) -> list[RouteResponse]:
-        OriginAirport = aliased(Airport)
-        DestAirport = aliased(Airport)
-
         result = await self.db.execute(
-            select(
-                Route,
-                OriginAirport.city_ko.label("origin_city_ko"),
-                OriginAirport.city.label("origin_city_en"),
-                DestAirport.city_ko.label("dest_city_ko"),
-                DestAirport.city.label("dest_city_en"),
-            )
-            .outerjoin(OriginAirport, Route.origin_code == OriginAirport.iata_code)
-            .outerjoin(DestAirport, Route.dest_code == DestAirport.iata_code)
+            select(Route)
             .where(Route.is_active.is_(True))
             .order_by(Route.id)
             .limit(limit)
         )
-        rows = result.all()
-        if not rows:
+        routes = result.scalars().all()
+        if not routes:
             return []
 
-        route_ids = [row[0].id for row in rows]
+        route_ids = [route.id for route in routes]
 
         # Batch fetch min prices for all routes (recent 7 days)
         now = datetime.now(timezone.utc).replace(tzinfo=None)
@@ -74,26 +66,144 @@ class RouteService:
             )
             .group_by(FlightPrice.route_id)
         )
+        # RouteResponse has no currency field; route prices are collected in DEFAULT_CURRENCY
         price_map: dict[int, Decimal] = {}
         for pr in price_result.all():
-            price_map[pr.route_id] = pr.min_price
+            price_map[pr.route_id] = from_minor(pr.min_price)
 
+        airports = (await get_reference_data(self.db)).airports
         responses = []
-        for row in rows:
-            route = row[0]
-            origin_city = row.origin_city_ko or row.origin_city_en
-            dest_city = row.dest_city_ko or row.dest_city_en
+        for route in routes:
+            origin_airport = airports.get(route.origin_code)
+            dest_airport = airports.get(route.dest_code)
             responses.append(RouteResponse(
                 id=route.id,
                 origin_code=route.origin_code,
                 dest_code=route.dest_code,
-                origin_city=origin_city,
-                dest_city=dest_city,
+                origin_city=origin_airport.display_city if origin_airport else None,
+                dest_city=dest_airport.display_city if dest_airport else None,
                 is_active=route.is_active,
                 min_price=price_map.get(route.id),
             ))
         return responses
 
+    async def get_anywhere(
+        self, origin: str, month: str, cabin_class: str, limit: int,
+        currency: str = DEFAULT_CURRENCY,
+    ) -> list[AnywhereDestinationResponse]:
+        """Cheapest destinations from an origin for a departure month.
+
+        Minor-unit amounts only rank within one currency, so destinations are
+        limited to fares quoted in ``currency``. Reads the precomputed
+        route_min_prices index only, so the cost is one range scan over
+        idx_rmp_origin_month_currency_price regardless of route count.
+        """
+        result = await self.db.execute(
+            select(RouteMinPrice)
+            .where(
+                RouteMinPrice.origin_code == origin,
+                RouteMinPrice.departure_month == month,
+                RouteMinPrice.cabin_class == cabin_class,
+                RouteMinPrice.currency == currency,
+            )
+            .order_by(RouteMinPrice.min_price)
+            .limit(limit)
+        )
+        airports = (await get_reference_data(self.db)).airports
+        responses = []
+        for entry in result.scalars().all():
+            dest_airport = airports.get(entry.dest_code)
+            responses.append(AnywhereDestinationResponse(
+                route_id=entry.route_id,
+                dest_code=entry.dest_code,
+                dest_city=dest_airport.display_city if dest_airport else None,
+                departure_month=entry.departure_month,
+                cabin_class=entry.cabin_class,
+                min_price=from_minor(entry.min_price, entry.currency),
+                currency=entry.currency,
+                airline_code=entry.airline_code,
+                departure_date=entry.departure_date,
+                observed_at=entry.observed_at,
+            ))
+        return responses
+
+    async def refresh_min_prices(self, route_ids: Iterable[int]) -> int:
+        """Rebuild route_min_prices for the given routes from recent flight_prices.
+
+        Each (route, departure month, cabin, currency) keeps the cheapest fare
+        observed in the last _RECENT_PRICE_DAYS for a departure that is still
+        ahead; amounts in different currencies are never compared. The caller
+        commits. Returns the number of index rows written.
+        """
+        route_ids = sorted(set(route_ids))
+        if not route_ids:
+            return 0
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        cutoff = now - timedelta(days=_RECENT_PRICE_DAYS)
+        recent = (
+            FlightPrice.route_id.in_(route_ids),
+            FlightPrice.time >= cutoff,
+            FlightPrice.departure_date >= now.date(),
+            FlightPrice.price_amount > 0,
+        )
+        daily_min = (
+            select(
+                FlightPrice.route_id,
+                FlightPrice.departure_date,
+                FlightPrice.cabin_class,
+                FlightPrice.currency,
+                func.min(FlightPrice.price_amount).label("min_price"),
+            )
+            .where(*recent)
+            .group_by(
+                FlightPrice.route_id, FlightPrice.departure_date, FlightPrice.cabin_class,
+                FlightPrice.currency,
+            )
+            .subquery()
+        )
+        # Join back for the airline of the cheapest fare; newest observation first
+        result = await self.db.execute(
+            select(FlightPrice, Route.origin_code, Route.dest_code)
+            .join(daily_min, and_(
+                FlightPrice.route_id == daily_min.c.route_id,
+                FlightPrice.departure_date == daily_min.c.departure_date,
+                FlightPrice.cabin_class == daily_min.c.cabin_class,
+                FlightPrice.currency == daily_min.c.currency,
+                FlightPrice.price_amount == daily_min.c.min_price,
+            ))
+            .join(Route, Route.id == FlightPrice.route_id)
+            .where(*recent)
+            .order_by(FlightPrice.time.desc())
+        )
+
+        best: dict[tuple[int, str, str, str], RouteMinPrice] = {}
+        for price, origin_code, dest_code in result.all():
+            key = (
+                price.route_id, price.departure_date.strftime("%Y-%m"), price.cabin_class,
+                price.currency,
+            )
+            current = best.get(key)
+            if current is not None and current.min_price <= price.price_amount:
+                continue
+            best[key] = RouteMinPrice(
+                route_id=price.route_id,
+                departure_month=key[1],
+                cabin_class=price.cabin_class,
+                origin_code=origin_code,
+                dest_code=dest_code,
+                min_price=price.price_amount,
+                currency=price.currency,
+                airline_code=price.airline_code,
+                departure_date=price.departure_date,
+                observed_at=price.time,
+                updated_at=now,
+            )
+
+        await self.db.execute(delete(RouteMinPrice).where(RouteMinPrice.route_id.in_(route_ids)))
+        self.db.add_all(best.values())
+        return len(best)
+
     async def search_airports(self, query: str) -> list[AirportSearchResponse]:
         query = query.strip()
         if not query:
@@ -1,11 +1,68 @@
-import pytest
-from httpx import ASGITransport, AsyncClient
+import os
+import sys
+import tempfile
+from pathlib import Path
 
-from app.main import app
+# Settings are read at import time, so point the app (and the pipeline package,
+# imported from the project root) at a scratch database before importing them
+_DB_FILE = Path(tempfile.mkdtemp(prefix="farenheit-tests-")) / "test.db"
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_DB_FILE}"
+os.environ["SCHEDULER_MODE"] = "external"
+for _key in ("TRAVELPAYOUTS_TOKEN", "AIRLABS_API_KEY", "AVIATIONSTACK_API_KEY"):
+    os.environ[_key] = ""
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import pytest  # noqa: E402
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+
+from app.db.schema import ensure_schema  # noqa: E402
+from app.db.session import async_session_factory, dispose_engines, engine, storage  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Airline, Airport, Route  # noqa: E402
+from app.services.reference_data import invalidate_reference_data  # noqa: E402
+
+
+@pytest.fixture
+async def db():
+    """Empty schema on a fresh scratch database; engines are disposed afterwards."""
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{_DB_FILE}{suffix}").unlink(missing_ok=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(ensure_schema, storage)
+    invalidate_reference_data()
+    yield _DB_FILE
+    invalidate_reference_data()
+    await dispose_engines()
+    if "pipeline.runtime" in sys.modules:
+        # Pipeline jobs ran on the persistent loop; close it with its pooled connections
+        sys.modules["pipeline.runtime"].shutdown()
+
+
+@pytest.fixture
+async def routes(db):
+    """ICN -> NRT (1), ICN -> BKK (2) and NRT -> ICN (3), with airlines KE and OZ."""
+    async with async_session_factory() as session:
+        session.add_all(
+            Airport(iata_code=code, name=code, city=code, country_code="XX")
+            for code in ("ICN", "NRT", "BKK")
+        )
+        session.add_all([
+            Airline(iata_code="KE", name="Korean Air"),
+            Airline(iata_code="OZ", name="Asiana"),
+        ])
+        await session.flush()
+        session.add_all([
+            Route(id=1, origin_code="ICN", dest_code="NRT"),
+            Route(id=2, origin_code="ICN", dest_code="BKK"),
+            Route(id=3, origin_code="NRT", dest_code="ICN"),
+        ])
+        await session.commit()
+    invalidate_reference_data()
+    return [1, 2, 3]
 
 
 @pytest.fixture
-async def client():
+async def client(db):
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
     ) as ac:
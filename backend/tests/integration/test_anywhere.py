@@ -0,0 +1,84 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from app.db.session import async_session_factory
+from app.models.flight_price import FlightPrice
+from app.models.route_min_price import RouteMinPrice
+from app.services.route_service import RouteService
+
+
+async def _seed_min_prices() -> None:
+    # Route 2's USD 250.00 is 25_000 minor units: cheaper-looking than KRW 300,000,
+    # but the two must never be ranked against each other
+    async with async_session_factory() as session:
+        session.add_all([
+            RouteMinPrice(
+                route_id=route_id, departure_month="2026-11", cabin_class="ECONOMY",
+                origin_code="ICN", dest_code=dest, min_price=min_price, currency=currency,
+                airline_code=airline, departure_date=date(2026, 11, 14),
+                observed_at=datetime(2026, 10, 18, 9, 0),
+            )
+            for route_id, dest, min_price, currency, airline in (
+                (1, "NRT", 300_000, "KRW", "KE"),
+                (2, "BKK", 25_000, "USD", "OZ"),
+            )
+        ])
+        await session.commit()
+
+
+async def test_anywhere_ranks_fares_in_the_default_currency_only(routes, client):
+    await _seed_min_prices()
+
+    response = await client.get(
+        "/api/v1/routes/anywhere", params={"origin": "icn", "month": "2026-11"},
+    )
+
+    assert response.status_code == 200
+    assert [(d["dest_code"], d["currency"]) for d in response.json()] == [("NRT", "KRW")]
+    assert Decimal(response.json()[0]["min_price"]) == Decimal("300000")
+
+
+async def test_anywhere_in_a_requested_currency(routes, client):
+    await _seed_min_prices()
+
+    response = await client.get(
+        "/api/v1/routes/anywhere", params={"origin": "ICN", "month": "2026-11", "currency": "usd"},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [(d["dest_code"], d["currency"]) for d in body] == [("BKK", "USD")]
+    assert Decimal(body[0]["min_price"]) == Decimal("250.00")
+
+
+async def test_refresh_keeps_a_minimum_per_currency(routes, client):
+    observed = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=1)
+    departure = date.today() + timedelta(days=20)
+    async with async_session_factory() as session:
+        # USD 250.00 is 25_000 minor units; it must not displace the KRW minimum
+        session.add_all(
+            FlightPrice(
+                time=observed - timedelta(minutes=minutes), route_id=1, airline_code=airline,
+                departure_date=departure, cabin_class="ECONOMY", price_amount=price,
+                currency=currency, stops=0, source="travelpayouts",
+            )
+            for minutes, airline, price, currency in (
+                (0, "KE", 300_000, "KRW"), (0, "OZ", 280_000, "KRW"), (5, "KE", 25_000, "USD"),
+            )
+        )
+        await session.flush()
+        assert await RouteService(session).refresh_min_prices([1]) == 2
+        await session.commit()
+
+    month = departure.strftime("%Y-%m")
+    in_krw = await client.get("/api/v1/routes/anywhere", params={"origin": "ICN", "month": month})
+    in_usd = await client.get(
+        "/api/v1/routes/anywhere", params={"origin": "ICN", "month": month, "currency": "USD"},
+    )
+
+    assert [(d["airline_code"], Decimal(d["min_price"])) for d in in_krw.json()] == [
+        ("OZ", Decimal("280000")),
+    ]
+    assert [(d["airline_code"], Decimal(d["min_price"])) for d in in_usd.json()] == [
+        ("KE", Decimal("250.00")),
+    ]
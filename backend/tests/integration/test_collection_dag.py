@@ -0,0 +1,84 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from pipeline.collectors.base import PriceObservation
+from pipeline.collectors.travelpayouts_collector import TravelpayoutsCollector
+from pipeline.tasks import collect_prices, run_prediction, send_alerts
+from sqlalchemy import select
+
+from app import scheduler
+from app.db.session import async_session_factory
+from app.models import PriceAlert
+from app.models.flight_price import FlightPrice
+from app.models.prediction import Prediction
+
+
+async def _prices_for_icn_nrt(self, origin, destination, departure_date, *args, **kwargs):
+    """Fake collector: three observations for ICN -> NRT, nothing for other routes."""
+    if (origin, destination) != ("ICN", "NRT"):
+        return []
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return [
+        PriceObservation(
+            observed_at=now - timedelta(hours=hours),
+            origin=origin,
+            destination=destination,
+            airline_code="KE",
+            departure_date=departure_date,
+            return_date=None,
+            cabin_class="ECONOMY",
+            price=Decimal(250_000 + hours * 1_000),
+            currency="KRW",
+            stops=0,
+            duration_minutes=140,
+            source="travelpayouts",
+            raw_offer_id=None,
+        )
+        for hours in (1, 2, 3)
+    ]
+
+
+async def test_collection_predicts_and_alerts_only_for_changed_routes(routes, monkeypatch):
+    monkeypatch.setattr(TravelpayoutsCollector, "collect", _prices_for_icn_nrt)
+    monkeypatch.setattr(collect_prices, "_DELAY_BETWEEN_DATES", 0)
+    monkeypatch.setattr(collect_prices, "_DELAY_BETWEEN_ROUTES", 0)
+    async with async_session_factory() as session:
+        session.add_all([
+            PriceAlert(route_id=1, target_price=Decimal("300000"), cabin_class="ECONOMY"),
+            PriceAlert(route_id=2, target_price=Decimal("900000"), cabin_class="ECONOMY"),
+        ])
+        # Older price below route 2's target: an all-routes alert check would trigger it
+        session.add(FlightPrice(
+            time=datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=5),
+            route_id=2, airline_code="OZ",
+            departure_date=date.today() + timedelta(days=20), cabin_class="ECONOMY",
+            price_amount=500_000, currency="KRW", stops=0, source="travelpayouts",
+        ))
+        await session.commit()
+
+    scoped: dict[str, list] = {"predict": [], "alerts": []}
+    real_predict = run_prediction.predict_all_active_sync
+    real_alerts = send_alerts.check_and_send_sync
+
+    def predict(route_ids=None):
+        scoped["predict"].append(route_ids)
+        return real_predict(route_ids)
+
+    def alerts(route_ids=None):
+        scoped["alerts"].append(route_ids)
+        return real_alerts(route_ids)
+
+    monkeypatch.setattr(run_prediction, "predict_all_active_sync", predict)
+    monkeypatch.setattr(send_alerts, "check_and_send_sync", alerts)
+
+    scheduler._run_collect_prices()
+
+    assert scoped == {"predict": [[1]], "alerts": [[1]]}
+    async with async_session_factory() as session:
+        predicted_routes = set((await session.execute(select(Prediction.route_id))).scalars())
+        triggered = dict((await session.execute(
+            select(PriceAlert.route_id, PriceAlert.is_triggered)
+        )).all())
+    assert predicted_routes == {1}
+    # Route 2 collected nothing new, so its satisfiable alert was not evaluated
+    assert triggered == {1: True, 2: False}
@@ -0,0 +1,129 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from app.config import FLEXIBLE_RANGE_TOO_LONG_MSG, MAX_FLEXIBLE_DAYS
+from app.db.session import async_session_factory, read_engine, read_session_factory
+from app.models.flight_price import FlightPrice
+from app.schemas.flight import DailyMinPrice
+from app.services import flight_service
+from app.services.flight_service import FlightService
+from app.services.reference_data import get_reference_data
+
+
+@pytest.fixture
+def no_calendar(monkeypatch):
+    async def fetch_calendar_month(origin, dest, month):
+        return {}
+
+    monkeypatch.setattr(flight_service._tp_client, "fetch_calendar_month", fetch_calendar_month)
+
+
+@pytest.fixture
+def route_queries():
+    """SELECTs against the routes table issued on the read pool."""
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, *args):
+        if "FROM routes" in statement:
+            statements.append(statement)
+
+    event.listen(read_engine.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(read_engine.sync_engine, "before_cursor_execute", record)
+
+
+async def _seed_prices(start: date) -> None:
+    observed = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=1)
+    async with async_session_factory() as session:
+        session.add_all(
+            FlightPrice(
+                time=observed, route_id=1, airline_code=airline,
+                departure_date=start + timedelta(days=day), cabin_class="ECONOMY",
+                price_amount=price, currency="KRW", stops=0, source="travelpayouts",
+            )
+            for day, airline, price in ((0, "KE", 310_000), (0, "OZ", 290_000), (2, "KE", 275_000))
+        )
+        await session.commit()
+
+
+async def test_flexible_search_reads_stored_minimums_via_the_route_snapshot(
+    routes, no_calendar, route_queries,
+):
+    start = date.today() + timedelta(days=20)
+    await _seed_prices(start)
+
+    async with read_session_factory() as session:
+        await get_reference_data(session)
+        route_queries.clear()
+        response = await FlightService(session).search_flexible(
+            "ICN", "NRT", start, start + timedelta(days=2), "ECONOMY",
+        )
+
+    assert route_queries == []
+    assert [(d.price_amount, d.airline_code) for d in response.days] == [
+        (Decimal("290000"), "OZ"), (None, None), (Decimal("275000"), "KE"),
+    ]
+    assert response.cheapest.departure_date == start + timedelta(days=2)
+
+
+async def test_flexible_search_for_an_unknown_route_has_no_prices(routes, no_calendar):
+    start = date.today() + timedelta(days=20)
+
+    async with read_session_factory() as session:
+        response = await FlightService(session).search_flexible(
+            "ICN", "CDG", start, start + timedelta(days=1), "ECONOMY",
+        )
+
+    assert [d.price_amount for d in response.days] == [None, None]
+    assert response.cheapest is None
+
+
+async def test_flexible_endpoint_takes_the_cheaper_of_live_and_stored(routes, client, monkeypatch):
+    start = date.today() + timedelta(days=20)
+    await _seed_prices(start)
+    months: list[date] = []
+
+    async def fetch_calendar_month(origin, dest, month):
+        months.append(month)
+        live = {
+            start: DailyMinPrice(
+                departure_date=start, price_amount=Decimal("295000"), currency="KRW",
+                airline_code="7C", stops=0, data_source="live",
+            ),
+            start + timedelta(days=1): DailyMinPrice(
+                departure_date=start + timedelta(days=1), price_amount=Decimal("320000"),
+                currency="KRW", airline_code="LJ", stops=0, data_source="live",
+            ),
+        }
+        return {day: price for day, price in live.items() if day.replace(day=1) == month}
+
+    monkeypatch.setattr(flight_service._tp_client, "fetch_calendar_month", fetch_calendar_month)
+
+    response = await client.get("/api/v1/flights/search/flexible", params={
+        "origin": "icn", "dest": "nrt", "start_date": start.isoformat(),
+        "end_date": (start + timedelta(days=2)).isoformat(),
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [(d["airline_code"], d["data_source"]) for d in body["days"]] == [
+        ("OZ", "cached"), ("LJ", "live"), ("KE", "cached"),
+    ]
+    assert body["cheapest"]["airline_code"] == "KE"
+    # One calendar call per month the window touches
+    assert months == sorted({(start + timedelta(days=i)).replace(day=1) for i in range(3)})
+
+
+async def test_flexible_endpoint_rejects_windows_over_the_limit(client):
+    start = date.today() + timedelta(days=5)
+
+    response = await client.get("/api/v1/flights/search/flexible", params={
+        "origin": "ICN", "dest": "NRT", "start_date": start.isoformat(),
+        "end_date": (start + timedelta(days=MAX_FLEXIBLE_DAYS)).isoformat(),
+    })
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == FLEXIBLE_RANGE_TOO_LONG_MSG
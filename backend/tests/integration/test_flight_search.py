@@ -0,0 +1,299 @@
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.core import cache as cache_module
+from app.core.ratelimit import RateLimiter
+from app.db.session import async_session_factory
+from app.models.flight_price import FlightPrice
+from app.schemas.flight import FlightOffer
+from app.services import flight_service, price_writer
+from app.services.flight_service import FlightService
+
+_DEPARTURE = date.today() + timedelta(days=30)
+# airline, price, stops, duration
+_FARES = (("KE", 320_000, 0, 140), ("OZ", 250_000, 1, 300), ("7C", 280_000, 0, 130))
+
+
+class _Travelpayouts:
+    """Stub Travelpayouts search: records each call and can hold it until released."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+        self.fares = _FARES
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def search_flights(
+        self, origin, dest, departure_date, cabin_class="ECONOMY", return_date=None,
+    ) -> list[FlightOffer]:
+        self.calls.append((origin, dest, departure_date, cabin_class, return_date))
+        await self.release.wait()
+        return [
+            FlightOffer(
+                airline_code=airline, departure_date=departure_date, return_date=return_date,
+                cabin_class=cabin_class, price_amount=Decimal(price), currency="KRW",
+                stops=stops, duration_minutes=duration, source="travelpayouts",
+            )
+            for airline, price, stops, duration in self.fares
+        ]
+
+    async def fetch_return_flight_info(self, origin, dest, return_date) -> dict[str, dict]:
+        return {}
+
+
+@pytest.fixture
+def travelpayouts(routes, monkeypatch):
+    """Stub the live fare provider; schedule providers have no API key and return nothing."""
+    tp = _Travelpayouts()
+    monkeypatch.setattr(flight_service._tp_client, "search_flights", tp.search_flights)
+    monkeypatch.setattr(
+        flight_service._tp_client, "fetch_return_flight_info", tp.fetch_return_flight_info,
+    )
+    flight_service._search_cache.clear()
+    yield tp
+    flight_service._search_cache.clear()
+    price_writer._pending.clear()
+
+
+async def _search(
+    origin: str = "ICN", dest: str = "NRT", departure_date: date = _DEPARTURE,
+    cabin_class: str = "ECONOMY", max_stops: int | None = None, sort_by: str = "price",
+    return_date: date | None = None,
+):
+    async with async_session_factory() as session:
+        return await FlightService(session).search(
+            origin, dest, departure_date, cabin_class, max_stops, sort_by, return_date,
+        )
+
+
+async def _until(condition) -> None:
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+async def test_concurrent_identical_searches_share_one_fetch(travelpayouts, monkeypatch):
+    sessions = []
+    open_session = flight_service.background_session_factory
+
+    def background_session():
+        session = open_session()
+        sessions.append(session)
+        return session
+
+    monkeypatch.setattr(flight_service, "background_session_factory", background_session)
+    travelpayouts.release.clear()
+
+    searches = [asyncio.create_task(_search()) for _ in range(5)]
+    await _until(lambda: travelpayouts.calls)
+    travelpayouts.release.set()
+    responses = await asyncio.gather(*searches)
+
+    assert len(travelpayouts.calls) == 1
+    # The shared search ran on one background session, not on a caller's
+    assert len(sessions) == 1
+    assert [o.airline_code for o in responses[0].offers] == ["OZ", "7C", "KE"]
+    assert all(r.model_dump() == responses[0].model_dump() for r in responses)
+
+
+async def test_cancelled_caller_does_not_cancel_the_shared_search(travelpayouts):
+    travelpayouts.release.clear()
+
+    leader = asyncio.create_task(_search())
+    await _until(lambda: travelpayouts.calls)
+    follower = asyncio.create_task(_search())
+    await asyncio.sleep(0.01)
+    # The caller that started the search goes away (and closes its session)
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    travelpayouts.release.set()
+
+    response = await follower
+
+    assert len(response.offers) == 3
+    # The search still finished and cached its outcome
+    await _search()
+    assert len(travelpayouts.calls) == 1
+
+
+async def test_repeat_search_is_served_from_the_cache(travelpayouts, client):
+    params = {"origin": "ICN", "dest": "NRT", "departure_date": _DEPARTURE.isoformat()}
+
+    first = await client.get("/api/v1/flights/search", params=params)
+    second = await client.get("/api/v1/flights/search", params=params)
+
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    assert len(travelpayouts.calls) == 1
+
+
+async def test_stop_filter_and_sort_apply_to_a_cached_outcome(travelpayouts, client):
+    params = {"origin": "ICN", "dest": "NRT", "departure_date": _DEPARTURE.isoformat()}
+
+    async def airlines(**extra) -> list[str]:
+        response = await client.get("/api/v1/flights/search", params={**params, **extra})
+        assert response.status_code == 200
+        return [offer["airline_code"] for offer in response.json()["offers"]]
+
+    assert await airlines() == ["OZ", "7C", "KE"]
+    assert await airlines(max_stops=0, sort_by="duration") == ["7C", "KE"]
+    assert await airlines(sort_by="stops") == ["7C", "KE", "OZ"]
+    # Filtering or sorting a caller's view must not touch the shared outcome
+    cached = flight_service._search_cache.get(("ICN", "NRT", _DEPARTURE, None, "ECONOMY"))
+    assert [o.airline_code for o in cached.offers] == ["KE", "OZ", "7C"]
+    assert await airlines() == ["OZ", "7C", "KE"]
+    assert len(travelpayouts.calls) == 1
+
+
+@pytest.mark.parametrize("other", [
+    {"dest": "BKK"},
+    {"departure_date": _DEPARTURE + timedelta(days=1)},
+    {"cabin_class": "BUSINESS"},
+    {"return_date": _DEPARTURE + timedelta(days=7)},
+], ids=["route", "departure", "cabin", "return"])
+async def test_cache_key_covers_route_dates_and_cabin(travelpayouts, other):
+    await _search()
+    await _search(**other)
+    assert len(travelpayouts.calls) == 2
+
+    await _search()
+    await _search(**other)
+    assert len(travelpayouts.calls) == 2
+
+
+async def test_cached_search_expires_after_the_ttl(travelpayouts, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+
+    await _search()
+    now[0] += settings.SEARCH_CACHE_TTL_SECONDS - 1
+    await _search()
+    assert len(travelpayouts.calls) == 1
+
+    now[0] += 2
+    await _search()
+    assert len(travelpayouts.calls) == 2
+
+
+async def test_empty_outcome_is_not_cached(travelpayouts):
+    travelpayouts.fares = ()
+
+    assert (await _search()).offers == []
+    await _search()
+
+    assert len(travelpayouts.calls) == 2
+
+
+_KE701 = {
+    "flight_iata": "KE701", "airline_iata": "KE", "arr_iata": "NRT",
+    "dep_time": "09:00", "arr_time": "11:20",
+}
+
+
+async def _collect(return_date: date | None = None):
+    async with async_session_factory() as session:
+        return await FlightService(session)._collect_offers(
+            "ICN", "NRT", _DEPARTURE, "ECONOMY", return_date,
+        )
+
+
+async def test_provider_fetches_overlap(travelpayouts, monkeypatch):
+    running = [0]
+    peak = [0]
+
+    def overlapping(result):
+        async def fetch(*args, **kwargs):
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.05)
+            running[0] -= 1
+            return result
+        return fetch
+
+    monkeypatch.setattr(flight_service._tp_client, "search_flights", overlapping([]))
+    monkeypatch.setattr(flight_service._tp_client, "fetch_return_flight_info", overlapping({}))
+    monkeypatch.setattr(flight_service._airlabs_client, "fetch_schedules", overlapping([]))
+    monkeypatch.setattr(flight_service._aviationstack_client, "fetch_schedules", overlapping([]))
+
+    await _collect(return_date=_DEPARTURE + timedelta(days=7))
+
+    # Fares, return info, and AirLabs + Aviationstack schedules for both directions
+    assert peak[0] == 6
+
+
+async def test_failing_schedule_provider_keeps_the_other_providers_data(
+    travelpayouts, monkeypatch,
+):
+    async def airlabs(origin, dest):
+        raise RuntimeError("AirLabs is down")
+
+    async def aviationstack(origin, dest, target_date=None):
+        return [dict(_KE701)]
+
+    monkeypatch.setattr(flight_service._airlabs_client, "fetch_schedules", airlabs)
+    monkeypatch.setattr(flight_service._aviationstack_client, "fetch_schedules", aviationstack)
+
+    outcome = await _collect()
+
+    assert {o.airline_code for o in outcome.offers} == {"KE", "OZ", "7C"}
+    ke = next(o for o in outcome.offers if o.airline_code == "KE")
+    assert (ke.flight_number, ke.departure_time) == ("KE701", f"{_DEPARTURE}T09:00:00")
+
+
+async def test_failing_fare_provider_falls_back_to_stored_prices(travelpayouts, monkeypatch):
+    async with async_session_factory() as session:
+        session.add(FlightPrice(
+            time=datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=1),
+            route_id=1, airline_code="KE", departure_date=_DEPARTURE, cabin_class="ECONOMY",
+            price_amount=310_000, currency="KRW", stops=0, source="travelpayouts",
+        ))
+        await session.commit()
+
+    async def search_flights(*args, **kwargs):
+        raise RuntimeError("Travelpayouts is down")
+
+    monkeypatch.setattr(flight_service._tp_client, "search_flights", search_flights)
+
+    outcome = await _collect()
+
+    assert outcome.data_source == "cached"
+    assert [(o.airline_code, o.price_amount) for o in outcome.offers] == [("KE", Decimal("310000"))]
+
+
+async def test_provider_limiter_still_spaces_concurrent_fetches(travelpayouts, monkeypatch):
+    started: list[float] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        started.append(time.monotonic())
+        return httpx.Response(200, content=json.dumps({"data": []}).encode())
+
+    @asynccontextmanager
+    async def client(provider):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as mock:
+            yield mock
+
+    monkeypatch.setattr(flight_service, "upstream_client", client)
+    monkeypatch.setattr(flight_service._aviationstack_client, "api_key", "test-key")
+    monkeypatch.setattr(
+        flight_service, "_aviationstack_limiter", RateLimiter("test", 4, min_interval=0.2),
+    )
+    flight_service._aviationstack_boards.clear()
+
+    # Outbound and return schedules each need a departure board (ICN and NRT)
+    await _collect(return_date=_DEPARTURE + timedelta(days=7))
+    flight_service._aviationstack_boards.clear()
+
+    assert len(started) == 2
+    assert started[1] - started[0] >= 0.19
@@ -0,0 +1,26 @@
+from datetime import datetime, timedelta, timezone
+
+from app.db.session import async_session_factory
+from app.models.job_run import JobRun
+
+
+async def test_jobs_endpoint_summarises_recorded_runs(client):
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    runs = ((30, 1000, "ok", 0), (20, 3000, "error", 2048), (10, 2000, "ok", None))
+    async with async_session_factory() as session:
+        session.add_all([
+            JobRun(job_name="collect_prices", started_at=now - timedelta(minutes=minutes),
+                   duration_ms=ms, status=status, rows_in=10, rows_out=8, peak_rss_kb=rss)
+            for minutes, ms, status, rss in runs
+        ])
+        await session.commit()
+
+    response = await client.get("/api/v1/stats/jobs")
+
+    assert response.status_code == 200
+    [job] = response.json()["jobs"]
+    assert job["job_name"] == "collect_prices"
+    assert (job["runs"], job["failures"], job["rows_in"]) == (3, 1, 30)
+    assert job["duration_ms"]["max"] == 3000
+    assert job["peak_rss_kb"] == 2048
+    assert job["last_status"] == "ok"
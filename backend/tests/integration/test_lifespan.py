@@ -0,0 +1,26 @@
+from app import scheduler
+from app.config import settings
+from app.main import app
+
+
+async def test_external_mode_leaves_jobs_to_the_worker(db, monkeypatch):
+    calls = []
+    monkeypatch.setattr(scheduler, "start_scheduler", lambda: calls.append("start"))
+    monkeypatch.setattr(settings, "SCHEDULER_MODE", "external")
+
+    async with app.router.lifespan_context(app):
+        pass
+
+    assert calls == []
+
+
+async def test_embedded_mode_runs_the_scheduler_in_the_api(db, monkeypatch):
+    calls = []
+    monkeypatch.setattr(scheduler, "start_scheduler", lambda: calls.append("start"))
+    monkeypatch.setattr(scheduler, "stop_scheduler", lambda: calls.append("stop"))
+    monkeypatch.setattr(settings, "SCHEDULER_MODE", "embedded")
+
+    async with app.router.lifespan_context(app):
+        assert calls == ["start"]
+
+    assert calls == ["start", "stop"]
@@ -0,0 +1,14 @@
+async def test_metrics_report_requests_by_route_template(routes, client):
+    assert (await client.get("/api/v1/routes/popular", params={"limit": 5})).status_code == 200
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/api/v1/routes/popular",'
+        'status="200"}'
+    ) in body
+    assert 'db_query_duration_seconds_count{operation="SELECT"}' in body
+    assert "# TYPE write_behind_rows_total counter" in body
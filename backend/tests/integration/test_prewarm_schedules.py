@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta, timezone
+
+from pipeline.tasks import prewarm_schedules
+from sqlalchemy import select
+
+from app.db.session import async_session_factory
+from app.models.flight_schedule import FlightSchedule
+from app.services import flight_service
+
+
+async def test_prewarm_refreshes_only_stale_directions_of_active_routes(routes, monkeypatch):
+    async with async_session_factory() as session:
+        # ICN -> NRT was refreshed by a search two hours ago
+        session.add(FlightSchedule(
+            origin_code="ICN", dest_code="NRT", airline_code="KE", flight_iata="KE701",
+            dep_time="09:00", arr_time="11:20",
+            fetched_at=datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=2),
+        ))
+        await session.commit()
+    fetched: list[tuple[str, str]] = []
+
+    async def fetch(origin, dest, target_date, avstack_prefetch=None):
+        fetched.append((origin, dest))
+        if dest == "BKK":
+            return []  # provider outage: nothing to store
+        return [{
+            "flight_iata": "KE705", "airline_iata": "KE",
+            "dep_time": "2026-11-02 13:00", "arr_time": "2026-11-02 15:20",
+        }]
+
+    monkeypatch.setattr(flight_service, "_fetch_schedule_entries", fetch)
+
+    result = prewarm_schedules.prewarm_schedules_sync()
+
+    assert sorted(fetched) == [("BKK", "ICN"), ("ICN", "BKK"), ("NRT", "ICN")]
+    assert (result["rows_in"], result["directions_refreshed"], result["schedules_stored"]) == (
+        4, 3, 2,
+    )
+    # Upstream calls are not counted, so none are claimed
+    assert "api_calls" not in result
+    async with async_session_factory() as session:
+        rows = (await session.execute(
+            select(FlightSchedule.origin_code, FlightSchedule.dest_code, FlightSchedule.flight_iata)
+        )).all()
+    assert sorted(rows) == [
+        ("BKK", "ICN", "KE705"), ("ICN", "NRT", "KE701"), ("NRT", "ICN", "KE705"),
+    ]
@@ -0,0 +1,71 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.metrics import WRITE_BEHIND_ROWS
+from app.db.session import async_session_factory
+from app.models import PriceAlert
+from app.models.flight_price import FlightPrice
+from app.models.route_min_price import RouteMinPrice
+from app.services import price_writer
+
+
+@pytest.fixture(autouse=True)
+def empty_queue():
+    price_writer._pending.clear()
+    yield
+    price_writer._pending.clear()
+
+
+def _row(airline_code: str = "KE", minutes_ago: int = 1, price: int = 300_000) -> dict:
+    return {
+        "time": (
+            datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+            - timedelta(minutes=minutes_ago)
+        ),
+        "route_id": 1, "airline_code": airline_code,
+        "departure_date": date.today() + timedelta(days=30), "cabin_class": "ECONOMY",
+        "price_amount": price, "currency": "KRW", "stops": 0, "source": "search",
+    }
+
+
+async def _count(model) -> int:
+    async with async_session_factory() as session:
+        return await session.scalar(select(func.count()).select_from(model))
+
+
+async def test_flush_writes_valid_rows_and_counts_the_rest(routes):
+    written = WRITE_BEHIND_ROWS.get(result="written")
+    skipped = WRITE_BEHIND_ROWS.get(result="skipped")
+    duplicate = _row("OZ", minutes_ago=2, price=280_000)
+    price_writer.enqueue_prices([_row("KE"), duplicate, dict(duplicate), _row("ZZ")])
+
+    assert await price_writer.flush_prices() == 2
+
+    # One duplicate primary key and one airline without a reference row are skipped
+    assert WRITE_BEHIND_ROWS.get(result="written") == written + 2
+    assert WRITE_BEHIND_ROWS.get(result="skipped") == skipped + 2
+    assert await _count(FlightPrice) == 2
+    async with async_session_factory() as session:
+        index_row = await session.scalar(select(RouteMinPrice).where(RouteMinPrice.route_id == 1))
+    assert (index_row.min_price, index_row.airline_code) == (280_000, "OZ")
+    assert not price_writer._pending
+
+
+async def test_flush_does_not_share_a_failing_request_transaction(routes):
+    price_writer.enqueue_prices([_row("KE")])
+
+    async with async_session_factory() as request:
+        request.add(PriceAlert(route_id=2, target_price=Decimal("400000"), cabin_class="ECONOMY"))
+        await request.flush()
+        flush = asyncio.create_task(price_writer.flush_prices())
+        await asyncio.sleep(0.2)
+        # The request fails after the flush started: only its own work is undone
+        await request.rollback()
+    assert await flush == 1
+
+    assert await _count(FlightPrice) == 1
+    assert await _count(PriceAlert) == 0
@@ -0,0 +1,66 @@
+from datetime import date, datetime, timedelta, timezone
+
+from app.db.queries import latest_price_per_airline, recent_min_price_by_departure_query
+from app.db.session import async_session_factory, read_session_factory
+from app.models.flight_price import FlightPrice
+
+_DEPARTURE = date.today() + timedelta(days=30)
+
+
+async def _seed_prices() -> datetime:
+    now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    async with async_session_factory() as session:
+        session.add_all(
+            FlightPrice(
+                time=now - timedelta(hours=hours_ago), route_id=route_id, airline_code=airline,
+                departure_date=_DEPARTURE + timedelta(days=day), cabin_class=cabin,
+                price_amount=price, currency="KRW", stops=0, source="travelpayouts",
+            )
+            for route_id, airline, day, cabin, hours_ago, price in (
+                (1, "KE", 0, "ECONOMY", 3, 300_000),
+                (1, "KE", 0, "ECONOMY", 1, 320_000),
+                (1, "OZ", 0, "ECONOMY", 2, 280_000),
+                (1, "OZ", 0, "BUSINESS", 0, 900_000),
+                (1, "KE", 1, "ECONOMY", 0, 260_000),
+                (2, "KE", 0, "ECONOMY", 0, 410_000),
+            )
+        )
+        await session.commit()
+    return now
+
+
+async def test_latest_price_per_airline_keeps_the_newest_fare_of_each_airline(routes):
+    now = await _seed_prices()
+
+    async with read_session_factory() as session:
+        by_id = await latest_price_per_airline(session, _DEPARTURE, "ECONOMY", route_id=1)
+        by_codes = await latest_price_per_airline(
+            session, _DEPARTURE, "ECONOMY", origin="ICN", dest="NRT",
+        )
+        without_ke = await latest_price_per_airline(
+            session, _DEPARTURE, "ECONOMY", route_id=1, exclude_airlines={"KE"},
+        )
+
+    fares = sorted((r.airline_code, r.airline_name, r.price_amount, r.time) for r in by_id)
+    assert fares == [
+        ("KE", "Korean Air", 320_000, now - timedelta(hours=1)),
+        ("OZ", "Asiana", 280_000, now - timedelta(hours=2)),
+    ]
+    assert sorted((r.airline_code, r.price_amount) for r in by_codes) == [
+        ("KE", 320_000), ("OZ", 280_000),
+    ]
+    assert [(r.airline_code, r.price_amount) for r in without_ke] == [("OZ", 280_000)]
+
+
+async def test_recent_min_price_by_departure_ignores_older_observations(routes):
+    now = await _seed_prices()
+
+    async with read_session_factory() as session:
+        rows = (await session.execute(recent_min_price_by_departure_query(
+            1, "ECONOMY", _DEPARTURE, _DEPARTURE + timedelta(days=1),
+            observed_since=now - timedelta(hours=1, minutes=30),
+        ))).all()
+
+    assert [tuple(row) for row in rows] == [
+        (_DEPARTURE, 320_000), (_DEPARTURE + timedelta(days=1), 260_000),
+    ]
@@ -0,0 +1,259 @@
+"""The hot flight_prices queries must be served by the intended indexes.
+
+The real service methods and pipeline jobs run against synthetic prices; every
+statement they send that touches flight_prices goes through EXPLAIN QUERY PLAN,
+on the fresh schema (no statistics) and after ANALYZE. A plan passes when each
+flight_prices step is an index SEARCH on one of the indexes the query is
+expected to use; a full SCAN fails unless the query reads everything anyway.
+Re-run after touching FlightPrice.__table_args__ or any query listed below.
+"""
+
+import random
+import sqlite3
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from pipeline.tasks.cleanup import apply_retention_policy_sync
+from pipeline.tasks.run_prediction import predict_all_active_sync
+from pipeline.tasks.send_alerts import check_and_send_sync
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.api.v1.stats import get_stats
+from app.db.queries import latest_price_per_airline
+from app.db.session import async_session_factory
+from app.models import Airline, Airport, PriceAlert, Route
+from app.services.flight_service import FlightService
+from app.services.prediction_service import PredictionService
+from app.services.route_service import RouteService
+
+_ROWS = 20_000
+_ORIGIN = "ICN"
+_DESTS = ["NRT", "KIX", "BKK", "SIN", "HKG", "TPE", "CJU", "LAX", "CDG", "SYD"]
+_AIRLINES = ["KE", "OZ", "7C", "LJ", "TW", "JL", "NH", "SQ"]
+_CABINS = ("ECONOMY", "ECONOMY", "ECONOMY", "BUSINESS")
+_DEPARTURE_DAYS = 120
+
+# Index names, as created by the models
+_LATEST = "idx_fp_latest_per_airline"
+_ROUTE_TIME = "idx_fp_route_time"
+# Primary key: (time, route_id, airline_code, departure_date, cabin_class)
+_PK = "sqlite_autoindex_flight_prices_1"
+
+_DEPARTURE = date.today() + timedelta(days=30)
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    label: str
+    allowed_indexes: frozenset[str]
+    run: Callable[..., Awaitable] | Callable[[], object]
+    # Queries that legitimately read the whole table (COUNT(*)) may scan an index
+    full_scan_ok: bool = False
+    pipeline: bool = False
+
+
+_HOT_QUERIES = (
+    HotQuery(
+        "search: latest fare per airline (route id)", frozenset({_LATEST}),
+        lambda db: latest_price_per_airline(db, _DEPARTURE, "ECONOMY", route_id=1),
+    ),
+    HotQuery(
+        "search: latest fare per airline (origin/dest)", frozenset({_LATEST}),
+        lambda db: latest_price_per_airline(
+            db, _DEPARTURE, "ECONOMY", origin=_ORIGIN, dest=_DESTS[0],
+        ),
+    ),
+    HotQuery(
+        "flexible: daily min per departure date", frozenset({_LATEST}),
+        lambda db: FlightService(db)._daily_min_prices_from_db(
+            _ORIGIN, _DESTS[0], _DEPARTURE, _DEPARTURE + timedelta(days=6), "ECONOMY",
+        ),
+    ),
+    HotQuery(
+        "history: prices for one departure", frozenset({_LATEST, _ROUTE_TIME}),
+        lambda db: FlightService(db).get_price_history(1, _DEPARTURE, None, 30),
+    ),
+    HotQuery(
+        "history: prices for one departure and airline", frozenset({_LATEST, _ROUTE_TIME}),
+        lambda db: FlightService(db).get_price_history(1, _DEPARTURE, "KE", 30),
+    ),
+    HotQuery(
+        "routes: popular routes min price", frozenset({_ROUTE_TIME}),
+        lambda db: RouteService(db).get_popular_routes(10),
+    ),
+    HotQuery(
+        "routes: refresh route_min_prices", frozenset({_ROUTE_TIME, _LATEST}),
+        lambda db: RouteService(db).refresh_min_prices([1, 2, 3]),
+    ),
+    HotQuery(
+        "predictions: heatmap fallback", frozenset({_LATEST}),
+        lambda db: PredictionService(db).get_heatmap(
+            _ORIGIN, _DESTS[0], _DEPARTURE.strftime("%Y-%m"),
+        ),
+    ),
+    HotQuery(
+        "stats: count and last collection", frozenset({_PK, _ROUTE_TIME, _LATEST}),
+        get_stats, full_scan_ok=True,
+    ),
+    HotQuery(
+        "pipeline: prediction price history", frozenset({_ROUTE_TIME}),
+        lambda: predict_all_active_sync([1]), pipeline=True,
+    ),
+    HotQuery(
+        "pipeline: alert min prices", frozenset({_ROUTE_TIME}),
+        lambda: check_and_send_sync([1]), pipeline=True,
+    ),
+    HotQuery(
+        "pipeline: retention cleanup", frozenset({_PK}),
+        apply_retention_policy_sync, pipeline=True,
+    ),
+)
+
+
+async def _seed(db_file) -> None:
+    async with async_session_factory() as session:
+        session.add_all(
+            Airport(iata_code=code, name=code, city=code, country_code="XX")
+            for code in [_ORIGIN, *_DESTS]
+        )
+        session.add_all(Airline(iata_code=code, name=f"Airline {code}") for code in _AIRLINES)
+        await session.flush()
+        session.add_all(
+            Route(id=i + 1, origin_code=_ORIGIN, dest_code=dest) for i, dest in enumerate(_DESTS)
+        )
+        await session.flush()
+        session.add(PriceAlert(route_id=1, target_price=100_000, cabin_class="ECONOMY"))
+        await session.commit()
+
+    rng = random.Random(5)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    rows = [
+        (
+            (now - timedelta(seconds=rng.randrange(200 * 86400))).strftime("%Y-%m-%d %H:%M:%S.%f"),
+            rng.randint(1, len(_DESTS)),
+            rng.choice(_AIRLINES),
+            (date.today() + timedelta(days=rng.randrange(_DEPARTURE_DAYS))).isoformat(),
+            rng.choice(_CABINS),
+            rng.randint(80_000, 1_500_000),
+            rng.randint(0, 2),
+            rng.randint(90, 900),
+        )
+        for _ in range(_ROWS)
+    ]
+    with sqlite3.connect(db_file) as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO flight_prices (time, route_id, airline_code, departure_date, "
+            "cabin_class, return_date, price_amount, currency, stops, duration_minutes, source, "
+            "raw_offer_id) VALUES (?, ?, ?, ?, ?, NULL, ?, 'KRW', ?, ?, 'travelpayouts', NULL)",
+            rows,
+        )
+    conn.close()
+
+
+@pytest.fixture
+async def captured(db):
+    """Seed the scratch database and capture each hot query's flight_prices statements."""
+    await _seed(db)
+    statements: dict[str, list[tuple[str, tuple]]] = {query.label: [] for query in _HOT_QUERIES}
+    current: list[str] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany) -> None:
+        if not current or executemany or "flight_prices" not in statement:
+            return
+        if statement.lstrip().split(None, 1)[0].upper() in ("SELECT", "WITH", "DELETE", "UPDATE"):
+            statements[current[0]].append((statement, tuple(parameters or ())))
+
+    event.listen(Engine, "before_cursor_execute", capture)
+    try:
+        for query in _HOT_QUERIES:
+            current[:] = [query.label]
+            if query.pipeline:
+                query.run()
+                continue
+            async with async_session_factory() as session:
+                await query.run(session)
+                await session.rollback()
+    finally:
+        current.clear()
+        event.remove(Engine, "before_cursor_execute", capture)
+    return statements
+
+
+def _plan_problems(conn, query: HotQuery, statement: str, params: tuple) -> list[str]:
+    problems = []
+    for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}", params):
+        step = row[3]
+        words = step.split()
+        if "flight_prices" not in words[:2]:
+            continue
+        index = next((w for i, w in enumerate(words) if i > 0 and words[i - 1] == "INDEX"), None)
+        if words[0] == "SCAN" and not query.full_scan_ok:
+            problems.append(f"full scan: {step}")
+        elif index is None and "PRIMARY KEY" not in step:
+            problems.append(f"no index: {step}")
+        elif index is not None and index not in query.allowed_indexes:
+            problems.append(f"unexpected index {index}: {step}")
+    return problems
+
+
+def _check_plans(db_file, statements: dict[str, list[tuple[str, tuple]]]) -> dict[str, list[str]]:
+    failures: dict[str, list[str]] = {}
+    with sqlite3.connect(db_file) as conn:
+        for query in _HOT_QUERIES:
+            captured = statements[query.label]
+            if not captured:
+                failures[query.label] = ["no flight_prices statement captured"]
+                continue
+            problems = [
+                problem
+                for statement, params in dict(captured).items()
+                for problem in _plan_problems(conn, query, statement, params)
+            ]
+            if problems:
+                failures[query.label] = problems
+    conn.close()
+    return failures
+
+
+def _reset_statistics(db_file, analyze: bool) -> None:
+    with sqlite3.connect(db_file) as conn:
+        # Drop whatever the startup PRAGMA optimize gathered on the empty schema
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone():
+            conn.execute("DELETE FROM sqlite_stat1")
+        if analyze:
+            conn.execute("ANALYZE")
+    conn.close()
+
+
+@pytest.mark.parametrize("analyze", [False, True], ids=["without-statistics", "after-analyze"])
+async def test_hot_queries_use_their_indexes(db, captured, analyze):
+    _reset_statistics(db, analyze)
+
+    assert _check_plans(db, captured) == {}
+
+
+async def test_plan_check_fails_without_the_route_time_index(db, captured):
+    _reset_statistics(db, analyze=True)
+    with sqlite3.connect(db) as conn:
+        conn.execute(f"DROP INDEX {_ROUTE_TIME}")
+    conn.close()
+
+    failures = _check_plans(db, captured)
+
+    assert "routes: popular routes min price" in failures
+    assert "pipeline: alert min prices" in failures
+
+
+async def test_plan_check_fails_without_the_latest_per_airline_index(db, captured):
+    _reset_statistics(db, analyze=True)
+    with sqlite3.connect(db) as conn:
+        conn.execute(f"DROP INDEX {_LATEST}")
+    conn.close()
+
+    failures = _check_plans(db, captured)
+
+    assert "search: latest fare per airline (route id)" in failures
+    assert "flexible: daily min per departure date" in failures
@@ -0,0 +1,29 @@
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+
+from app.db.session import async_session_factory, read_engine, read_session_factory
+from app.models import Airline
+from app.models.route import Route
+
+
+async def test_read_sessions_refuse_writes(routes):
+    async with read_session_factory() as session:
+        session.add(Airline(iata_code="7C", name="Jeju Air"))
+        with pytest.raises(OperationalError, match="readonly"):
+            await session.flush()
+
+
+async def test_reads_run_beside_an_open_write_transaction(routes):
+    async with async_session_factory() as writer:
+        writer.add(Route(id=4, origin_code="BKK", dest_code="ICN"))
+        await writer.flush()  # holds the write lock until commit
+
+        async with read_session_factory() as reader:
+            before = await reader.scalar(select(func.count()).select_from(Route))
+        await writer.commit()
+
+    async with read_session_factory() as reader:
+        after = await reader.scalar(select(func.count()).select_from(Route))
+    assert (before, after) == (3, 4)
+    assert read_engine.pool.size() > 1
@@ -0,0 +1,49 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from app.db.session import async_session_factory
+from app.models.prediction import Prediction
+
+
+async def _seed_prediction(departure: date, direction: str, confidence: Decimal | None) -> None:
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    async with async_session_factory() as session:
+        session.add(Prediction(
+            route_id=1, airline_code="KE", departure_date=departure, cabin_class="ECONOMY",
+            predicted_price=300_000, confidence_low=270_000, confidence_high=330_000,
+            price_direction=direction, confidence_score=confidence, model_version="test",
+            predicted_at=now, valid_until=now + timedelta(hours=6),
+        ))
+        await session.commit()
+
+
+async def _recommendation(client, departure: date) -> dict:
+    response = await client.get("/api/v1/recommendations", params={
+        "origin": "ICN", "dest": "NRT", "departure_date": departure.isoformat(),
+    })
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_prediction_without_confidence_score_holds(routes, client):
+    departure = date.today() + timedelta(days=30)
+    await _seed_prediction(departure, "DOWN", None)
+
+    body = await _recommendation(client, departure)
+
+    assert (body["signal"], body["confidence"]) == ("HOLD", None)
+    assert "(0%)" in body["reasoning"]
+    assert Decimal(body["current_price"]) == Decimal("300000")
+
+
+async def test_confident_prediction_reports_its_confidence(routes, client):
+    departure = date.today() + timedelta(days=30)
+    await _seed_prediction(departure, "DOWN", Decimal("0.8"))
+
+    body = await _recommendation(client, departure)
+
+    assert body["signal"] == "WAIT"
+    assert "신뢰도 80%" in body["reasoning"]
+    # The lowest prediction in the window is this one
+    assert Decimal(body["predicted_low"]) == Decimal("300000")
+    assert body["predicted_low_date"] == departure.isoformat()
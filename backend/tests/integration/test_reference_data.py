@@ -0,0 +1,66 @@
+import asyncio
+
+from app.db.session import async_session_factory, read_session_factory
+from app.models import Airline, Route
+from app.services import reference_data
+from app.services.reference_data import find_route, get_reference_data, invalidate_reference_data
+
+
+async def test_snapshot_is_shared_until_invalidated(routes):
+    async with read_session_factory() as session:
+        first = await get_reference_data(session)
+        assert await get_reference_data(session) is first
+    assert first.airline_name("KE") == "Korean Air"
+    assert first.routes["ICN", "NRT"].id == 1
+    assert first.airports["BKK"].display_city == "BKK"
+
+    async with async_session_factory() as session:
+        session.add(Airline(iata_code="7C", name="Jeju Air"))
+        await session.commit()
+    invalidate_reference_data()
+
+    async with read_session_factory() as session:
+        reloaded = await get_reference_data(session)
+    assert reloaded is not first
+    assert reloaded.airline_name("7C") == "Jeju Air"
+
+
+async def test_find_route_falls_back_to_the_database_on_a_snapshot_miss(routes):
+    async with read_session_factory() as session:
+        snapshot = await get_reference_data(session)
+    # Created by another process: this one's snapshot does not know the route
+    async with async_session_factory() as session:
+        session.add(Route(id=4, origin_code="BKK", dest_code="ICN"))
+        await session.commit()
+
+    async with read_session_factory() as session:
+        route = await find_route(session, "BKK", "ICN")
+        missing = await find_route(session, "BKK", "NRT")
+        refreshed = await get_reference_data(session)
+
+    assert (route.id, route.origin_code, route.dest_code) == (4, "BKK", "ICN")
+    assert missing is None
+    assert refreshed is not snapshot
+    assert refreshed.routes["BKK", "ICN"] == route
+
+
+async def test_load_overlapping_an_invalidation_is_not_cached(routes, monkeypatch):
+    real_load = reference_data._load
+    loading = asyncio.Event()
+    resume = asyncio.Event()
+
+    async def slow_load(db):
+        data = await real_load(db)
+        loading.set()
+        await resume.wait()
+        return data
+
+    monkeypatch.setattr(reference_data, "_load", slow_load)
+    async with read_session_factory() as session:
+        load = asyncio.create_task(get_reference_data(session))
+        await loading.wait()
+        invalidate_reference_data()
+        resume.set()
+        await load
+
+    assert reference_data._snapshot.get(reference_data._SNAPSHOT_KEY) is None
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.db.session import async_session_factory
+from app.models.flight_schedule import FlightSchedule
+from app.services import flight_service
+from app.services.flight_service import FlightService
+
+
+@pytest.fixture(autouse=True)
+def empty_index_cache():
+    flight_service._schedule_indexes.clear()
+    yield
+    flight_service._schedule_indexes.clear()
+
+
+async def _seed(*flights: tuple[str, str, str]) -> None:
+    fetched_at = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=1)
+    async with async_session_factory() as session:
+        session.add_all(
+            FlightSchedule(
+                origin_code="ICN", dest_code="NRT", airline_code=flight[:2], flight_iata=flight,
+                dep_time=dep, arr_time=arr, fetched_at=fetched_at,
+            )
+            for flight, dep, arr in flights
+        )
+        await session.commit()
+
+
+async def _resolve() -> flight_service._ScheduleIndex:
+    async with async_session_factory() as session:
+        service = FlightService(session)
+        _, _, version = await service._schedule_cache_state("ICN", "NRT")
+        return await service._resolve_schedules("ICN", "NRT", version, None, None)
+
+
+async def test_index_precomputes_lookups_and_durations(routes):
+    await _seed(
+        ("KE701", "09:00", "11:20"), ("KE703", "23:30", "01:45"), ("OZ102", "08:00", "10:20"),
+    )
+
+    index = await _resolve()
+
+    assert set(index.by_flight) == {"KE701", "KE703", "OZ102"}
+    assert index.by_flight["KE703"].duration_minutes == 135  # arrives the next day
+    assert index.by_airline["OZ"].flight_iata == "OZ102"
+    assert index.by_airline["KE"].flight_iata in {"KE701", "KE703"}
+    with pytest.raises(TypeError):
+        index.by_flight["KE999"] = index.by_flight["KE701"]  # shared across requests: read-only
+
+
+async def test_unchanged_rows_reuse_the_shared_index(routes):
+    await _seed(("KE701", "09:00", "11:20"))
+
+    first = await _resolve()
+    second = await _resolve()
+    await _seed(("OZ102", "08:00", "10:20"))
+    third = await _resolve()
+
+    assert second is first
+    assert third is not first
+    assert set(third.by_flight) == {"KE701", "OZ102"}
+
+
+async def test_route_without_schedules_has_an_empty_index(routes):
+    index = await _resolve()
+
+    assert not index
+    assert index.route_duration_minutes is None
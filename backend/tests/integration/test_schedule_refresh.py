@@ -0,0 +1,167 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.db.session import async_session_factory
+from app.models.flight_schedule import FlightSchedule
+from app.services import flight_service
+from app.services.flight_service import FlightService
+
+
+def _entries(*flights: str) -> list[dict]:
+    return [
+        {
+            "flight_iata": flight, "airline_iata": flight[:2],
+            "dep_time": "2026-11-02 09:00", "arr_time": "2026-11-02 11:20",
+        }
+        for flight in flights
+    ]
+
+
+async def _stored_flights(dest: str = "NRT") -> set[str]:
+    async with async_session_factory() as session:
+        rows = await session.execute(
+            select(FlightSchedule.flight_iata).where(
+                FlightSchedule.origin_code == "ICN", FlightSchedule.dest_code == dest,
+            )
+        )
+        return set(rows.scalars())
+
+
+async def test_concurrent_refreshes_leave_one_consistent_schedule_set(routes, monkeypatch):
+    fetched = {
+        "airlabs": _entries("KE701", "KE703", "KE705"),
+        "aviationstack": _entries("OZ101", "OZ103"),
+    }
+    providers = iter(fetched)
+
+    async def fetch(origin, dest, target_date, avstack_prefetch=None):
+        return fetched[next(providers)]
+
+    monkeypatch.setattr(flight_service, "_fetch_schedule_entries", fetch)
+
+    await asyncio.gather(
+        flight_service._refresh_schedules("ICN", "NRT", None),
+        flight_service._refresh_schedules("ICN", "NRT", None),
+    )
+
+    stored = await _stored_flights()
+    assert stored in [{entry["flight_iata"] for entry in raw} for raw in fetched.values()]
+
+
+async def test_refresh_does_not_join_an_open_request_transaction(routes, monkeypatch):
+    async def fetch(origin, dest, target_date, avstack_prefetch=None):
+        return _entries("KE701")
+
+    monkeypatch.setattr(flight_service, "_fetch_schedule_entries", fetch)
+
+    async with async_session_factory() as request:
+        request.add(FlightSchedule(
+            origin_code="ICN", dest_code="BKK", airline_code="OZ",
+            flight_iata="OZ741", dep_time="07:00", arr_time="09:00",
+        ))
+        await request.flush()
+        refresh = asyncio.create_task(flight_service._refresh_schedules("ICN", "NRT", None))
+        await asyncio.sleep(0.2)
+        # The request fails: its row must not have been committed by the refresh
+        await request.rollback()
+    await refresh
+
+    assert await _stored_flights("NRT") == {"KE701"}
+    assert await _stored_flights("BKK") == set()
+
+
+async def _seed_schedules(age_hours: int) -> None:
+    fetched_at = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=age_hours)
+    async with async_session_factory() as session:
+        session.add(FlightSchedule(
+            origin_code="ICN", dest_code="NRT", airline_code="OZ", flight_iata="OZ102",
+            dep_time="08:00", arr_time="10:20", fetched_at=fetched_at,
+        ))
+        await session.commit()
+
+
+@pytest.mark.parametrize(("age_hours", "fresh"), [(2, True), (30, False)])
+async def test_schedule_cache_state_reports_staleness(routes, age_hours, fresh):
+    await _seed_schedules(age_hours)
+
+    async with async_session_factory() as session:
+        airlines, is_fresh, version = await FlightService(session)._schedule_cache_state(
+            "ICN", "NRT",
+        )
+
+    assert (airlines, is_fresh, version[0]) == ({"OZ"}, fresh, 1)
+
+
+async def test_background_refresh_runs_once_per_route(routes, monkeypatch):
+    await _seed_schedules(age_hours=30)
+    release = asyncio.Event()
+    fetches: list[tuple[str, str]] = []
+
+    async def fetch(origin, dest, target_date, avstack_prefetch=None):
+        fetches.append((origin, dest))
+        await release.wait()
+        return _entries("KE701")
+
+    monkeypatch.setattr(flight_service, "_fetch_schedule_entries", fetch)
+
+    for _ in range(3):
+        flight_service._refresh_schedules_in_background("ICN", "NRT", None)
+    task = flight_service._schedule_refreshes[("ICN", "NRT")]
+    # The stale rows keep serving until the refresh replaces them
+    assert await _stored_flights() == {"OZ102"}
+
+    release.set()
+    await task
+    await asyncio.sleep(0)
+
+    assert fetches == [("ICN", "NRT")]
+    assert ("ICN", "NRT") not in flight_service._schedule_refreshes
+    assert await _stored_flights() == {"KE701"}
+
+
+async def test_empty_refresh_keeps_the_stale_cache(routes, monkeypatch):
+    await _seed_schedules(age_hours=30)
+
+    async def fetch(origin, dest, target_date, avstack_prefetch=None):
+        return []
+
+    monkeypatch.setattr(flight_service, "_fetch_schedule_entries", fetch)
+
+    async with async_session_factory() as session:
+        assert await FlightService(session).refresh_schedules("ICN", "NRT") == 0
+
+    assert await _stored_flights() == {"OZ102"}
+
+
+_UNUSABLE_ENTRIES = [
+    {"flight_iata": "", "airline_iata": "KE", "dep_time": "09:00", "arr_time": "11:20"},
+    {"flight_iata": "KE701", "airline_iata": "K", "dep_time": "09:00", "arr_time": "11:20"},
+    {"flight_iata": "KE703", "airline_iata": "KE", "dep_time": "soon", "arr_time": "11:20"},
+]
+
+
+async def test_refresh_with_only_unusable_entries_keeps_the_stale_cache(routes, monkeypatch):
+    await _seed_schedules(age_hours=30)
+
+    async def fetch(origin, dest, target_date, avstack_prefetch=None):
+        return list(_UNUSABLE_ENTRIES)
+
+    monkeypatch.setattr(flight_service, "_fetch_schedule_entries", fetch)
+
+    async with async_session_factory() as session:
+        assert await FlightService(session).refresh_schedules("ICN", "NRT") == 0
+
+    assert await _stored_flights() == {"OZ102"}
+
+
+async def test_store_with_only_unusable_entries_serves_the_stale_cache(routes):
+    await _seed_schedules(age_hours=30)
+
+    async with async_session_factory() as session:
+        stored = await FlightService(session)._store_schedules("ICN", "NRT", _UNUSABLE_ENTRIES)
+
+    assert [s.flight_iata for s in stored] == ["OZ102"]
+    assert await _stored_flights() == {"OZ102"}
@@ -0,0 +1,145 @@
+from datetime import date, datetime
+
+from sqlalchemy import Integer, MetaData, Numeric, PrimaryKeyConstraint, inspect, text
+
+from app.db import schema
+from app.db.session import engine, storage
+from app.models import Base
+
+
+def _index_names(conn) -> set[str]:
+    inspector = inspect(conn)
+    return {
+        index["name"]
+        for table in inspector.get_table_names()
+        for index in inspector.get_indexes(table)
+    }
+
+
+async def test_ensure_schema_drops_obsolete_indexes(db):
+    async with engine.begin() as conn:
+        # Recreate the indexes as older databases still have them
+        for name, table, columns in (
+            ("idx_schedule_route", "flight_schedules", "origin_code, dest_code"),
+            ("idx_fp_route_depart_cabin", "flight_prices", "route_id, departure_date, cabin_class"),
+            ("idx_fp_route_depart", "flight_prices", "route_id, departure_date"),
+            ("idx_fp_airline_route", "flight_prices", "airline_code, route_id"),
+            ("idx_rmp_origin_month_price", "route_min_prices",
+             "origin_code, departure_month, cabin_class, min_price"),
+        ):
+            await conn.exec_driver_sql(f"CREATE INDEX {name} ON {table} ({columns})")
+        assert set(schema._OBSOLETE_INDEXES) <= await conn.run_sync(_index_names)
+
+        await conn.run_sync(schema.ensure_schema, storage)
+
+        indexes = await conn.run_sync(_index_names)
+    assert not indexes & set(schema._OBSOLETE_INDEXES)
+    assert {"idx_fp_route_time", "idx_fp_latest_per_airline"} <= indexes
+
+
+def _create_numeric_price_tables(conn) -> None:
+    """Recreate the price tables as older databases had them: NUMERIC major units."""
+    old = MetaData()
+    for table in Base.metadata.sorted_tables:
+        table.to_metadata(old)
+    for table_name, (columns, _) in schema._MINOR_UNIT_PRICE_COLUMNS.items():
+        Base.metadata.tables[table_name].drop(conn)
+        table = old.tables[table_name]
+        for name in columns:
+            table.c[name].type = Numeric(12, 2)
+        table.indexes.clear()
+    old.create_all(conn, tables=[old.tables[name] for name in schema._MINOR_UNIT_PRICE_COLUMNS])
+
+
+async def test_ensure_schema_converts_numeric_prices_to_minor_units(routes):
+    observed = datetime(2026, 10, 18, 9, 0)
+    departure = date(2026, 11, 14)
+    async with engine.begin() as conn:
+        await conn.run_sync(_create_numeric_price_tables)
+        for airline, price, currency in (("KE", 300000.00, "KRW"), ("OZ", 249.99, "usd")):
+            await conn.execute(text(
+                "INSERT INTO flight_prices (time, route_id, airline_code, departure_date, "
+                "cabin_class, price_amount, currency, stops, source) VALUES "
+                "(:time, 1, :airline, :departure, 'ECONOMY', :price, :currency, 0, 'travelpayouts')"
+            ), {"time": observed, "airline": airline, "departure": departure,
+                "price": price, "currency": currency})
+        await conn.execute(text(
+            "INSERT INTO predictions (route_id, departure_date, cabin_class, predicted_price, "
+            "confidence_low, confidence_high, price_direction, model_version, predicted_at, "
+            "valid_until) VALUES (1, :departure, 'ECONOMY', 310000.5, NULL, 350000, 'UP', 'v1', "
+            ":observed, :observed)"
+        ), {"departure": departure, "observed": observed})
+        await conn.execute(text(
+            "INSERT INTO route_min_prices (route_id, departure_month, cabin_class, origin_code, "
+            "dest_code, min_price, currency, airline_code, departure_date, observed_at, "
+            "updated_at) VALUES (2, '2026-11', 'ECONOMY', 'ICN', 'BKK', 250.00, 'USD', 'OZ', "
+            ":departure, :observed, :observed)"
+        ), {"departure": departure, "observed": observed})
+
+        await conn.run_sync(schema.ensure_schema, storage)
+
+        prices = (await conn.execute(text(
+            "SELECT airline_code, price_amount, typeof(price_amount) FROM flight_prices "
+            "ORDER BY airline_code"
+        ))).all()
+        prediction = (await conn.execute(text(
+            "SELECT predicted_price, confidence_low, confidence_high FROM predictions"
+        ))).one()
+        min_price = await conn.scalar(text("SELECT min_price FROM route_min_prices"))
+        column_types = await conn.run_sync(lambda sync_conn: {
+            (table, column["name"]): column["type"]
+            for table in schema._MINOR_UNIT_PRICE_COLUMNS
+            for column in inspect(sync_conn).get_columns(table)
+        })
+        indexes = await conn.run_sync(_index_names)
+
+    assert prices == [("KE", 300_000, "integer"), ("OZ", 24_999, "integer")]
+    assert tuple(prediction) == (310_001, None, 350_000)
+    assert min_price == 25_000
+    for table, (columns, _) in schema._MINOR_UNIT_PRICE_COLUMNS.items():
+        for name in columns:
+            assert isinstance(column_types[table, name], Integer), (table, name)
+    # Indexes dropped with the rebuilt tables are back
+    assert {"idx_fp_latest_per_airline", "idx_rmp_origin_month_currency_price"} <= indexes
+
+
+def _create_min_prices_without_currency_key(conn) -> None:
+    """Recreate route_min_prices as older databases had it: keyed without currency."""
+    old = MetaData()
+    for table in Base.metadata.sorted_tables:
+        table.to_metadata(old)
+    Base.metadata.tables["route_min_prices"].drop(conn)
+    table = old.tables["route_min_prices"]
+    table.c.currency.primary_key = False
+    table.append_constraint(PrimaryKeyConstraint("route_id", "departure_month", "cabin_class"))
+    table.create(conn)
+
+
+async def test_ensure_schema_adds_currency_to_the_min_price_key(routes):
+    observed = datetime(2026, 10, 18, 9, 0)
+    insert = text(
+        "INSERT INTO route_min_prices (route_id, departure_month, cabin_class, origin_code, "
+        "dest_code, min_price, currency, airline_code, departure_date, observed_at, "
+        "updated_at) VALUES (1, '2026-11', 'ECONOMY', 'ICN', 'NRT', :price, :currency, 'KE', "
+        ":departure, :observed, :observed)"
+    )
+    params = {"departure": date(2026, 11, 14), "observed": observed}
+    async with engine.begin() as conn:
+        await conn.run_sync(_create_min_prices_without_currency_key)
+        await conn.execute(insert, {**params, "price": 300_000, "currency": "KRW"})
+
+        await conn.run_sync(schema.ensure_schema, storage)
+
+        key = await conn.run_sync(
+            lambda sync_conn: inspect(sync_conn).get_pk_constraint("route_min_prices")
+        )
+        # The same route, month and cabin can now hold a fare per currency
+        await conn.execute(insert, {**params, "price": 25_000, "currency": "USD"})
+        rows = (await conn.execute(text(
+            "SELECT currency, min_price FROM route_min_prices ORDER BY currency"
+        ))).all()
+        indexes = await conn.run_sync(_index_names)
+
+    assert key["constrained_columns"] == ["route_id", "departure_month", "cabin_class", "currency"]
+    assert rows == [("KRW", 300_000), ("USD", 25_000)]
+    assert "idx_rmp_origin_month_currency_price" in indexes
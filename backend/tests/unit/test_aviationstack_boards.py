@@ -0,0 +1,105 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+
+import httpx
+import pytest
+
+from app.core.ratelimit import RateLimiter
+from app.services import flight_service
+
+_BOARD = {"data": [
+    {
+        "departure": {"scheduledTime": "09:00", "terminal": "1"},
+        "arrival": {"iataCode": "nrt", "scheduledTime": "11:20"},
+        "flight": {"iataNumber": "7c1102"}, "airline": {"iataCode": "7c"},
+    },
+    {
+        "departure": {"scheduledTime": "10:05"},
+        "arrival": {"iataCode": "BKK", "scheduledTime": "14:10"},
+        "flight": {"iataNumber": "LJ003"}, "airline": {"iataCode": "LJ"},
+    },
+    {   # no flight number: unusable for matching
+        "departure": {"scheduledTime": "12:00"},
+        "arrival": {"iataCode": "NRT", "scheduledTime": "14:20"},
+        "flight": {}, "airline": {"iataCode": "TW"},
+    },
+]}
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Serve Aviationstack from a mock transport; returns the requests it received."""
+    requests: list[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, content=json.dumps(_BOARD).encode())
+
+    @asynccontextmanager
+    async def client(provider):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as mock:
+            yield mock
+
+    monkeypatch.setattr(flight_service, "upstream_client", client)
+    monkeypatch.setattr(flight_service, "_aviationstack_limiter", RateLimiter("test", 4))
+    flight_service._aviationstack_boards.clear()
+    yield requests
+    flight_service._aviationstack_boards.clear()
+
+
+@pytest.fixture
+def aviationstack() -> flight_service.AviationstackClient:
+    client = flight_service.AviationstackClient()
+    client.api_key = "test-key"
+    return client
+
+
+async def test_destinations_from_one_airport_share_a_board(upstream, aviationstack):
+    to_tokyo, to_bangkok = await asyncio.gather(
+        aviationstack.fetch_schedules("ICN", "NRT"),
+        aviationstack.fetch_schedules("ICN", "BKK"),
+    )
+    again = await aviationstack.fetch_schedules("ICN", "NRT")
+
+    assert len(upstream) == 1
+    assert upstream[0].url.path.endswith("/timetable")
+    assert [(e["flight_iata"], e["airline_iata"], e["dep_time"]) for e in to_tokyo] == [
+        ("7C1102", "7C", "09:00"),
+    ]
+    assert [e["flight_iata"] for e in to_bangkok] == ["LJ003"]
+    assert again == to_tokyo
+
+
+async def test_far_departures_use_a_board_per_date(upstream, aviationstack):
+    far = date.today() + timedelta(days=30)
+
+    await aviationstack.fetch_schedules("ICN", "NRT", far)
+    await aviationstack.fetch_schedules("ICN", "NRT", far + timedelta(days=1))
+    await aviationstack.fetch_schedules("ICN", "BKK", far)
+
+    assert [(r.url.path.rsplit("/", 1)[-1], r.url.params["date"]) for r in upstream] == [
+        ("flightsFuture", far.isoformat()),
+        ("flightsFuture", (far + timedelta(days=1)).isoformat()),
+    ]
+
+
+async def test_failed_fetches_are_not_cached(monkeypatch, upstream, aviationstack):
+    statuses = iter([500, 200])
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        upstream.append(request)
+        return httpx.Response(next(statuses), content=json.dumps(_BOARD).encode())
+
+    @asynccontextmanager
+    async def client(provider):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as mock:
+            yield mock
+
+    monkeypatch.setattr(flight_service, "upstream_client", client)
+
+    assert await aviationstack.fetch_schedules("ICN", "NRT") == []
+    assert len(await aviationstack.fetch_schedules("ICN", "NRT")) == 1
+    assert len(upstream) == 2
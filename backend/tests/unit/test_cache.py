@@ -0,0 +1,73 @@
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock for the cache module."""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_least_recently_used_entry_is_evicted_when_full(clock):
+    cache: TTLCache[str, int] = TTLCache("test-lru", maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+
+    cache.set("c", 3)
+
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size"] == 2
+
+
+def test_overwriting_a_key_refreshes_its_recency(clock):
+    cache: TTLCache[str, int] = TTLCache("test-overwrite", maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 10)
+
+    cache.set("c", 3)
+
+    assert (cache.get("a"), cache.get("b")) == (10, None)
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache: TTLCache[str, int] = TTLCache("test-ttl", maxsize=10, ttl_seconds=30)
+    cache.set("a", 1)
+
+    clock[0] += 29.9
+    assert cache.get("a") == 1
+    clock[0] += 0.1
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_reads_do_not_extend_the_ttl(clock):
+    cache: TTLCache[str, int] = TTLCache("test-ttl-read", maxsize=10, ttl_seconds=30)
+    cache.set("a", 1)
+
+    for _ in range(3):
+        clock[0] += 10
+        cache.get("a")
+
+    assert cache.get("a") is None
+
+
+def test_stats_count_hits_and_misses(clock):
+    cache: TTLCache[str, int] = TTLCache("test-stats", maxsize=10, ttl_seconds=30)
+    assert cache.stats()["hit_ratio"] is None
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+    cache.invalidate("a")
+    cache.get("a")
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (2, 2, 0.5)
+    assert stats in cache_module.all_cache_stats()
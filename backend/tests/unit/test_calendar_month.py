@@ -0,0 +1,65 @@
+import json
+from contextlib import asynccontextmanager
+from datetime import date
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from app.services import flight_service
+
+_MONTH = date(2026, 11, 1)
+_CALENDAR = {
+    "success": True, "currency": "krw",
+    "data": {"2026-11-03": {"price": 295000, "airline": "7C", "transfers": 0}},
+}
+_EMPTY_CALENDAR = {"success": True, "currency": "krw", "data": {}}
+_ERROR = {"success": False, "data": None, "error": "rate limit exceeded"}
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Answer calendar calls with the queued bodies; returns the queue and the requests seen."""
+    bodies: list[dict] = []
+    requests: list[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, content=json.dumps(bodies.pop(0)).encode())
+
+    @asynccontextmanager
+    async def client(provider):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as mock:
+            yield mock
+
+    monkeypatch.setattr(flight_service, "upstream_client", client)
+    flight_service._calendar_cache.clear()
+    yield bodies, requests
+    flight_service._calendar_cache.clear()
+
+
+async def test_error_payload_is_not_cached(upstream):
+    bodies, requests = upstream
+    bodies.extend([_ERROR, _CALENDAR])
+    tp = flight_service.TravelpayoutsClient()
+
+    assert await tp.fetch_calendar_month("ICN", "NRT", _MONTH) == {}
+    days = await tp.fetch_calendar_month("ICN", "NRT", _MONTH)
+
+    assert len(requests) == 2
+    assert [(d, p.price_amount, p.currency) for d, p in days.items()] == [
+        (date(2026, 11, 3), Decimal("295000"), "KRW"),
+    ]
+
+
+@pytest.mark.parametrize("body", [_CALENDAR, _EMPTY_CALENDAR], ids=["fares", "no-fares"])
+async def test_successful_response_is_cached(upstream, body):
+    bodies, requests = upstream
+    bodies.append(body)
+    tp = flight_service.TravelpayoutsClient()
+
+    first = await tp.fetch_calendar_month("ICN", "NRT", _MONTH)
+    second = await tp.fetch_calendar_month("ICN", "NRT", _MONTH)
+
+    assert len(requests) == 1
+    assert second == first
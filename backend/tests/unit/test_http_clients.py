@@ -0,0 +1,44 @@
+import asyncio
+import threading
+
+from app.core import http
+
+
+async def _client_for(provider: str):
+    async with http.upstream_client(provider) as client:
+        return client
+
+
+async def test_shared_client_is_reused_on_the_api_loop():
+    await http.open_clients()
+    try:
+        first = await _client_for("airlabs")
+        assert await _client_for("airlabs") is first
+        assert await _client_for("travelpayouts") is not first
+    finally:
+        await http.close_clients()
+
+    assert first.is_closed
+
+
+async def test_other_loops_get_a_short_lived_client():
+    await http.open_clients()
+    try:
+        shared = await _client_for("airlabs")
+        other: list = []
+        # The pipeline runs its own loop; a pooled client cannot cross loops
+        thread = threading.Thread(target=lambda: other.append(asyncio.run(_client_for("airlabs"))))
+        thread.start()
+        thread.join()
+    finally:
+        await http.close_clients()
+
+    assert other[0] is not shared
+    assert other[0].is_closed
+
+
+async def test_without_open_clients_each_call_gets_its_own():
+    client = await _client_for("aviationstack")
+
+    assert client.is_closed
+    assert await _client_for("aviationstack") is not client
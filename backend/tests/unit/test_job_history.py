@@ -0,0 +1,73 @@
+import pytest
+from pipeline import job_history
+
+
+@pytest.fixture
+def saved_runs(monkeypatch):
+    runs: list[dict] = []
+
+    async def save(job_name, started_at, duration_ms, status, counters, peak_rss_kb):
+        runs.append({"job": job_name, "status": status, **counters, "peak_rss_kb": peak_rss_kb})
+
+    monkeypatch.setattr(job_history, "_save_run", save)
+    return runs
+
+
+def _peaks(monkeypatch, *values):
+    readings = iter(values)
+    monkeypatch.setattr(job_history, "_peak_rss_kb", lambda: next(readings))
+
+
+async def test_records_counters_and_peak_rss_growth(monkeypatch, saved_runs):
+    _peaks(monkeypatch, 100_000, 130_000)
+
+    @job_history.record_job_run("collect_prices")
+    async def job() -> dict:
+        return {"status": "ok", "rows_in": 12, "rows_out": 10, "api_calls": 3}
+
+    assert await job() == {"status": "ok", "rows_in": 12, "rows_out": 10, "api_calls": 3}
+    assert saved_runs == [{
+        "job": "collect_prices", "status": "ok",
+        "rows_in": 12, "rows_out": 10, "api_calls": 3, "errors": 0,
+        "peak_rss_kb": 30_000,
+    }]
+
+
+async def test_job_below_an_earlier_peak_records_zero(monkeypatch, saved_runs):
+    # ru_maxrss is a lifetime high-water mark: a small job after a big one leaves it unchanged
+    _peaks(monkeypatch, 500_000, 500_000)
+
+    @job_history.record_job_run("check_alerts")
+    async def job() -> dict:
+        return {"status": "ok"}
+
+    await job()
+    assert saved_runs[0]["peak_rss_kb"] == 0
+
+
+async def test_failed_job_is_recorded_as_an_error_and_reraised(monkeypatch, saved_runs):
+    _peaks(monkeypatch, None, None)
+
+    @job_history.record_job_run("run_predictions")
+    async def job() -> dict:
+        raise RuntimeError("model error")
+
+    with pytest.raises(RuntimeError):
+        await job()
+    assert saved_runs == [{
+        "job": "run_predictions", "status": "error",
+        "rows_in": 0, "rows_out": 0, "api_calls": 0, "errors": 1,
+        "peak_rss_kb": None,
+    }]
+
+
+async def test_error_status_in_the_result_marks_the_run_failed(monkeypatch, saved_runs):
+    _peaks(monkeypatch, 1, 1)
+
+    @job_history.record_job_run("cleanup")
+    async def job() -> dict:
+        return {"status": "error", "errors": 2}
+
+    await job()
+    assert (saved_runs[0]["status"], saved_runs[0]["errors"]) == ("error", 2)
+
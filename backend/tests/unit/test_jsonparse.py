@@ -0,0 +1,37 @@
+import threading
+
+import pytest
+
+from app.config import settings
+from app.core.jsonparse import loads, loads_or_empty, run_parser
+
+
+def test_loads_accepts_bytes_and_str():
+    assert loads(b'{"data": [1, 2]}') == {"data": [1, 2]}
+    assert loads('{"data": "\\uc11c\\uc6b8"}') == {"data": "서울"}
+
+
+@pytest.mark.parametrize("payload", [b"", b"<html>502 Bad Gateway</html>", b'{"data": '])
+def test_empty_or_malformed_bodies_decode_to_an_empty_dict(payload):
+    assert loads_or_empty(payload) == {}
+
+
+def _parsing_thread(prefix: str) -> str:
+    return f"{prefix}:{threading.current_thread().name}"
+
+
+async def test_small_payloads_parse_on_the_event_loop_thread(monkeypatch):
+    monkeypatch.setattr(settings, "PARSE_OFFLOAD_MIN_BYTES", 1024)
+
+    result = await run_parser(100, _parsing_thread, "small")
+
+    assert result == f"small:{threading.current_thread().name}"
+
+
+async def test_large_payloads_parse_on_a_worker_thread(monkeypatch):
+    monkeypatch.setattr(settings, "PARSE_OFFLOAD_MIN_BYTES", 1024)
+
+    result = await run_parser(4096, _parsing_thread, prefix="large")
+
+    assert result.startswith("large:")
+    assert result != f"large:{threading.current_thread().name}"
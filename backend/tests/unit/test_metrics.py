@@ -0,0 +1,41 @@
+from app.core.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+
+def test_counter_and_gauge_render_labelled_series():
+    registry = MetricsRegistry()
+    counter = Counter("test_requests_total", "Requests.", ("cache", "result"))
+    gauge = Gauge("test_in_flight", "In flight.")
+    registry.register(counter)
+    registry.register(gauge)
+
+    counter.inc(cache="search", result="hit")
+    counter.inc(2, cache="search", result="hit")
+    counter.inc(cache='say "hi"\n', result="miss")
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+
+    assert registry.render().splitlines() == [
+        "# HELP test_requests_total Requests.",
+        "# TYPE test_requests_total counter",
+        'test_requests_total{cache="search",result="hit"} 3',
+        'test_requests_total{cache="say \\"hi\\"\\n",result="miss"} 1',
+        "# HELP test_in_flight In flight.",
+        "# TYPE test_in_flight gauge",
+        "test_in_flight 1",
+    ]
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("test_duration_seconds", "Latency.", ("operation",), buckets=(0.1, 1.0))
+
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value, operation="SELECT")
+
+    assert histogram.render()[2:] == [
+        'test_duration_seconds_bucket{operation="SELECT",le="0.1"} 1',
+        'test_duration_seconds_bucket{operation="SELECT",le="1"} 3',
+        'test_duration_seconds_bucket{operation="SELECT",le="+Inf"} 4',
+        'test_duration_seconds_sum{operation="SELECT"} 4.25',
+        'test_duration_seconds_count{operation="SELECT"} 4',
+    ]
@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+from pipeline import runtime
+
+
+async def _running_loop() -> asyncio.AbstractEventLoop:
+    return asyncio.get_running_loop()
+
+
+def test_jobs_share_one_persistent_loop():
+    try:
+        loop = runtime.run_sync(_running_loop())
+        assert runtime.run_sync(_running_loop()) is loop
+        assert loop.is_running()
+    finally:
+        runtime.shutdown()
+
+    assert loop.is_closed()
+
+
+def test_loop_restarts_after_shutdown():
+    try:
+        first = runtime.run_sync(_running_loop())
+        runtime.shutdown()
+        second = runtime.run_sync(_running_loop())
+        assert second is not first
+        assert second.is_running()
+    finally:
+        runtime.shutdown()
+
+
+def test_run_sync_propagates_job_errors():
+    async def fail() -> None:
+        raise ValueError("boom")
+
+    try:
+        with pytest.raises(ValueError, match="boom"):
+            runtime.run_sync(fail())
+    finally:
+        runtime.shutdown()
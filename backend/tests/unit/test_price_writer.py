@@ -0,0 +1,40 @@
+from datetime import date, datetime
+
+import pytest
+
+from app.config import settings
+from app.core.metrics import WRITE_BEHIND_PENDING, WRITE_BEHIND_ROWS
+from app.services import price_writer
+
+
+@pytest.fixture(autouse=True)
+def empty_queue():
+    price_writer._pending.clear()
+    yield
+    price_writer._pending.clear()
+
+
+def _row(hour: int) -> dict:
+    return {
+        "time": datetime(2026, 10, 19, hour), "route_id": 1, "airline_code": "KE",
+        "departure_date": date(2026, 11, 14), "cabin_class": "ECONOMY",
+        "price_amount": 300_000 + hour, "currency": "KRW", "source": "search",
+    }
+
+
+def test_full_queue_drops_the_oldest_rows(monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_WRITE_QUEUE_MAX", 3)
+    dropped = WRITE_BEHIND_ROWS.get(result="dropped")
+
+    price_writer.enqueue_prices([_row(1), _row(2)])
+    price_writer.enqueue_prices([_row(3), _row(4), _row(5)])
+
+    assert [row["time"].hour for row in price_writer._pending] == [3, 4, 5]
+    assert WRITE_BEHIND_ROWS.get(result="dropped") == dropped + 2
+    assert WRITE_BEHIND_PENDING.get() == 3
+
+
+def test_empty_batches_are_ignored():
+    price_writer.enqueue_prices([])
+
+    assert not price_writer._pending
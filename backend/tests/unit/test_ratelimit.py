@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import time
+
+from app.core.ratelimit import RateLimiter
+
+
+async def _timed_starts(limiter: RateLimiter, count: int, hold: float = 0.0) -> list[float]:
+    starts: list[float] = []
+
+    async def call() -> None:
+        async with limiter:
+            starts.append(time.monotonic())
+            await asyncio.sleep(hold)
+
+    await asyncio.gather(*(call() for _ in range(count)))
+    return starts
+
+
+def _gaps(starts: list[float]) -> list[float]:
+    ordered = sorted(starts)
+    return [later - earlier for earlier, later in zip(ordered, ordered[1:])]
+
+
+async def test_request_starts_are_spaced_by_the_minimum_interval():
+    limiter = RateLimiter("test-spacing", max_concurrent=5, min_interval=0.05)
+
+    starts = await _timed_starts(limiter, 4)
+
+    assert min(_gaps(starts)) >= 0.045
+
+
+async def test_concurrency_is_capped():
+    limiter = RateLimiter("test-cap", max_concurrent=2)
+    active = peak = 0
+
+    async def call() -> None:
+        nonlocal active, peak
+        async with limiter:
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*(call() for _ in range(6)))
+
+    assert peak == 2
+
+
+async def test_cancelled_wait_releases_the_slot():
+    limiter = RateLimiter("test-cancel", max_concurrent=1, min_interval=10)
+    async with limiter:
+        pass  # the next start is now 10 s away
+
+    waiter = asyncio.create_task(limiter.__aenter__())
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+
+    assert not limiter._semaphore().locked()
+
+
+def test_spacing_holds_across_event_loops():
+    # The API and the pipeline run separate loops but share one limiter per provider
+    limiter = RateLimiter("test-loops", max_concurrent=5, min_interval=0.05)
+    starts: list[float] = []
+
+    def run_loop() -> None:
+        starts.extend(asyncio.run(_timed_starts(limiter, 3)))
+
+    threads = [threading.Thread(target=run_loop) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(starts) == 6
+    assert min(_gaps(starts)) >= 0.045
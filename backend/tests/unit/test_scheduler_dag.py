@@ -0,0 +1,70 @@
+import pytest
+from pipeline.tasks import collect_prices, run_prediction, send_alerts
+
+from app import scheduler
+
+
+@pytest.fixture
+def job_calls(monkeypatch):
+    """Replace the prediction and alert tasks with recorders of the routes they get."""
+    calls: list[tuple[str, list[int] | None]] = []
+
+    def predict(route_ids=None):
+        calls.append(("run_predictions", route_ids))
+        return {"status": "ok"}
+
+    def alerts(route_ids=None):
+        calls.append(("check_alerts", route_ids))
+        return {"status": "ok"}
+
+    monkeypatch.setattr(run_prediction, "predict_all_active_sync", predict)
+    monkeypatch.setattr(send_alerts, "check_and_send_sync", alerts)
+    return calls
+
+
+def _collection_returns(monkeypatch, result):
+    monkeypatch.setattr(collect_prices, "collect_all_routes_sync", lambda: result)
+
+
+def test_collection_triggers_predictions_then_alerts_for_changed_routes(monkeypatch, job_calls):
+    _collection_returns(monkeypatch, {"status": "ok", "changed_route_ids": [3, 7]})
+
+    scheduler._run_collect_prices()
+
+    assert job_calls == [("run_predictions", [3, 7]), ("check_alerts", [3, 7])]
+
+
+def test_collection_without_changes_ends_the_chain(monkeypatch, job_calls):
+    _collection_returns(monkeypatch, {"status": "ok", "changed_route_ids": []})
+
+    scheduler._run_collect_prices()
+
+    assert job_calls == []
+
+
+def test_failed_collection_triggers_nothing(monkeypatch, job_calls):
+    def fail():
+        raise RuntimeError("upstream down")
+
+    monkeypatch.setattr(collect_prices, "collect_all_routes_sync", fail)
+
+    scheduler._run_collect_prices()
+
+    assert job_calls == []
+
+
+def test_interval_sweep_covers_all_routes(job_calls):
+    scheduler._run_predictions()
+
+    assert job_calls == [("run_predictions", None), ("check_alerts", None)]
+
+
+def test_alerts_still_run_when_predictions_fail(monkeypatch, job_calls):
+    def fail(route_ids=None):
+        raise RuntimeError("model error")
+
+    monkeypatch.setattr(run_prediction, "predict_all_active_sync", fail)
+
+    scheduler._run_predictions([5])
+
+    assert job_calls == [("check_alerts", [5])]
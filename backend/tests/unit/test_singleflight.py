@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from app.core.metrics import SINGLEFLIGHT_CALLS
+from app.core.singleflight import SingleFlight
+
+
+def _slow_call(calls: list[str], result: str, started: asyncio.Event | None = None):
+    async def fn() -> str:
+        calls.append(result)
+        if started is not None:
+            started.set()
+        await asyncio.sleep(0.05)
+        return result
+
+    return fn
+
+
+async def test_concurrent_calls_with_the_same_key_share_one_execution():
+    flight: SingleFlight[str, str] = SingleFlight("test-coalesce")
+    calls: list[str] = []
+    leaders = SINGLEFLIGHT_CALLS.get(name="test-coalesce", role="leader")
+    shared = SINGLEFLIGHT_CALLS.get(name="test-coalesce", role="shared")
+
+    results = await asyncio.gather(*(
+        flight.do("ICN-NRT", _slow_call(calls, "offers")) for _ in range(5)
+    ))
+
+    assert results == ["offers"] * 5
+    assert calls == ["offers"]
+    assert SINGLEFLIGHT_CALLS.get(name="test-coalesce", role="leader") == leaders + 1
+    assert SINGLEFLIGHT_CALLS.get(name="test-coalesce", role="shared") == shared + 4
+    assert flight.in_flight() == 0
+
+
+async def test_different_keys_run_separately():
+    flight: SingleFlight[str, str] = SingleFlight("test-keys")
+    calls: list[str] = []
+
+    results = await asyncio.gather(
+        flight.do("ICN-NRT", _slow_call(calls, "nrt")),
+        flight.do("ICN-BKK", _slow_call(calls, "bkk")),
+    )
+
+    assert results == ["nrt", "bkk"]
+    assert sorted(calls) == ["bkk", "nrt"]
+
+
+async def test_results_are_not_cached_after_the_call_finishes():
+    flight: SingleFlight[str, str] = SingleFlight("test-no-cache")
+    calls: list[str] = []
+
+    await flight.do("ICN-NRT", _slow_call(calls, "first"))
+    assert await flight.do("ICN-NRT", _slow_call(calls, "second")) == "second"
+    assert calls == ["first", "second"]
+
+
+async def test_cancelled_caller_does_not_cancel_the_shared_work():
+    flight: SingleFlight[str, str] = SingleFlight("test-shield")
+    calls: list[str] = []
+    started = asyncio.Event()
+
+    leader = asyncio.create_task(flight.do("ICN-NRT", _slow_call(calls, "offers", started)))
+    await started.wait()
+    follower = asyncio.create_task(flight.do("ICN-NRT", _slow_call(calls, "unused")))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+    assert await follower == "offers"
+    assert calls == ["offers"]
+
+
+async def test_work_finishes_even_if_every_caller_is_cancelled():
+    flight: SingleFlight[str, str] = SingleFlight("test-detached")
+    calls: list[str] = []
+    started = asyncio.Event()
+
+    caller = asyncio.create_task(flight.do("ICN-NRT", _slow_call(calls, "offers", started)))
+    await started.wait()
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    assert flight.in_flight() == 1
+
+    await asyncio.sleep(0.1)
+    assert flight.in_flight() == 0
+
+
+async def test_errors_reach_every_waiter():
+    flight: SingleFlight[str, str] = SingleFlight("test-errors")
+    calls: list[str] = []
+
+    async def fail() -> str:
+        calls.append("fail")
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(
+        flight.do("ICN-NRT", fail), flight.do("ICN-NRT", fail), return_exceptions=True,
+    )
+
+    assert [str(exc) for exc in results] == ["upstream down", "upstream down"]
+    assert calls == ["fail"]
+    assert flight.in_flight() == 0
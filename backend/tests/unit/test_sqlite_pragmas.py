@@ -0,0 +1,72 @@
+import sqlite3
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+
+from app.config import settings
+from app.db.storage import SQLITE_PROFILES, SQLiteBackend, sqlite_pragmas
+
+
+def test_size_overrides_replace_the_profile_values(monkeypatch):
+    monkeypatch.setattr(settings, "SQLITE_CACHE_SIZE_KB", 8192)
+    monkeypatch.setattr(settings, "SQLITE_MMAP_SIZE_MB", 64)
+
+    pragmas = sqlite_pragmas("throughput")
+
+    assert pragmas["cache_size"] == -8192
+    assert pragmas["mmap_size"] == 64 * 1024 * 1024
+    assert pragmas["wal_autocheckpoint"] == SQLITE_PROFILES["throughput"]["wal_autocheckpoint"]
+    assert SQLITE_PROFILES["throughput"]["cache_size"] == -65536  # profile left untouched
+
+
+def _pragma(conn: sqlite3.Connection, name: str):
+    return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+def test_connections_get_the_profile_pragmas(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "SQLITE_PROFILE", "balanced")
+    backend = SQLiteBackend(make_url(f"sqlite+aiosqlite:///{tmp_path}/app.db"))
+    conn = sqlite3.connect(tmp_path / "app.db")
+    try:
+        backend.configure_connection(conn, read_only=False)
+
+        assert _pragma(conn, "journal_mode") == "wal"
+        assert _pragma(conn, "synchronous") == 1  # NORMAL
+        assert _pragma(conn, "cache_size") == -16384
+        assert _pragma(conn, "temp_store") == 2  # MEMORY
+        assert _pragma(conn, "busy_timeout") == 5000
+        assert _pragma(conn, "foreign_keys") == 1
+        assert _pragma(conn, "query_only") == 0
+    finally:
+        conn.close()
+
+
+def test_read_only_connections_are_query_only(tmp_path):
+    backend = SQLiteBackend(make_url(f"sqlite+aiosqlite:///{tmp_path}/app.db"))
+    conn = sqlite3.connect(tmp_path / "app.db")
+    try:
+        backend.configure_connection(conn, read_only=True)
+
+        assert _pragma(conn, "query_only") == 1
+    finally:
+        conn.close()
+
+
+def test_optimize_runs_on_a_populated_database(tmp_path):
+    backend = SQLiteBackend(make_url(f"sqlite+aiosqlite:///{tmp_path}/app.db"))
+    engine = create_engine(f"sqlite:///{tmp_path}/app.db")
+    try:
+        with engine.begin() as conn:
+            conn.exec_driver_sql("CREATE TABLE prices (route_id INTEGER, price INTEGER)")
+            conn.exec_driver_sql("CREATE INDEX idx_prices_route ON prices (route_id)")
+            conn.exec_driver_sql(
+                "WITH RECURSIVE n(v) AS (SELECT 1 UNION ALL SELECT v + 1 FROM n WHERE v < 500) "
+                "INSERT INTO prices SELECT v % 10, v FROM n"
+            )
+            conn.exec_driver_sql("SELECT * FROM prices WHERE route_id = 3").all()
+            backend.optimize(conn)
+            stats = conn.exec_driver_sql("SELECT tbl, idx FROM sqlite_stat1").all()
+    finally:
+        engine.dispose()
+
+    assert ("prices", "idx_prices_route") in stats
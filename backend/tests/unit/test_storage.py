@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import StaticPool
+
+from app.db import storage
+from app.db.storage import PostgresBackend, SQLiteBackend, get_storage_backend
+
+
+def test_backend_follows_the_url_scheme(tmp_path):
+    backend = get_storage_backend(f"sqlite+aiosqlite:///{tmp_path}/data/app.db")
+
+    assert isinstance(backend, SQLiteBackend)
+    assert (tmp_path / "data").is_dir()
+    assert backend is get_storage_backend(f"sqlite+aiosqlite:///{tmp_path}/data/app.db")
+
+
+def test_unsupported_database_is_rejected():
+    with pytest.raises(ValueError, match="Unsupported database 'mysql'"):
+        get_storage_backend("mysql+aiomysql://user@localhost/farenheit")
+
+
+def test_sqlite_writer_is_one_static_connection(tmp_path):
+    backend = SQLiteBackend(make_url(f"sqlite+aiosqlite:///{tmp_path}/app.db"))
+
+    assert backend.writer_options() == {"poolclass": StaticPool}
+    assert backend.separate_readers
+    assert backend.pool_options(4, 2) == {"pool_size": 4, "max_overflow": 2}
+
+
+def test_in_memory_sqlite_has_no_separate_readers():
+    assert not SQLiteBackend(make_url("sqlite+aiosqlite://")).separate_readers
+
+
+def test_postgres_needs_the_asyncpg_driver(monkeypatch):
+    with pytest.raises(ValueError, match="postgresql\\+asyncpg"):
+        PostgresBackend(make_url("postgresql+psycopg://localhost/farenheit"))
+
+    monkeypatch.setattr(storage.importlib.util, "find_spec", lambda name: None)
+    with pytest.raises(RuntimeError, match="postgres' extra"):
+        PostgresBackend(make_url("postgresql+asyncpg://localhost/farenheit"))
+
+
+def test_postgres_sessions_are_pinned_to_utc_and_readers_are_read_only(monkeypatch):
+    monkeypatch.setattr(storage.importlib.util, "find_spec", lambda name: object())
+    backend = PostgresBackend(make_url("postgresql+asyncpg://localhost/farenheit"))
+
+    writer = backend.writer_options()
+    reader = backend.pool_options(4, 2, read_only=True)
+
+    assert writer["connect_args"] == {"server_settings": {"timezone": "UTC"}}
+    assert reader["pool_size"] == 4 and reader["pool_pre_ping"]
+    assert reader["connect_args"]["server_settings"] == {
+        "timezone": "UTC", "default_transaction_read_only": "on",
+    }
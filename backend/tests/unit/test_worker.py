@@ -0,0 +1,28 @@
+import os
+import signal
+import threading
+
+from pipeline import worker
+
+from app import scheduler
+
+
+def test_worker_runs_the_scheduler_until_sigterm(monkeypatch):
+    calls = []
+    monkeypatch.setattr(worker.runtime, "run_sync", lambda coro: coro.close())
+    monkeypatch.setattr(scheduler, "start_scheduler", lambda: calls.append("start"))
+    monkeypatch.setattr(
+        scheduler, "stop_scheduler", lambda wait=False: calls.append(("stop", wait))
+    )
+    handlers = {sig: signal.getsignal(sig) for sig in (signal.SIGINT, signal.SIGTERM)}
+    timer = threading.Timer(0.1, os.kill, (os.getpid(), signal.SIGTERM))
+    try:
+        timer.start()
+        worker.main()
+    finally:
+        timer.cancel()
+        for sig, handler in handlers.items():
+            signal.signal(sig, handler)
+
+    # In-flight jobs are waited for, so their commits are not cut off
+    assert calls == ["start", ("stop", True)]
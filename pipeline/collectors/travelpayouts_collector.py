@@ -24,6 +24,9 @@ class TravelpayoutsCollector(AbstractCollector):
     def __init__(self) -> None:
         self.base_url = pipeline_settings.TRAVELPAYOUTS_BASE_URL
         self.token = pipeline_settings.TRAVELPAYOUTS_TOKEN
+        # Per-instance request counters (reported in job-run history)
+        self.api_calls = 0
+        self.failed_calls = 0
 
     async def collect(
         self,
@@ -47,6 +50,7 @@ class TravelpayoutsCollector(AbstractCollector):
         # results when return_date is included. Use response's return_at instead.
 
         for attempt in range(max_retries):
+            self.api_calls += 1
             try:
                 async with httpx.AsyncClient(timeout=_COLLECT_TIMEOUT) as client:
                     response = await client.get(
@@ -58,6 +62,7 @@ class TravelpayoutsCollector(AbstractCollector):
                     try:
                         data = response.json()
                     except Exception as e:
+                        self.failed_calls += 1
                         logger.warning(f"Failed to parse JSON response (attempt {attempt + 1}/{max_retries}): {e}")
                         continue
                     if data.get("success"):
@@ -78,13 +83,16 @@ class TravelpayoutsCollector(AbstractCollector):
                                     logger.warning(f"Failed to parse offer: {e}")
                     return observations
                 elif response.status_code == 429:
+                    self.failed_calls += 1
                     logger.warning("Travelpayouts rate limit reached")
                     return observations  # Don't retry rate limits
                 else:
+                    self.failed_calls += 1
                     logger.warning(
                         f"Travelpayouts API error: {response.status_code} (attempt {attempt + 1}/{max_retries})"
                     )
             except (httpx.HTTPError, httpx.TimeoutException) as e:
+                self.failed_calls += 1
                 logger.warning(f"Travelpayouts request failed (attempt {attempt + 1}/{max_retries}): {e}")
 
             if attempt < max_retries - 1:
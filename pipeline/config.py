@@ -7,8 +7,10 @@ DB_PATH = PROJECT_ROOT / "data" / "farenheit.db"
 
 
 class PipelineSettings(BaseSettings):
-    # Database (SQLite)
+    # Database: SQLite by default, or postgresql+asyncpg://...
     DATABASE_URL: str = f"sqlite+aiosqlite:///{DB_PATH}"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 5
 
     # Travelpayouts API
     TRAVELPAYOUTS_TOKEN: str = ""
@@ -4,27 +4,43 @@ from typing import Any
 
 from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.pool import NullPool
 
-from pipeline.config import pipeline_settings, DB_PATH
+from app.db.storage import get_storage_backend
+from pipeline.config import pipeline_settings
 
-# Ensure data directory exists
-DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+# Same instance as the API's when both use the same DATABASE_URL
+_storage = get_storage_backend(pipeline_settings.DATABASE_URL)
 
-# NullPool: no connection reuse across event loops.
-# Required because BackgroundScheduler threads call asyncio.run() which creates
-# a new event loop each time, making pooled connections loop-unsafe.
-_engine = create_async_engine(pipeline_settings.DATABASE_URL, poolclass=NullPool)
+# Pooled connections are reused across jobs. This is loop-safe because every
+# pipeline coroutine runs on the single persistent loop in pipeline.runtime.
+_engine = create_async_engine(
+    pipeline_settings.DATABASE_URL,
+    **_storage.pool_options(pipeline_settings.DB_POOL_SIZE, pipeline_settings.DB_MAX_OVERFLOW),
+)
 
 
-# Enable SQLite foreign key enforcement on every connection
 @event.listens_for(_engine.sync_engine, "connect")
-def _set_sqlite_pragma(dbapi_connection: Any, connection_record: Any) -> None:
-    cursor = dbapi_connection.cursor()
-    cursor.execute("PRAGMA foreign_keys=ON")
-    cursor.execute("PRAGMA journal_mode=WAL")
-    cursor.execute("PRAGMA busy_timeout=5000")
-    cursor.close()
+def _configure_connection(dbapi_connection: Any, connection_record: Any) -> None:
+    _storage.configure_connection(dbapi_connection, read_only=False)
 
 
 session_factory = async_sessionmaker(_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def create_tables() -> None:
+    """Create any missing tables and indexes (the worker may start before the API)."""
+    from app.db.schema import ensure_schema
+
+    async with _engine.begin() as conn:
+        await conn.run_sync(ensure_schema, _storage)
+
+
+async def optimize_database() -> None:
+    """Refresh planner statistics where the backend needs it (PRAGMA optimize on SQLite)."""
+    async with _engine.begin() as conn:
+        await conn.run_sync(_storage.optimize)
+
+
+async def dispose_engine() -> None:
+    """Close pooled connections (must run on the loop that opened them)."""
+    await _engine.dispose()
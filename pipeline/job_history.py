@@ -0,0 +1,102 @@
+"""Job-run history - records timing and throughput of each pipeline task run.
+
+Memory is recorded as how far a run raised the process's peak RSS. ru_maxrss
+is a high-water mark for the whole process lifetime, so in the long-running
+worker or API process it cannot give one job's own peak: the growth is a
+lower bound on it (0 when an earlier run already peaked higher).
+"""
+
+import functools
+import logging
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from typing import ParamSpec
+
+from pipeline.db import session_factory as _session_factory
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec("P")
+
+# Result-dict keys a task may report; missing keys are recorded as 0
+_COUNTER_KEYS = ("rows_in", "rows_out", "api_calls", "errors")
+
+
+def _peak_rss_kb() -> int | None:
+    """Peak resident set size of this process so far (lifetime high-water mark), in KB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+async def _save_run(
+    job_name: str,
+    started_at: datetime,
+    duration_ms: int,
+    status: str,
+    counters: dict[str, int],
+    peak_rss_kb: int | None,
+) -> None:
+    from app.models.job_run import JobRun
+
+    try:
+        async with _session_factory() as session:
+            session.add(JobRun(
+                job_name=job_name,
+                started_at=started_at,
+                duration_ms=duration_ms,
+                status=status,
+                peak_rss_kb=peak_rss_kb,
+                **counters,
+            ))
+            await session.commit()
+    except Exception as e:
+        # History is best-effort; never fail the job because of it
+        logger.warning(f"Failed to record job run for {job_name}: {e}")
+
+
+def record_job_run(
+    job_name: str,
+) -> Callable[[Callable[P, Awaitable[dict]]], Callable[P, Awaitable[dict]]]:
+    """Decorate an async task so every run is stored in the job_runs table.
+
+    The task's result dict supplies status and the rows_in / rows_out /
+    api_calls / errors counters. A raised exception is recorded as an error run.
+    """
+
+    def decorator(fn: Callable[P, Awaitable[dict]]) -> Callable[P, Awaitable[dict]]:
+        @functools.wraps(fn)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> dict:
+            started_at = datetime.now(timezone.utc).replace(tzinfo=None)
+            start = time.monotonic()
+            start_peak = _peak_rss_kb()
+            result: dict | None = None
+            try:
+                result = await fn(*args, **kwargs)
+                return result
+            finally:
+                duration_ms = int((time.monotonic() - start) * 1000)
+                if result is None:
+                    status, counters = "error", {key: 0 for key in _COUNTER_KEYS}
+                    counters["errors"] = 1
+                else:
+                    status = "error" if result.get("status") == "error" else "ok"
+                    counters = {key: int(result.get(key, 0)) for key in _COUNTER_KEYS}
+                end_peak = _peak_rss_kb()
+                rss_growth = None
+                if start_peak is not None and end_peak is not None:
+                    rss_growth = max(end_peak - start_peak, 0)
+                await _save_run(job_name, started_at, duration_ms, status, counters, rss_growth)
+
+        return wrapper
+
+    return decorator
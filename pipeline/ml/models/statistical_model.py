@@ -6,7 +6,6 @@ and day-of-week seasonality to generate price predictions.
 
 import logging
 from datetime import timedelta
-from decimal import Decimal
 
 import numpy as np
 import pandas as pd
@@ -54,8 +53,9 @@ class StatisticalPredictor:
             forecast_days: Days ahead to forecast
 
         Returns:
-            dict with predicted_price, confidence_low, confidence_high,
-            price_direction, confidence_score, forecast_series
+            dict with predicted_price, confidence_low, confidence_high
+            (whole numbers in the unit of price_amount), price_direction,
+            confidence_score, forecast_series
         """
         if price_history.empty or len(price_history) < 3:
             return None
@@ -196,9 +196,9 @@ class StatisticalPredictor:
         mid = forecast_series[-1]
 
         return {
-            "predicted_price": Decimal(str(max(int(mid["predicted_price"]), 0))),
-            "confidence_low": Decimal(str(max(int(mid["confidence_low"]), 0))),
-            "confidence_high": Decimal(str(max(int(mid["confidence_high"]), 0))),
+            "predicted_price": max(int(mid["predicted_price"]), 0),
+            "confidence_low": max(int(mid["confidence_low"]), 0),
+            "confidence_high": max(int(mid["confidence_high"]), 0),
             "price_direction": direction,
             "confidence_score": confidence,
             "forecast_series": forecast_series,
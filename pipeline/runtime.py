@@ -0,0 +1,79 @@
+"""Persistent event loop for pipeline jobs.
+
+Scheduler threads submit coroutines to one long-lived loop running in a daemon
+thread instead of calling asyncio.run() per job, so pooled DB connections in
+pipeline.db stay bound to a single loop and are reused across runs.
+"""
+
+import asyncio
+import logging
+import threading
+from collections.abc import Coroutine
+from concurrent.futures import Future
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_SHUTDOWN_TIMEOUT_SECS = 10.0
+
+_lock = threading.Lock()
+_loop: asyncio.AbstractEventLoop | None = None
+_thread: threading.Thread | None = None
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Return the pipeline loop, starting its thread on first use."""
+    global _loop, _thread
+    with _lock:
+        if _loop is not None and _thread is not None and _thread.is_alive():
+            return _loop
+
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def _run() -> None:
+            asyncio.set_event_loop(loop)
+            loop.call_soon(started.set)
+            loop.run_forever()
+
+        thread = threading.Thread(target=_run, name="pipeline-loop", daemon=True)
+        thread.start()
+        started.wait()
+        _loop, _thread = loop, thread
+        logger.info("Pipeline event loop started")
+        return loop
+
+
+def submit(coro: Coroutine[Any, Any, T]) -> Future[T]:
+    """Schedule a coroutine on the pipeline loop and return a concurrent future."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop())
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on the pipeline loop, blocking the calling thread until done."""
+    return submit(coro).result()
+
+
+def shutdown() -> None:
+    """Dispose pooled connections and stop the pipeline loop."""
+    global _loop, _thread
+    with _lock:
+        loop, thread = _loop, _thread
+        _loop, _thread = None, None
+    if loop is None or thread is None or not thread.is_alive():
+        return
+
+    from pipeline.db import dispose_engine
+
+    try:
+        future = asyncio.run_coroutine_threadsafe(dispose_engine(), loop)
+        future.result(timeout=_SHUTDOWN_TIMEOUT_SECS)
+    except Exception as e:
+        logger.error(f"Failed to dispose pipeline engine: {e}", exc_info=True)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=_SHUTDOWN_TIMEOUT_SECS)
+    if not thread.is_alive():
+        loop.close()
+    logger.info("Pipeline event loop stopped")
@@ -1,24 +1,32 @@
 """Data cleanup task - applies retention policy to old data."""
 
-import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
 
 from sqlalchemy import delete, and_, or_
 
-from pipeline.db import session_factory as _session_factory
+from pipeline.db import optimize_database, session_factory as _session_factory
+from pipeline.job_history import record_job_run
+from pipeline.runtime import run_sync
 
 logger = logging.getLogger(__name__)
 
 _PRICE_RETENTION_DAYS = 180
 _STALE_PREDICTION_DAYS = 7
+_JOB_RUN_RETENTION_DAYS = 30
+# Schedules are replaced on refresh; rows this old belong to routes nobody searches
+_SCHEDULE_RETENTION_DAYS = 30
 
 
+@record_job_run("cleanup")
 async def _cleanup() -> dict:
     """Remove data older than retention period."""
     from app.models.alert import PriceAlert
     from app.models.flight_price import FlightPrice
+    from app.models.flight_schedule import FlightSchedule
+    from app.models.job_run import JobRun
     from app.models.prediction import Prediction
+    from app.models.route_min_price import RouteMinPrice
 
     session_factory = _session_factory
     # Use tz-naive datetimes for SQLite compatibility
@@ -53,27 +61,70 @@ async def _cleanup() -> dict:
             )
         )
 
+        job_runs_result = await session.execute(
+            delete(JobRun).where(JobRun.started_at < now - timedelta(days=_JOB_RUN_RETENTION_DAYS))
+        )
+
+        schedules_result = await session.execute(
+            delete(FlightSchedule).where(
+                FlightSchedule.fetched_at < now - timedelta(days=_SCHEDULE_RETENTION_DAYS)
+            )
+        )
+
+        # Min-price entries for past months, or for routes no longer being collected
+        min_prices_result = await session.execute(
+            delete(RouteMinPrice).where(
+                or_(
+                    RouteMinPrice.departure_month < today.strftime("%Y-%m"),
+                    RouteMinPrice.observed_at < now - timedelta(days=_STALE_PREDICTION_DAYS),
+                )
+            )
+        )
+
         # Capture rowcount before commit (result proxy may be invalidated after)
         prices_deleted = price_result.rowcount
         preds_deleted = pred_result.rowcount
         alerts_deleted = alerts_result.rowcount
+        job_runs_deleted = job_runs_result.rowcount
+        schedules_deleted = schedules_result.rowcount
+        min_prices_deleted = min_prices_result.rowcount
 
         try:
             await session.commit()
         except Exception as e:
             logger.error(f"Failed to commit cleanup: {e}", exc_info=True)
             await session.rollback()
-            return {"status": "error", "prices_deleted": 0, "predictions_deleted": 0, "alerts_deleted": 0}
-
-    logger.info(f"Cleanup: {prices_deleted} prices, {preds_deleted} predictions, {alerts_deleted} expired alerts removed")
+            return {
+                "status": "error", "prices_deleted": 0, "predictions_deleted": 0,
+                "alerts_deleted": 0, "errors": 1,
+            }
+
+    # Deletes shift row counts the most, so refresh planner statistics right after
+    try:
+        await optimize_database()
+    except Exception as e:
+        logger.warning(f"Database optimize after cleanup failed: {e}")
+
+    logger.info(
+        f"Cleanup: {prices_deleted} prices, {preds_deleted} predictions, "
+        f"{alerts_deleted} expired alerts, {schedules_deleted} stale schedules, "
+        f"{min_prices_deleted} stale min prices removed"
+    )
     return {
         "status": "ok",
         "prices_deleted": prices_deleted,
         "predictions_deleted": preds_deleted,
         "alerts_deleted": alerts_deleted,
+        "job_runs_deleted": job_runs_deleted,
+        "schedules_deleted": schedules_deleted,
+        "min_prices_deleted": min_prices_deleted,
+        "rows_out": (
+            prices_deleted + preds_deleted + alerts_deleted + job_runs_deleted + schedules_deleted
+            + min_prices_deleted
+        ),
     }
 
 
 def apply_retention_policy_sync() -> dict:
-    """Synchronous wrapper for APScheduler."""
-    return asyncio.run(_cleanup())
+    """Synchronous wrapper for APScheduler (runs on the persistent pipeline loop)."""
+    return run_sync(_cleanup())
@@ -10,6 +10,8 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from pipeline.collectors.travelpayouts_collector import TravelpayoutsCollector
 from pipeline.collectors.base import PriceObservation
 from pipeline.db import session_factory as _session_factory
+from pipeline.job_history import record_job_run
+from pipeline.runtime import run_sync
 
 logger = logging.getLogger(__name__)
 
@@ -54,25 +56,28 @@ async def _collect_route(
 async def _store_observations(
     session_factory: async_sessionmaker[AsyncSession],
     observations: list[PriceObservation],
-) -> int:
-    """Store price observations in the database."""
-    from app.models.airline import Airline
+) -> tuple[int, set[int]]:
+    """Store price observations in the database.
+
+    Returns (stored count, ids of routes that received new prices).
+    """
+    from app.core.money import to_minor
     from app.models.flight_price import FlightPrice
-    from app.models.route import Route
+    from app.services.reference_data import get_reference_data, invalidate_reference_data
 
     stored = 0
+    changed_route_ids: set[int] = set()
     skipped_airline = 0
     skipped_route = 0
     async with session_factory() as session:
-        # Pre-fetch valid airline codes to avoid FK violations
-        airline_result = await session.execute(select(Airline.iata_code))
-        valid_airlines = {row[0] for row in airline_result.all()}
-
-        # Pre-fetch all routes into a lookup dict to avoid N+1 queries
-        route_result = await session.execute(select(Route))
-        route_lookup: dict[tuple[str, str], Route] = {
-            (r.origin_code, r.dest_code): r for r in route_result.scalars().all()
-        }
+        # Valid airline codes (to avoid FK violations) and routes from the shared snapshot
+        ref = await get_reference_data(session)
+        if any((obs.origin, obs.destination) not in ref.routes for obs in observations):
+            # Routes auto-created by the API since the snapshot was taken
+            invalidate_reference_data()
+            ref = await get_reference_data(session)
+        valid_airlines = ref.airlines
+        route_lookup = ref.routes
 
         for obs in observations:
             # Skip if airline code is missing or not in our airlines table
@@ -92,7 +97,7 @@ async def _store_observations(
                 departure_date=obs.departure_date,
                 cabin_class=obs.cabin_class,
                 return_date=obs.return_date,
-                price_amount=obs.price,
+                price_amount=to_minor(obs.price, obs.currency),
                 currency=obs.currency,
                 stops=obs.stops,
                 duration_minutes=obs.duration_minutes,
@@ -101,6 +106,7 @@ async def _store_observations(
             )
             session.add(price)
             stored += 1
+            changed_route_ids.add(route.id)
 
         if skipped_airline > 0:
             logger.info(f"Skipped {skipped_airline} observations with unknown airline codes")
@@ -112,11 +118,25 @@ async def _store_observations(
         except Exception as e:
             logger.error(f"Failed to commit {stored} observations: {e}", exc_info=True)
             await session.rollback()
-            return 0
+            return 0, set()
+
+        # Keep the per-route min-price index in step with the prices just stored
+        from app.services.route_service import RouteService
+
+        try:
+            indexed = await RouteService(session).refresh_min_prices(changed_route_ids)
+            await session.commit()
+            logger.info(
+                f"Refreshed {indexed} route min-price entries for {len(changed_route_ids)} routes"
+            )
+        except Exception as e:
+            logger.error(f"Failed to refresh route min prices: {e}", exc_info=True)
+            await session.rollback()
 
-    return stored
+    return stored, changed_route_ids
 
 
+@record_job_run("collect_prices")
 async def collect_all_routes_async() -> dict:
     """Main collection logic (async)."""
     from app.models.route import Route
@@ -131,7 +151,7 @@ async def collect_all_routes_async() -> dict:
 
     if not routes:
         logger.info("No active routes to collect")
-        return {"status": "ok", "routes": 0, "observations": 0}
+        return {"status": "ok", "routes": 0, "observations": 0, "changed_route_ids": []}
 
     # Generate departure dates (deduplicated, sorted):
     # - 7-30 days: every 3 days (dense near-term data for accuracy)
@@ -155,16 +175,24 @@ async def collect_all_routes_async() -> dict:
             await asyncio.sleep(_DELAY_BETWEEN_ROUTES)
 
     # Store in database
-    stored = await _store_observations(session_factory, all_observations)
+    stored, changed_route_ids = await _store_observations(session_factory, all_observations)
 
-    logger.info(f"Collection complete: {len(routes)} routes, {stored} observations stored")
+    logger.info(
+        f"Collection complete: {len(routes)} routes, {stored} observations stored, "
+        f"{len(changed_route_ids)} routes changed"
+    )
     return {
         "status": "ok",
         "routes": len(routes),
         "observations": stored,
+        "changed_route_ids": sorted(changed_route_ids),
+        "rows_in": len(all_observations),
+        "rows_out": stored,
+        "api_calls": collector.api_calls,
+        "errors": collector.failed_calls,
     }
 
 
 def collect_all_routes_sync() -> dict:
-    """Synchronous wrapper for APScheduler."""
-    return asyncio.run(collect_all_routes_async())
+    """Synchronous wrapper for APScheduler (runs on the persistent pipeline loop)."""
+    return run_sync(collect_all_routes_async())
@@ -0,0 +1,102 @@
+"""Schedule pre-warming task - refreshes cached flight schedules off-peak.
+
+Searches otherwise fetch schedules lazily, so the first search of a route each
+day would pay the AirLabs/Aviationstack round trip. Both directions of every
+active route are refreshed here, shortly before the cache would go stale.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from pipeline.db import session_factory as _session_factory
+from pipeline.job_history import record_job_run
+from pipeline.runtime import run_sync
+
+logger = logging.getLogger(__name__)
+
+_PREWARM_CONCURRENCY = 4
+# Skip directions refreshed more recently than this (e.g. by a search today)
+_PREWARM_MIN_AGE_HOURS = 12
+
+
+async def _stale_directions(
+    session: AsyncSession, directions: list[tuple[str, str]],
+) -> list[tuple[str, str]]:
+    """Directions with no cached schedules or whose oldest row is past the min age."""
+    from app.models.flight_schedule import FlightSchedule
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    cutoff = now - timedelta(hours=_PREWARM_MIN_AGE_HOURS)
+    result = await session.execute(
+        select(
+            FlightSchedule.origin_code,
+            FlightSchedule.dest_code,
+            func.min(FlightSchedule.fetched_at),
+        ).group_by(FlightSchedule.origin_code, FlightSchedule.dest_code)
+    )
+    oldest = {(row[0], row[1]): row[2] for row in result.all()}
+    return [d for d in directions if d not in oldest or oldest[d] < cutoff]
+
+
+@record_job_run("prewarm_schedules")
+async def _prewarm_schedules() -> dict:
+    """Refresh schedules for both directions of all active routes."""
+    from app.models.route import Route
+    from app.services.flight_service import FlightService
+
+    session_factory = _session_factory
+    async with session_factory() as session:
+        result = await session.execute(
+            select(Route.origin_code, Route.dest_code).where(Route.is_active.is_(True))
+        )
+        directions: set[tuple[str, str]] = set()
+        for origin, dest in result.all():
+            directions.add((origin, dest))
+            directions.add((dest, origin))
+        due = await _stale_directions(session, sorted(directions))
+
+    if not due:
+        logger.info("Schedule prewarm: all schedules fresh")
+        return {"status": "ok", "rows_in": len(directions), "rows_out": 0}
+
+    # Provider rate limiters still apply per call; this only bounds fan-out
+    semaphore = asyncio.Semaphore(_PREWARM_CONCURRENCY)
+    stored = 0
+    failed = 0
+
+    async def _warm(origin: str, dest: str) -> None:
+        nonlocal stored, failed
+        async with semaphore:
+            try:
+                async with session_factory() as session:
+                    count = await FlightService(session).refresh_schedules(origin, dest)
+                stored += count
+            except Exception as e:
+                failed += 1
+                logger.error(f"Schedule prewarm failed for {origin}->{dest}: {e}")
+
+    await asyncio.gather(*(_warm(origin, dest) for origin, dest in due))
+
+    logger.info(
+        f"Schedule prewarm: {len(due)}/{len(directions)} directions refreshed, "
+        f"{stored} schedules stored, {failed} failed"
+    )
+    return {
+        "status": "ok",
+        "directions_refreshed": len(due),
+        "schedules_stored": stored,
+        "rows_in": len(directions),
+        "rows_out": stored,
+        # No api_calls: board cache hits and unconfigured providers make no request,
+        # and refresh_schedules does not report which calls actually went out
+        "errors": failed,
+    }
+
+
+def prewarm_schedules_sync() -> dict:
+    """Synchronous wrapper for APScheduler (runs on the persistent pipeline loop)."""
+    return run_sync(_prewarm_schedules())
@@ -1,6 +1,5 @@
 """Prediction task - generates price predictions for all active routes."""
 
-import asyncio
 import logging
 from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
@@ -9,7 +8,9 @@ import pandas as pd
 from sqlalchemy import select
 
 from pipeline.db import session_factory as _session_factory
+from pipeline.job_history import record_job_run
 from pipeline.ml.models.statistical_model import StatisticalPredictor
+from pipeline.runtime import run_sync
 
 logger = logging.getLogger(__name__)
 
@@ -25,8 +26,13 @@ _MODEL_VERSION = "statistical-v1"
 _DEFAULT_CABIN = "ECONOMY"
 
 
-async def _predict_all_routes() -> dict:
-    """Run predictions for all active routes with sufficient data."""
+@record_job_run("run_predictions")
+async def _predict_all_routes(route_ids: list[int] | None = None) -> dict:
+    """Run predictions for active routes with sufficient data.
+
+    Args:
+        route_ids: Restrict the run to these routes (None = all active routes).
+    """
     from app.models.flight_price import FlightPrice
     from app.models.prediction import Prediction
     from app.models.route import Route
@@ -37,10 +43,14 @@ async def _predict_all_routes() -> dict:
     predictions_created = 0
     routes_processed = 0
     routes_failed = 0
+    price_rows_read = 0
 
     async with session_factory() as session:
         # Get active routes
-        result = await session.execute(select(Route).where(Route.is_active.is_(True)))
+        route_query = select(Route).where(Route.is_active.is_(True))
+        if route_ids is not None:
+            route_query = route_query.where(Route.id.in_(route_ids))
+        result = await session.execute(route_query)
         routes = result.scalars().all()
 
         if not routes:
@@ -70,16 +80,18 @@ async def _predict_all_routes() -> dict:
                     .order_by(FlightPrice.time.asc())
                 )
                 price_rows = prices_result.scalars().all()
+                price_rows_read += len(price_rows)
 
                 if len(price_rows) < _MIN_DATA_POINTS:
                     logger.debug(f"Route {route.origin_code}->{route.dest_code}: skipped (only {len(price_rows)} price points)")
                     continue
 
-                # Build DataFrame with departure_date for per-date filtering
+                # Build DataFrame with departure_date for per-date filtering. Prices stay
+                # in minor units, so predictions come out as minor units of the same currency.
                 price_df = pd.DataFrame([
                     {
                         "time": p.time,
-                        "price_amount": float(p.price_amount),
+                        "price_amount": p.price_amount,
                         "airline_code": p.airline_code,
                         "departure_date": p.departure_date,
                     }
@@ -124,7 +136,7 @@ async def _predict_all_routes() -> dict:
                     # Ensure non-negative prices and valid confidence interval
                     for key in ("predicted_price", "confidence_low", "confidence_high"):
                         if result_pred[key] < 0:
-                            result_pred[key] = Decimal("0")
+                            result_pred[key] = 0
                     # Ensure confidence_low <= predicted_price <= confidence_high
                     if result_pred["confidence_low"] > result_pred["predicted_price"]:
                         result_pred["confidence_low"] = result_pred["predicted_price"]
@@ -194,16 +206,22 @@ async def _predict_all_routes() -> dict:
         except Exception as e:
             logger.error(f"Failed to commit {predictions_created} predictions: {e}", exc_info=True)
             await session.rollback()
-            return {"status": "error", "routes": routes_processed, "predictions": 0}
+            return {
+                "status": "error", "routes": routes_processed, "predictions": 0,
+                "rows_in": price_rows_read, "errors": routes_failed + 1,
+            }
 
     logger.info(f"Predictions: {routes_processed} routes, {predictions_created} predictions created, {routes_failed} failed")
     return {
         "status": "ok",
         "routes": routes_processed,
         "predictions": predictions_created,
+        "rows_in": price_rows_read,
+        "rows_out": predictions_created,
+        "errors": routes_failed,
     }
 
 
-def predict_all_active_sync() -> dict:
-    """Synchronous wrapper for APScheduler."""
-    return asyncio.run(_predict_all_routes())
+def predict_all_active_sync(route_ids: list[int] | None = None) -> dict:
+    """Synchronous wrapper for APScheduler (runs on the persistent pipeline loop)."""
+    return run_sync(_predict_all_routes(route_ids))
@@ -1,21 +1,27 @@
 """Alert notification task - checks price alerts against current prices."""
 
-import asyncio
 import logging
 from datetime import date, datetime, timedelta, timezone
-from decimal import Decimal
 
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, or_
 
 from pipeline.db import session_factory as _session_factory
+from pipeline.job_history import record_job_run
+from pipeline.runtime import run_sync
 
 logger = logging.getLogger(__name__)
 
 _ALERT_RECENT_HOURS = 48
 
 
-async def _check_alerts() -> dict:
-    """Check all active alerts against latest prices."""
+@record_job_run("check_alerts")
+async def _check_alerts(route_ids: list[int] | None = None) -> dict:
+    """Check active alerts against latest prices.
+
+    Args:
+        route_ids: Only check alerts on these routes (None = all routes).
+    """
+    from app.core.money import from_minor, to_minor
     from app.models.alert import PriceAlert
     from app.models.flight_price import FlightPrice
 
@@ -27,19 +33,20 @@ async def _check_alerts() -> dict:
 
     async with session_factory() as session:
         # Get all un-triggered alerts (only for future or unset departure dates)
-        result = await session.execute(
-            select(PriceAlert).where(
-                PriceAlert.is_triggered.is_(False),
-                or_(
-                    PriceAlert.departure_date.is_(None),
-                    PriceAlert.departure_date >= today,
-                ),
-            )
+        alert_query = select(PriceAlert).where(
+            PriceAlert.is_triggered.is_(False),
+            or_(
+                PriceAlert.departure_date.is_(None),
+                PriceAlert.departure_date >= today,
+            ),
         )
+        if route_ids is not None:
+            alert_query = alert_query.where(PriceAlert.route_id.in_(route_ids))
+        result = await session.execute(alert_query)
         alerts = result.scalars().all()
 
-        # Batch: pre-fetch minimum prices for all relevant route+cabin combinations
-        min_prices_map: dict[tuple[int, str, date | None], Decimal] = {}
+        # Batch: pre-fetch minimum prices (minor units) for all relevant route+cabin combinations
+        min_prices_map: dict[tuple[int, str, date | None], int] = {}
 
         if alerts:
             route_cabin_pairs = list({(a.route_id, a.cabin_class) for a in alerts})
@@ -47,23 +54,26 @@ async def _check_alerts() -> dict:
             recent_cutoff = now_naive - timedelta(hours=_ALERT_RECENT_HOURS)
 
             for route_id, cabin_class in route_cabin_pairs:
-                # Get min price per departure_date for this route+cabin (recent only)
-                # Overall min (for alerts without departure_date) is derived from the same data
+                # Min price per departure_date for this route+cabin (recent only), reduced
+                # here: a SQL GROUP BY departure_date makes SQLite walk the route's whole
+                # history in idx_fp_latest_per_airline order instead of the short
+                # idx_fp_route_time range. Overall min (for alerts without
+                # departure_date) is derived from the same rows.
                 price_result = await session.execute(
-                    select(
-                        FlightPrice.departure_date,
-                        func.min(FlightPrice.price_amount).label("min_price"),
-                    ).where(
+                    select(FlightPrice.departure_date, FlightPrice.price_amount).where(
                         FlightPrice.route_id == route_id,
                         FlightPrice.cabin_class == cabin_class,
                         FlightPrice.time >= recent_cutoff,
-                    ).group_by(FlightPrice.departure_date)
+                    )
                 )
                 overall_min = None
-                for row in price_result.all():
-                    min_prices_map[(route_id, cabin_class, row.departure_date)] = row.min_price
-                    if overall_min is None or row.min_price < overall_min:
-                        overall_min = row.min_price
+                for departure_date, price_amount in price_result.all():
+                    key = (route_id, cabin_class, departure_date)
+                    current = min_prices_map.get(key)
+                    if current is None or price_amount < current:
+                        min_prices_map[key] = price_amount
+                    if overall_min is None or price_amount < overall_min:
+                        overall_min = price_amount
                 if overall_min is not None:
                     min_prices_map[(route_id, cabin_class, None)] = overall_min
 
@@ -80,13 +90,14 @@ async def _check_alerts() -> dict:
                 )
                 continue
 
-            if min_price <= alert.target_price:
+            # Alert targets are entered in DEFAULT_CURRENCY
+            if min_price <= to_minor(alert.target_price):
                 alert.is_triggered = True
                 alert.triggered_at = now_naive
                 triggered += 1
                 logger.info(
                     f"Alert {alert.id} triggered: route={alert.route_id}, "
-                    f"target={alert.target_price}, actual={min_price}"
+                    f"target={alert.target_price}, actual={from_minor(min_price)}"
                 )
 
         try:
@@ -94,12 +105,18 @@ async def _check_alerts() -> dict:
         except Exception as e:
             logger.error(f"Failed to commit alert updates: {e}", exc_info=True)
             await session.rollback()
-            return {"status": "error", "checked": len(alerts), "triggered": 0}
+            return {
+                "status": "error", "checked": len(alerts), "triggered": 0,
+                "rows_in": len(alerts), "errors": 1,
+            }
 
     logger.info(f"Alert check: {len(alerts)} checked, {triggered} triggered")
-    return {"status": "ok", "checked": len(alerts), "triggered": triggered}
+    return {
+        "status": "ok", "checked": len(alerts), "triggered": triggered,
+        "rows_in": len(alerts), "rows_out": triggered,
+    }
 
 
-def check_and_send_sync() -> dict:
-    """Synchronous wrapper for APScheduler."""
-    return asyncio.run(_check_alerts())
+def check_and_send_sync(route_ids: list[int] | None = None) -> dict:
+    """Synchronous wrapper for APScheduler (runs on the persistent pipeline loop)."""
+    return run_sync(_check_alerts(route_ids))
@@ -0,0 +1,47 @@
+"""Standalone pipeline worker - runs scheduled jobs outside the API process.
+
+Usage (from the project root):
+    python -m pipeline.worker
+
+Run the API with SCHEDULER_MODE=external so the jobs are not scheduled twice.
+"""
+
+import logging
+import signal
+import threading
+
+from pipeline import runtime
+from pipeline.db import create_tables
+
+logger = logging.getLogger(__name__)
+
+_LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format=_LOG_FORMAT)
+
+    from app.scheduler import start_scheduler, stop_scheduler
+
+    runtime.run_sync(create_tables())
+
+    stop_event = threading.Event()
+
+    def _handle_signal(signum: int, _frame: object) -> None:
+        logger.info(f"Worker: received {signal.Signals(signum).name}, shutting down...")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, _handle_signal)
+    signal.signal(signal.SIGTERM, _handle_signal)
+
+    start_scheduler()
+    logger.info("Worker started")
+    stop_event.wait()
+
+    # Let in-flight jobs finish so their DB commits are not cut off
+    stop_scheduler(wait=True)
+    logger.info("Worker stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""Benchmark the "latest fare per airline" lookup on a large synthetic flight_prices table.
+
+Usage:
+    python scripts/bench_latest_price.py [--db FILE] [--rows N] [--routes N]
+                                         [--lookups N] [--reuse]
+
+Builds a SQLite database with the app schema and N synthetic price rows
+(default 10M, spread over routes x 180 departure dates x airlines), then
+times random route/date/cabin lookups in two index layouts:
+
+  legacy   idx_fp_route_depart_cabin (route_id, departure_date, cabin_class, time)
+  current  idx_fp_latest_per_airline (covering, airline then time DESC)
+
+For each layout it runs the former three-statement lookup (route by
+origin/dest, GROUP BY max(time) joined back, airline names) and the single
+ROW_NUMBER() query from app.db.queries, and prints median/p95 latency plus
+the query plan of the new query. Generating 10M rows takes a few minutes and
+about 2 GB of disk; pass --reuse to rerun against an existing --db file.
+
+On 10M rows (~280 observations per route/date/cabin) the covering index is
+what moves latency (median ~8 ms -> ~3 ms, no temp B-tree, no table reads).
+Under it the window query and the old GROUP BY + join-back are within ~10%
+of each other in SQLite; the window form wins on round trips (one statement
+instead of three, which matters more through aiosqlite's thread hop) and
+cannot return duplicate rows when two fares share the latest timestamp.
+"""
+
+import argparse
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Add backend to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "backend"))
+
+from app.db.queries import latest_price_per_airline_query  # noqa: E402
+from app.models import Base  # noqa: E402
+from app.models.airline import Airline  # noqa: E402
+from app.models.airport import Airport  # noqa: E402
+from app.models.flight_price import FlightPrice  # noqa: E402
+from app.models.route import Route  # noqa: E402
+from sqlalchemy import Index, create_engine, func, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+_ORIGIN = "ICN"
+_AIRLINES = [
+    "KE", "OZ", "7C", "LJ", "TW", "BX", "ZE", "JL", "NH", "SQ", "CX", "VN", "TG", "MU", "CA", "BR",
+]
+_CABINS = ("ECONOMY", "ECONOMY", "ECONOMY", "BUSINESS")
+_DEPARTURE_DAYS = 180
+_BATCH = 100_000
+_LEGACY_INDEX = Index(
+    "idx_fp_route_depart_cabin",
+    FlightPrice.route_id, FlightPrice.departure_date, FlightPrice.cabin_class, FlightPrice.time,
+)
+_CURRENT_INDEX = next(
+    ix for ix in FlightPrice.__table__.indexes if ix.name == "idx_fp_latest_per_airline"
+)
+
+
+def _dest_code(i: int) -> str:
+    return "".join(chr(ord("A") + (i // 26 ** k) % 26) for k in (2, 1, 0))
+
+
+def _build(path: Path, rows: int, routes: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(
+            Airport(iata_code=code, name=code, city=code, country_code="XX")
+            for code in [_ORIGIN] + [_dest_code(i) for i in range(routes)]
+        )
+        session.add_all(Airline(iata_code=code, name=f"Airline {code}") for code in _AIRLINES)
+        session.flush()
+        session.add_all(
+            Route(id=i + 1, origin_code=_ORIGIN, dest_code=_dest_code(i)) for i in range(routes)
+        )
+        session.commit()
+    # Bulk load without indexes; layouts are built afterwards
+    with engine.begin() as conn:
+        for index in FlightPrice.__table__.indexes:
+            index.drop(conn, checkfirst=True)
+    engine.dispose()
+
+    rng = random.Random(7)
+    start_day = date(2026, 11, 1)
+    observed_from = datetime(2026, 5, 1)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+
+    sql = (
+        "INSERT OR IGNORE INTO flight_prices (time, route_id, airline_code, departure_date, "
+        "cabin_class, return_date, price_amount, currency, stops, duration_minutes, source, "
+        "raw_offer_id) "
+        "VALUES (?, ?, ?, ?, ?, NULL, ?, 'KRW', ?, ?, 'travelpayouts', NULL)"
+    )
+    t0 = time.perf_counter()
+    done = 0
+    while done < rows:
+        batch = []
+        for _ in range(min(_BATCH, rows - done)):
+            observed = observed_from + timedelta(seconds=rng.randrange(180 * 86400))
+            batch.append((
+                observed.strftime("%Y-%m-%d %H:%M:%S.%f"),
+                rng.randint(1, routes),
+                rng.choice(_AIRLINES),
+                (start_day + timedelta(days=rng.randrange(_DEPARTURE_DAYS))).isoformat(),
+                rng.choice(_CABINS),
+                rng.randint(80_000, 1_500_000),
+                rng.randint(0, 2),
+                rng.randint(90, 900),
+            ))
+        conn.executemany(sql, batch)
+        done += len(batch)
+        if done % (_BATCH * 10) == 0 or done == rows:
+            print(f"  inserted {done:,} rows ({time.perf_counter() - t0:.0f}s)", flush=True)
+    conn.commit()
+    conn.close()
+
+
+def _use_index_layout(engine, layout: str) -> None:
+    with engine.begin() as conn:
+        for index in FlightPrice.__table__.indexes:
+            if index is not _CURRENT_INDEX and index is not _LEGACY_INDEX:
+                index.create(conn, checkfirst=True)
+        if layout == "legacy":
+            wanted, unwanted = _LEGACY_INDEX, _CURRENT_INDEX
+        else:
+            wanted, unwanted = _CURRENT_INDEX, _LEGACY_INDEX
+        unwanted.drop(conn, checkfirst=True)
+        t0 = time.perf_counter()
+        wanted.create(conn, checkfirst=True)
+        conn.exec_driver_sql("ANALYZE")
+    print(f"  index layout '{layout}' ready ({time.perf_counter() - t0:.1f}s)")
+
+
+def _legacy_lookup(
+    session: Session, origin: str, dest: str, departure_date: date, cabin_class: str,
+) -> int:
+    route = session.execute(
+        select(Route).where(Route.origin_code == origin, Route.dest_code == dest)
+    ).scalar_one_or_none()
+    if not route:
+        return 0
+    subq = (
+        select(FlightPrice.airline_code, func.max(FlightPrice.time).label("latest_time"))
+        .where(
+            FlightPrice.route_id == route.id,
+            FlightPrice.departure_date == departure_date,
+            FlightPrice.cabin_class == cabin_class,
+        )
+        .group_by(FlightPrice.airline_code)
+        .subquery()
+    )
+    prices = session.execute(
+        select(FlightPrice)
+        .where(
+            FlightPrice.route_id == route.id,
+            FlightPrice.departure_date == departure_date,
+            FlightPrice.cabin_class == cabin_class,
+        )
+        .join(
+            subq,
+            (FlightPrice.airline_code == subq.c.airline_code)
+            & (FlightPrice.time == subq.c.latest_time),
+        )
+    ).scalars().all()
+    codes = list({p.airline_code for p in prices})
+    if codes:
+        session.execute(
+            select(Airline.iata_code, Airline.name).where(Airline.iata_code.in_(codes))
+        ).all()
+    session.expunge_all()
+    return len(prices)
+
+
+def _window_lookup(
+    session: Session, origin: str, dest: str, departure_date: date, cabin_class: str,
+) -> int:
+    query = latest_price_per_airline_query(departure_date, cabin_class, origin=origin, dest=dest)
+    return len(session.execute(query).all())
+
+
+def _time_lookups(session: Session, fn, cases: list[tuple]) -> tuple[list[float], int]:
+    timings = []
+    found = 0
+    for case in cases:
+        t0 = time.perf_counter()
+        found += fn(session, *case)
+        timings.append((time.perf_counter() - t0) * 1000)
+    return timings, found
+
+
+def _report(label: str, timings: list[float], found: int) -> None:
+    timings = sorted(timings)
+    p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+    print(
+        f"    {label:<22} median {statistics.median(timings):7.2f} ms"
+        f"   p95 {p95:7.2f} ms   rows {found}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--db", type=Path, help="SQLite file to build/use (default: a temp file)")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="Synthetic flight_prices rows")
+    parser.add_argument("--routes", type=int, default=50, help="Synthetic routes from ICN")
+    parser.add_argument(
+        "--lookups", type=int, default=200, help="Random lookups per query and layout",
+    )
+    parser.add_argument(
+        "--reuse", action="store_true", help="Skip generation and reuse an existing --db",
+    )
+    args = parser.parse_args()
+
+    path = args.db or Path(tempfile.gettempdir()) / "bench_latest_price.db"
+    if not args.reuse:
+        path.unlink(missing_ok=True)
+        print(f"Building {args.rows:,} rows in {path} ...")
+        _build(path, args.rows, args.routes)
+
+    rng = random.Random(11)
+    cases = [
+        (
+            _ORIGIN,
+            _dest_code(rng.randrange(args.routes)),
+            date(2026, 11, 1) + timedelta(days=rng.randrange(_DEPARTURE_DAYS)),
+            rng.choice(_CABINS),
+        )
+        for _ in range(args.lookups)
+    ]
+
+    engine = create_engine(f"sqlite:///{path}")
+    for layout in ("legacy", "current"):
+        print(f"\n[{layout}]")
+        _use_index_layout(engine, layout)
+        with Session(engine) as session:
+            # Warm the page cache so both queries are measured on the same footing
+            _time_lookups(session, _window_lookup, cases[:20])
+            _report("group-by + join (3 q)", *_time_lookups(session, _legacy_lookup, cases))
+            _report("row_number (1 q)", *_time_lookups(session, _window_lookup, cases))
+            origin, dest, departure_date, cabin_class = cases[0]
+            query = latest_price_per_airline_query(
+                departure_date, cabin_class, origin=origin, dest=dest,
+            )
+            compiled = query.compile(engine, compile_kwargs={"literal_binds": True})
+            plan = session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").all()
+            for row in plan:
+                print(f"      plan: {row[-1]}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
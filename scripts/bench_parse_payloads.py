@@ -0,0 +1,198 @@
+"""Benchmark upstream payload parsing: decoder speed and event-loop blocking.
+
+Usage:
+    python scripts/bench_parse_payloads.py [--timetable FILE] [--cheap FILE] [--calendar FILE]
+                                          [--concurrency N]
+
+Pass recorded API responses (raw JSON bodies) to measure real payloads;
+without them, synthetic payloads shaped like Aviationstack /timetable and
+Travelpayouts /v1/prices/cheap and /v1/prices/calendar are generated.
+For each payload it reports stdlib json vs orjson decode time and parse
+time, then the worst event-loop stall while parses run inline vs offloaded
+to a worker thread (what run_parser does above PARSE_OFFLOAD_MIN_BYTES).
+Parsing is GIL-bound, so offloading bounds stalls to roughly one decode
+call rather than the whole parse; it does not add parallelism.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add backend to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "backend"))
+
+from app.core import jsonparse  # noqa: E402
+from app.services.flight_service import (  # noqa: E402
+    TravelpayoutsClient,
+    _parse_aviationstack_board,
+)
+
+_RUNS = 20
+_TICK_SECONDS = 0.001
+_STALL_RUNS = 7
+_DESTS = ["NRT", "KIX", "BKK", "SIN", "HKG", "TPE", "CJU", "PUS", "LAX", "CDG", "FRA", "SYD"]
+_AIRLINES = ["KE", "OZ", "7C", "LJ", "TW", "BX", "ZE", "JL", "NH", "SQ", "CX", "VN"]
+
+
+def _synthetic_timetable(entries: int) -> bytes:
+    rng = random.Random(1)
+    data = []
+    for i in range(entries):
+        airline = rng.choice(_AIRLINES)
+        hh, mm = rng.randrange(24), rng.randrange(0, 60, 5)
+        data.append({
+            "type": "departure",
+            "status": "scheduled",
+            "departure": {
+                "iataCode": "ICN", "terminal": str(rng.randint(1, 2)),
+                "gate": f"{rng.randint(1, 250)}",
+                "scheduledTime": f"2026-11-01T{hh:02d}:{mm:02d}:00.000",
+            },
+            "arrival": {
+                "iataCode": rng.choice(_DESTS), "terminal": "1",
+                "scheduledTime": f"2026-11-01T{(hh + 3) % 24:02d}:{mm:02d}:00.000",
+            },
+            "airline": {"name": f"Airline {airline}", "iataCode": airline, "icaoCode": "XXX"},
+            "flight": {
+                "number": str(100 + i), "iataNumber": f"{airline}{100 + i}",
+                "icaoNumber": f"XXX{100 + i}",
+            },
+            "codeshared": None,
+        })
+    return json.dumps({"pagination": {"total": entries}, "data": data}).encode()
+
+
+def _synthetic_cheap(dests: int) -> bytes:
+    rng = random.Random(2)
+    data = {
+        f"X{i:02d}": {
+            str(stops): {
+                "price": rng.randint(80000, 900000), "airline": rng.choice(_AIRLINES),
+                "flight_number": rng.randint(100, 999),
+                "departure_at": "2026-11-01T09:00:00+09:00",
+                "return_at": "2026-11-08T12:00:00+09:00",
+                "expires_at": "2026-10-25T00:00:00Z", "duration_to": rng.randint(60, 900),
+            }
+            for stops in range(3)
+        }
+        for i in range(dests)
+    }
+    return json.dumps({"success": True, "data": data, "currency": "KRW"}).encode()
+
+
+def _synthetic_calendar(days: int) -> bytes:
+    rng = random.Random(3)
+    start = date(2026, 11, 1)
+    data = {
+        (start + timedelta(days=d)).isoformat(): {
+            "origin": "ICN", "destination": "NRT", "price": rng.randint(80000, 900000),
+            "transfers": rng.randint(0, 2), "airline": rng.choice(_AIRLINES),
+            "flight_number": rng.randint(100, 999),
+            "departure_at": f"{(start + timedelta(days=d)).isoformat()}T09:00:00+09:00",
+            "return_at": None, "expires_at": "2026-10-25T00:00:00Z",
+        }
+        for d in range(days)
+    }
+    return json.dumps({"success": True, "data": data, "currency": "KRW"}).encode()
+
+
+def _median_ms(fn, *args) -> float:
+    samples = []
+    for _ in range(_RUNS):
+        start = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def _max_loop_stall_ms(parse, offload: bool, concurrency: int) -> float:
+    """Run concurrent parses and return the longest gap between loop ticks."""
+    stall = 0.0
+    done = asyncio.Event()
+
+    async def _ticker() -> None:
+        nonlocal stall
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(_TICK_SECONDS)
+            now = time.perf_counter()
+            stall = max(stall, (now - last - _TICK_SECONDS) * 1000)
+            last = now
+
+    async def _one() -> None:
+        await asyncio.sleep(0)
+        if offload:
+            await asyncio.to_thread(parse)
+        else:
+            parse()
+
+    ticker = asyncio.create_task(_ticker())
+    await asyncio.sleep(_TICK_SECONDS * 2)
+    await asyncio.gather(*(_one() for _ in range(concurrency)))
+    done.set()
+    await ticker
+    return stall
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--timetable", type=Path, help="Recorded Aviationstack /timetable body")
+    parser.add_argument("--cheap", type=Path, help="Recorded Travelpayouts /v1/prices/cheap body")
+    parser.add_argument(
+        "--calendar", type=Path, help="Recorded Travelpayouts /v1/prices/calendar body",
+    )
+    parser.add_argument("--concurrency", type=int, default=1, help="Parses running at once")
+    args = parser.parse_args()
+
+    timetable = args.timetable.read_bytes() if args.timetable else _synthetic_timetable(3000)
+    cheap = args.cheap.read_bytes() if args.cheap else _synthetic_cheap(300)
+    calendar = args.calendar.read_bytes() if args.calendar else _synthetic_calendar(31)
+
+    tp = TravelpayoutsClient()
+    departure = date(2026, 11, 1)
+    payloads = {
+        "aviationstack timetable": ((timetable,), lambda: _parse_aviationstack_board(timetable)),
+        "travelpayouts cheap+calendar": (
+            (cheap, calendar),
+            lambda: tp._parse_search_payloads(cheap, calendar, departure, "ECONOMY", None),
+        ),
+    }
+
+    print(f"orjson available: {jsonparse.orjson is not None}")
+    print(
+        f"{'payload':<30} {'size':>9} {'json':>9} {'orjson':>9} {'parse':>9} "
+        f"{'stall inline':>13} {'stall thread':>13}"
+    )
+    for name, (bodies, parse) in payloads.items():
+        size = sum(len(body) for body in bodies)
+        stdlib_ms = sum(_median_ms(json.loads, body) for body in bodies)
+        orjson_ms = (
+            sum(_median_ms(jsonparse.orjson.loads, body) for body in bodies)
+            if jsonparse.orjson else float("nan")
+        )
+        parse_ms = _median_ms(parse)
+        inline_stall = statistics.median(
+            asyncio.run(_max_loop_stall_ms(parse, False, args.concurrency))
+            for _ in range(_STALL_RUNS)
+        )
+        thread_stall = statistics.median(
+            asyncio.run(_max_loop_stall_ms(parse, True, args.concurrency))
+            for _ in range(_STALL_RUNS)
+        )
+        print(
+            f"{name:<30} {size / 1024:>7.0f}KB {stdlib_ms:>7.2f}ms {orjson_ms:>7.2f}ms "
+            f"{parse_ms:>7.2f}ms {inline_stall:>11.1f}ms {thread_stall:>11.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""Load-test GET endpoints on the single writer connection vs the read pool.
+
+Usage:
+    python scripts/bench_read_pool.py [--rows N] [--requests N] [--concurrency N ...]
+                                      [--pool-size N] [--write-batch N]
+
+Builds a throwaway SQLite database (WAL) with N synthetic flight_prices rows,
+starts the real FastAPI app in-process (lifespan included, scheduler off) and
+fires a mix of read requests through httpx's ASGI transport:
+
+  /api/v1/stats                 full count over flight_prices (DB-bound)
+  /api/v1/flights/prices/history indexed range read
+  /api/v1/routes/popular        small read + per-route min price
+
+Each concurrency level runs twice: once with get_read_db overridden to the
+single StaticPool writer session (how every request was served before) and
+once on the read pool, first on an idle database and then while a background
+task commits --write-batch row inserts in a loop (the write-behind flusher's
+access pattern).
+
+SQLite releases the GIL while executing, so the read pool only pays off when
+there are cores to run the per-connection threads on. On a 1-vCPU sandbox
+(200k rows, 150 requests) both setups were within noise of each other: idle
+c=8 35-38 req/s, under write load c=8 12-13 req/s with p95 ~1.1 s on both,
+because two sqlite threads on one core just take turns. Run it on the
+deployment host; what the pool removes for certain is the queueing of every
+GET behind the single writer connection's aiosqlite thread.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+# Add backend to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "backend"))
+
+_DB_FILE = Path(tempfile.gettempdir()) / "bench_read_pool.db"
+# Settings are read at import time, so point the app at the scratch DB first
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_DB_FILE}"
+os.environ["SCHEDULER_MODE"] = "external"
+
+_ORIGIN = "ICN"
+_DESTS = ["NRT", "KIX", "BKK", "SIN", "HKG", "TPE", "CJU", "LAX", "CDG", "SYD"]
+_AIRLINES = ["KE", "OZ", "7C", "LJ", "TW", "JL", "NH", "SQ"]
+_DEPARTURE_DAYS = 120
+_BATCH = 50_000
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def _random_departure(rng: random.Random) -> date:
+    return date.today() + timedelta(days=rng.randrange(_DEPARTURE_DAYS))
+
+
+def _build(rows: int) -> None:
+    from app.models import Airline, Airport, Base, Route
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{_DB_FILE}{suffix}").unlink(missing_ok=True)
+    engine = create_engine(f"sqlite:///{_DB_FILE}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(
+            Airport(iata_code=c, name=c, city=c, country_code="XX") for c in [_ORIGIN] + _DESTS
+        )
+        session.add_all(Airline(iata_code=c, name=f"Airline {c}") for c in _AIRLINES)
+        session.flush()
+        session.add_all(
+            Route(id=i + 1, origin_code=_ORIGIN, dest_code=d) for i, d in enumerate(_DESTS)
+        )
+        session.commit()
+    engine.dispose()
+
+    rng = random.Random(5)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    conn = sqlite3.connect(_DB_FILE)
+    conn.execute("PRAGMA journal_mode=WAL")
+    sql = (
+        "INSERT OR IGNORE INTO flight_prices (time, route_id, airline_code, departure_date, "
+        "cabin_class, return_date, price_amount, currency, stops, duration_minutes, source, "
+        "raw_offer_id) "
+        "VALUES (?, ?, ?, ?, 'ECONOMY', NULL, ?, 'KRW', ?, ?, 'travelpayouts', NULL)"
+    )
+    done = 0
+    while done < rows:
+        batch = [
+            (
+                (now - timedelta(seconds=rng.randrange(30 * 86400))).strftime(_TIME_FORMAT),
+                rng.randint(1, len(_DESTS)),
+                rng.choice(_AIRLINES),
+                _random_departure(rng).isoformat(),
+                rng.randint(80_000, 1_500_000),
+                rng.randint(0, 2),
+                rng.randint(90, 900),
+            )
+            for _ in range(min(_BATCH, rows - done))
+        ]
+        conn.executemany(sql, batch)
+        done += len(batch)
+    conn.commit()
+    conn.close()
+
+
+def _request_mix(count: int) -> list[tuple[str, dict]]:
+    rng = random.Random(9)
+    mix = []
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            mix.append(("/api/v1/stats", {}))
+        elif kind == 1:
+            mix.append(("/api/v1/flights/prices/history", {
+                "route_id": rng.randint(1, len(_DESTS)),
+                "departure_date": _random_departure(rng).isoformat(),
+            }))
+        else:
+            mix.append(("/api/v1/routes/popular", {"limit": 10}))
+    return mix
+
+
+async def _run(
+    client, requests: list[tuple[str, dict]], concurrency: int,
+) -> tuple[float, list[float], int]:
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in requests:
+        queue.put_nowait(item)
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        while not queue.empty():
+            path, params = queue.get_nowait()
+            t0 = time.perf_counter()
+            response = await client.get(path, params=params)
+            latencies.append((time.perf_counter() - t0) * 1000)
+            if response.status_code != 200:
+                errors += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - t0, latencies, errors
+
+
+async def _write_load(stop: asyncio.Event, batch_rows: int) -> None:
+    """Stand-in for the write-behind flusher: a bulk insert transaction in a loop."""
+    from app.db.session import async_session_factory
+    from sqlalchemy import text
+
+    rng = random.Random(13)
+    sql = text(
+        "INSERT OR IGNORE INTO flight_prices (time, route_id, airline_code, departure_date, "
+        "cabin_class, price_amount, currency, stops, duration_minutes, source) "
+        "VALUES (:time, :route_id, :airline_code, :departure_date, 'ECONOMY', :price, 'KRW', "
+        "0, 120, 'bench')"
+    )
+    while not stop.is_set():
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        rows = [
+            {
+                "time": (now - timedelta(microseconds=i)).strftime(_TIME_FORMAT),
+                "route_id": rng.randint(1, len(_DESTS)),
+                "airline_code": rng.choice(_AIRLINES),
+                "departure_date": _random_departure(rng).isoformat(),
+                "price": rng.randint(80_000, 1_500_000),
+            }
+            for i in range(batch_rows)
+        ]
+        async with async_session_factory() as session:
+            await session.execute(sql, rows)
+            await session.commit()
+        await asyncio.sleep(0)
+
+
+async def _bench(requests: int, levels: list[int], write_batch: int) -> None:
+    import httpx
+    from app.db.session import get_db, get_read_db, read_engine
+    from app.main import app
+
+    mix = _request_mix(requests)
+    print(f"read pool: size={read_engine.pool.size()} overflow={read_engine.pool._max_overflow}")
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await _run(client, mix[:30], 4)  # warm caches and connections
+            for writes in (False, True) if write_batch else (False,):
+                print(f"\n{'with' if writes else 'without'} concurrent writes")
+                for concurrency in levels:
+                    for label, override in (("single writer", get_db), ("read pool", None)):
+                        if override is None:
+                            app.dependency_overrides.pop(get_read_db, None)
+                        else:
+                            app.dependency_overrides[get_read_db] = override
+                        stop = asyncio.Event()
+                        writer = (
+                            asyncio.create_task(_write_load(stop, write_batch)) if writes else None
+                        )
+                        elapsed, latencies, errors = await _run(client, mix, concurrency)
+                        if writer is not None:
+                            stop.set()
+                            await writer
+                        latencies.sort()
+                        p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+                        print(
+                            f"  c={concurrency:<3} {label:<14} {len(mix) / elapsed:8.1f} req/s   "
+                            f"p50 {statistics.median(latencies):7.1f} ms   p95 {p95:7.1f} ms   "
+                            f"errors {errors}"
+                        )
+            app.dependency_overrides.clear()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--rows", type=int, default=500_000, help="Synthetic flight_prices rows")
+    parser.add_argument("--requests", type=int, default=300, help="Requests per run")
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 4, 16], help="Concurrent clients",
+    )
+    parser.add_argument("--pool-size", type=int, help="Override DB_READ_POOL_SIZE for this run")
+    parser.add_argument("--write-batch", type=int, default=500,
+                        help="Rows per background write transaction (0 skips the write-load runs)")
+    args = parser.parse_args()
+    if args.pool_size is not None:
+        os.environ["DB_READ_POOL_SIZE"] = str(args.pool_size)
+
+    print(f"Building {args.rows:,} rows in {_DB_FILE} ...")
+    _build(args.rows)
+    # Every /stats call over a large table trips the slow-request warning
+    logging.disable(logging.WARNING)
+    asyncio.run(_bench(args.requests, args.concurrency, args.write_batch))
+
+
+if __name__ == "__main__":
+    main()